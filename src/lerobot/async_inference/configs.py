@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 import torch
 
 from lerobot.robots.config import RobotConfig
+from lerobot.transport.utils import IMAGE_COMPRESSIONS
 
 from .constants import (
     DEFAULT_FPS,
@@ -64,6 +65,11 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Serialization configuration
+    actions_float16: bool = field(
+        default=False, metadata={"help": "Send action chunks as float16 to halve their size on the wire"}
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -96,6 +102,7 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "actions_float16": self.actions_float16,
         }
 
 
@@ -137,6 +144,16 @@ class RobotClientConfig:
         metadata={"help": f"Name of aggregate function to use. Options: {list(AGGREGATE_FUNCTIONS.keys())}"},
     )
 
+    # Serialization configuration
+    image_compression: str | None = field(
+        default=None,
+        metadata={"help": f"Compress camera frames before sending them. Options: {list(IMAGE_COMPRESSIONS)}"},
+    )
+    jpeg_quality: int = field(default=90, metadata={"help": "JPEG quality used when compressing frames"})
+    observations_float16: bool = field(
+        default=False, metadata={"help": "Send floating point observations as float16"}
+    )
+
     # Debug configuration
     debug_visualize_queue_size: bool = field(
         default=False, metadata={"help": "Visualize the action queue size"}
@@ -170,6 +187,14 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.image_compression is not None and self.image_compression not in IMAGE_COMPRESSIONS:
+            raise ValueError(
+                f"image_compression must be one of {list(IMAGE_COMPRESSIONS)} or None, got {self.image_compression}"
+            )
+
+        if not 1 <= self.jpeg_quality <= 100:
+            raise ValueError(f"jpeg_quality must be between 1 and 100, got {self.jpeg_quality}")
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -190,4 +215,7 @@ class RobotClientConfig:
             "task": self.task,
             "debug_visualize_queue_size": self.debug_visualize_queue_size,
             "aggregate_fn_name": self.aggregate_fn_name,
+            "image_compression": self.image_compression,
+            "jpeg_quality": self.jpeg_quality,
+            "observations_float16": self.observations_float16,
         }
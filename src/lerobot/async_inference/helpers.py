@@ -19,6 +19,7 @@ import time
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
 import torch
 
 from lerobot.configs.types import PolicyFeature
@@ -34,6 +35,7 @@ from lerobot.policies import (  # noqa: F401
     VQBeTConfig,
 )
 from lerobot.robots.robot import Robot
+from lerobot.transport.utils import bytes_to_tensors, tensors_to_bytes
 from lerobot.utils.constants import OBS_IMAGES, OBS_STATE, OBS_STR
 from lerobot.utils.utils import init_logging
 
@@ -233,6 +235,65 @@ class TimedObservation(TimedData):
         return self.observation
 
 
+# Reserved keys used to carry the TimedData fields next to the observation/action payload
+_TIMESTAMP_KEY = "__timestamp__"
+_TIMESTEP_KEY = "__timestep__"
+_MUST_GO_KEY = "__must_go__"
+
+
+def timed_observation_to_bytes(
+    observation: TimedObservation,
+    image_compression: str | None = None,
+    jpeg_quality: int = 90,
+    use_float16: bool = False,
+) -> bytes:
+    """Serialize a TimedObservation with the tensor wire format of `tensors_to_bytes`.
+
+    Camera frames are sent as raw contiguous buffers, optionally compressed as JPEG/PNG, instead of being
+    pickled on every control step.
+    """
+    payload = dict(observation.get_observation())
+    payload[_TIMESTAMP_KEY] = observation.get_timestamp()
+    payload[_TIMESTEP_KEY] = observation.get_timestep()
+    payload[_MUST_GO_KEY] = observation.must_go
+    return tensors_to_bytes(
+        payload, image_compression=image_compression, jpeg_quality=jpeg_quality, use_float16=use_float16
+    )
+
+
+def bytes_to_timed_observation(buffer: bytes) -> TimedObservation:
+    payload = bytes_to_tensors(buffer)
+    return TimedObservation(
+        timestamp=payload.pop(_TIMESTAMP_KEY),
+        timestep=payload.pop(_TIMESTEP_KEY),
+        must_go=payload.pop(_MUST_GO_KEY),
+        observation=payload,
+    )
+
+
+def timed_actions_to_bytes(timed_actions: list[TimedAction], use_float16: bool = False) -> bytes:
+    """Serialize an action chunk as a single stacked (T, action_dim) tensor plus its timestamps/timesteps."""
+    payload = {
+        _TIMESTAMP_KEY: np.array([a.get_timestamp() for a in timed_actions], dtype=np.float64),
+        _TIMESTEP_KEY: np.array([a.get_timestep() for a in timed_actions], dtype=np.int64),
+    }
+    if timed_actions:
+        payload["action"] = torch.stack([a.get_action() for a in timed_actions])
+    return tensors_to_bytes(payload, use_float16=use_float16)
+
+
+def bytes_to_timed_actions(buffer: bytes) -> list[TimedAction]:
+    payload = bytes_to_tensors(buffer)
+    timestamps = payload[_TIMESTAMP_KEY].tolist()
+    timesteps = payload[_TIMESTEP_KEY].tolist()
+    if not timestamps:
+        return []
+    return [
+        TimedAction(timestamp=timestamp, timestep=timestep, action=action)
+        for timestamp, timestep, action in zip(timestamps, timesteps, payload["action"], strict=True)
+    ]
+
+
 @dataclass
 class FPSTracker:
     """Utility class to track FPS metrics over time."""
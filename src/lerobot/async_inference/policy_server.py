@@ -57,9 +57,11 @@ from .helpers import (
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    bytes_to_timed_observation,
     get_logger,
     observations_similar,
     raw_observation_to_observation,
+    timed_actions_to_bytes,
 )
 
 
@@ -182,7 +184,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         received_bytes = receive_bytes_in_chunks(
             request_iterator, None, self.shutdown_event, self.logger
         )  # blocking call while looping over request_iterator
-        timed_observation = pickle.loads(received_bytes)  # nosec
+        timed_observation = bytes_to_timed_observation(received_bytes)
         deserialize_time = time.perf_counter() - start_deserialize
 
         self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
@@ -235,7 +237,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             inference_time = time.perf_counter() - start_time
 
             start_time = time.perf_counter()
-            actions_bytes = pickle.dumps(action_chunk)  # nosec
+            actions_bytes = timed_actions_to_bytes(action_chunk, use_float16=self.config.actions_float16)
             serialize_time = time.perf_counter() - start_time
 
             # Create and return the action chunk
@@ -329,6 +331,17 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
         return chunk[:, : self.actions_per_chunk, :]
 
+    def _postprocess_action_chunk(self, action_tensor: torch.Tensor) -> torch.Tensor:
+        """Run the postprocessor on a (B, chunk_size, action_dim) chunk in a single call.
+
+        Postprocessor steps operate on (B, action_dim) actions, so the chunk is folded into the batch
+        dimension and unfolded afterwards. Steps may change the action dimension (e.g. slicing padded
+        actions), hence the final reshape infers it.
+        """
+        batch_size, chunk_size, action_dim = action_tensor.shape
+        processed = self.postprocessor(action_tensor.reshape(batch_size * chunk_size, action_dim))
+        return processed.reshape(batch_size, chunk_size, -1)
+
     def _predict_action_chunk(self, observation_t: TimedObservation) -> list[TimedAction]:
         """Predict an action chunk based on an observation.
 
@@ -363,22 +376,9 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         )
 
         """4. Apply postprocessor"""
-        # Apply postprocessor (handles unnormalization and device movement)
-        # Postprocessor expects (B, action_dim) per action, but we have (B, chunk_size, action_dim)
-        # So we process each action in the chunk individually
+        # Apply postprocessor (handles unnormalization and device movement) once for the whole chunk
         start_postprocess = time.perf_counter()
-        _, chunk_size, _ = action_tensor.shape
-
-        # Process each action in the chunk
-        processed_actions = []
-        for i in range(chunk_size):
-            # Extract action at timestep i: (B, action_dim)
-            single_action = action_tensor[:, i, :]
-            processed_action = self.postprocessor(single_action)
-            processed_actions.append(processed_action)
-
-        # Stack back to (B, chunk_size, action_dim), then remove batch dim
-        action_tensor = torch.stack(processed_actions, dim=1).squeeze(0)
+        action_tensor = self._postprocess_action_chunk(action_tensor).squeeze(0)
         self.logger.debug(f"Postprocessed action shape: {action_tensor.shape}")
 
         """5. Convert to TimedAction list"""
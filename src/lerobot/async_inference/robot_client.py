@@ -73,8 +73,10 @@ from .helpers import (
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    bytes_to_timed_actions,
     get_logger,
     map_robot_keys_to_lerobot_features,
+    timed_observation_to_bytes,
     visualize_action_queue_size,
 )
 
@@ -192,7 +194,12 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
-        observation_bytes = pickle.dumps(obs)
+        observation_bytes = timed_observation_to_bytes(
+            obs,
+            image_compression=self.config.image_compression,
+            jpeg_quality=self.config.jpeg_quality,
+            use_float16=self.config.observations_float16,
+        )
         serialize_time = time.perf_counter() - start_time
         self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
 
@@ -282,7 +289,7 @@ class RobotClient:
 
                 # Deserialize bytes back into list[TimedAction]
                 deserialize_start = time.perf_counter()
-                timed_actions = pickle.loads(actions_chunk.data)  # nosec
+                timed_actions = bytes_to_timed_actions(actions_chunk.data)
                 deserialize_time = time.perf_counter() - deserialize_start
 
                 self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
@@ -35,6 +35,30 @@ class DatasetConfig:
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
     streaming: bool = False
+    # Size in bytes of the per-worker cache of decoded video frames (torchcodec only). Disabled if None.
+    frame_cache_bytes: int | None = None
+    # If set, training samples are shuffled by blocks of this many consecutive frames within an episode,
+    # so that neighbouring samples can reuse decoded frames from the cache above.
+    sampler_block_size: int | None = None
+    # Return camera frames as uint8 and convert them to float on the policy device, in the preprocessor.
+    return_uint8_images: bool = False
+    # Only load the features used by the policy (its input and output features, when they are already known,
+    # e.g. when fine-tuning a pretrained policy). Unused columns are neither read nor converted, and unused
+    # cameras are neither downloaded nor decoded.
+    prune_columns: bool = False
+    # Load the numeric columns (states, actions, indices, ...) once into tensors and gather samples from them.
+    # Meant for low-dimensional datasets which fit in RAM, whose training is bound by per-sample Arrow reads.
+    in_memory: bool = False
+    # Keep the tensors above in shared memory, so that DataLoader workers don't each hold a copy.
+    share_memory: bool = False
+    # With `streaming`, read whole parquet row groups and shard them across DataLoader workers and ranks,
+    # instead of streaming frames one by one through `datasets` (see `StreamingLeRobotDataset`).
+    read_row_groups: bool = False
+    # With `streaming`, number of upcoming episodes per shard whose video frames are decoded in background
+    # threads ahead of being queried. 0 disables prefetching.
+    prefetch_episodes: int = 0
+    # Maximum number of bytes held by the prefetched video frames, per process.
+    prefetch_buffer_bytes: int = 2 * 1024**3
 
 
 @dataclass
@@ -56,8 +80,18 @@ class EvalConfig:
     batch_size: int = 50
     # `use_async_envs` specifies whether to use asynchronous environments (multiprocessing).
     use_async_envs: bool = False
+    # `continuous_batching` refills each environment with the next episode as soon as its own episode ends,
+    # instead of waiting for the whole batch to be done. Requires a policy planning from the current
+    # observation only (see `eval_policy_continuous` in lerobot/scripts/lerobot_eval.py).
+    continuous_batching: bool = False
+    # `num_workers` > 0 shards the tasks of the env across that many worker processes, each building its own
+    # environments and running them with continuous batching, while policy inference stays in the main
+    # process. 0 evaluates in the main process.
+    num_workers: int = 0
 
     def __post_init__(self) -> None:
+        if self.num_workers < 0:
+            raise ValueError(f"`num_workers` must be non-negative, got {self.num_workers}.")
         if self.batch_size > self.n_episodes:
             raise ValueError(
                 "The eval batch size is greater than the number of eval episodes "
@@ -59,11 +59,9 @@ class RunningQuantileStats:
             self._mean_of_squares = np.mean(batch**2, axis=0)
             self._min = np.min(batch, axis=0)
             self._max = np.max(batch, axis=0)
-            self._histograms = [np.zeros(self._num_quantile_bins) for _ in range(vector_length)]
-            self._bin_edges = [
-                np.linspace(self._min[i] - 1e-10, self._max[i] + 1e-10, self._num_quantile_bins + 1)
-                for i in range(vector_length)
-            ]
+            # One row of histogram counts and bin edges per feature dimension
+            self._histograms = np.zeros((vector_length, self._num_quantile_bins))
+            self._bin_edges = _linspace_edges(self._min - 1e-10, self._max + 1e-10, self._num_quantile_bins)
         else:
             if vector_length != self._mean.size:
                 raise ValueError("The length of new vectors does not match the initialized vector length.")
@@ -123,72 +121,166 @@ class RunningQuantileStats:
 
     def _adjust_histograms(self):
         """Adjust histograms when min or max changes."""
-        for i in range(len(self._histograms)):
-            old_edges = self._bin_edges[i]
-            old_hist = self._histograms[i]
-
-            # Create new edges with small padding to ensure range coverage
-            padding = (self._max[i] - self._min[i]) * 1e-10
-            new_edges = np.linspace(
-                self._min[i] - padding, self._max[i] + padding, self._num_quantile_bins + 1
-            )
-
-            # Redistribute existing histogram counts to new bins
-            # We need to map each old bin center to the new bins
-            old_centers = (old_edges[:-1] + old_edges[1:]) / 2
-            new_hist = np.zeros(self._num_quantile_bins)
+        old_edges = self._bin_edges
 
-            for old_center, count in zip(old_centers, old_hist, strict=False):
-                if count > 0:
-                    # Find which new bin this old center belongs to
-                    bin_idx = np.searchsorted(new_edges, old_center) - 1
-                    bin_idx = max(0, min(bin_idx, self._num_quantile_bins - 1))
-                    new_hist[bin_idx] += count
+        # Create new edges with small padding to ensure range coverage
+        padding = (self._max - self._min) * 1e-10
+        new_edges = _linspace_edges(self._min - padding, self._max + padding, self._num_quantile_bins)
 
-            self._histograms[i] = new_hist
-            self._bin_edges[i] = new_edges
+        # Redistribute existing histogram counts to new bins: each old bin center goes to the last new bin
+        # whose left edge is strictly below it, clipped to the valid bins
+        old_centers = (old_edges[:, :-1] + old_edges[:, 1:]) / 2
+        bin_idx = self._uniform_bin_indices(old_centers, new_edges, right=False)
+        self._histograms = self._bincount_rows(bin_idx, self._histograms)
+        self._bin_edges = new_edges
 
     def _update_histograms(self, batch: np.ndarray) -> None:
         """Update histograms with new vectors."""
-        for i in range(batch.shape[1]):
-            hist, _ = np.histogram(batch[:, i], bins=self._bin_edges[i])
-            self._histograms[i] += hist
+        # Same binning as `np.histogram`: half-open bins, except the last one which includes its right edge.
+        # Values outside of the edges are ignored.
+        values = np.ascontiguousarray(batch.T)
+        in_range = (values >= self._bin_edges[:, :1]) & (values <= self._bin_edges[:, -1:])
+        bin_idx = self._uniform_bin_indices(values, self._bin_edges, right=True)
+        self._histograms += self._bincount_rows(bin_idx, in_range.astype(np.float64))
+
+    def _uniform_bin_indices(self, values: np.ndarray, edges: np.ndarray, right: bool) -> np.ndarray:
+        """Locate (D, N) values in the (D, bins + 1) evenly spaced edges of every dimension at once.
+
+        With `right=True`, bin `i` holds `edges[i] <= x < edges[i + 1]` (the last bin also holds its right
+        edge). With `right=False`, bin `i` holds `edges[i] < x <= edges[i + 1]`. Indices are clipped to the
+        valid bins, and match `np.searchsorted` on each row of edges.
+        """
+        num_bins = edges.shape[1] - 1
+        first_edge = edges[:, :1]
+        width = (edges[:, -1:] - first_edge) / num_bins
+        # Degenerate (zero width) dimensions have all their edges equal
+        degenerate_bin = num_bins - 1 if right else 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = (values - first_edge) / width
+            guess = np.floor(scaled) if right else np.ceil(scaled) - 1
+        guess = np.where(width > 0, np.nan_to_num(guess), degenerate_bin)
+        bin_idx = np.clip(guess, 0, num_bins - 1).astype(np.int64)
+
+        # Rounding in the edges can put the guess a few bins off, walk it to the exact bin
+        while True:
+            left = np.take_along_axis(edges, bin_idx, axis=1)
+            right_edge = np.take_along_axis(edges, bin_idx + 1, axis=1)
+            too_high = ((values < left) if right else (values <= left)) & (bin_idx > 0)
+            too_low = ((values >= right_edge) if right else (values > right_edge)) & (bin_idx < num_bins - 1)
+            if not (too_high.any() or too_low.any()):
+                return bin_idx
+            bin_idx += too_low.astype(np.int64) - too_high
+
+    def _bincount_rows(self, bin_idx: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sum (D, N) weights into a (D, bins) histogram according to their per-row bin indices."""
+        num_dims = bin_idx.shape[0]
+        flat_idx = bin_idx + np.arange(num_dims)[:, None] * self._num_quantile_bins
+        counts = np.bincount(
+            flat_idx.ravel(), weights=weights.ravel(), minlength=num_dims * self._num_quantile_bins
+        )
+        return counts.reshape(num_dims, self._num_quantile_bins)
 
     def _compute_quantiles(self) -> list[np.ndarray]:
         """Compute quantiles based on histograms."""
-        results = []
-        for q in self._quantile_list:
-            target_count = q * self._count
-            q_values = []
+        return _histogram_quantiles(self._histograms, self._bin_edges, self._count, self._quantile_list)
+
+    def get_histogram(self, num_bins: int) -> np.ndarray:
+        """Return a compact (D, num_bins) histogram of the vectors processed so far.
 
-            for hist, edges in zip(self._histograms, self._bin_edges, strict=True):
-                q_value = self._compute_single_quantile(hist, edges, target_count)
-                q_values.append(q_value)
+        Bins are evenly spaced between the per-dimension min and max, so the histogram is fully described by
+        its counts alongside the min/max statistics. It can be merged with other histograms of the same
+        features, see `aggregate_feature_stats`.
+        """
+        return _rebin_histograms(
+            self._histograms,
+            self._bin_edges[:, 0],
+            self._bin_edges[:, -1],
+            self._min,
+            self._max,
+            num_bins,
+        )
 
-            results.append(np.array(q_values))
-        return results
 
-    def _compute_single_quantile(self, hist: np.ndarray, edges: np.ndarray, target_count: float) -> float:
-        """Compute a single quantile value from histogram and bin edges."""
-        cumsum = np.cumsum(hist)
-        idx = np.searchsorted(cumsum, target_count)
+def _linspace_edges(low: np.ndarray, high: np.ndarray, num_bins: int) -> np.ndarray:
+    """Evenly spaced (D, num_bins + 1) bin edges between per-dimension bounds."""
+    edges = np.repeat(low[:, None], num_bins + 1, axis=1)
+    # Zero width dimensions keep constant edges. They are excluded from the vectorized `np.linspace`,
+    # which otherwise switches to a less precise code path for all the dimensions.
+    spread = high > low
+    edges[spread] = np.linspace(low[spread], high[spread], num_bins + 1, axis=-1)
+    return edges
 
-        if idx == 0:
-            return edges[0]
-        if idx >= len(cumsum):
-            return edges[-1]
 
-        # If not edge case, interpolate within the bin
-        count_before = cumsum[idx - 1]
-        count_in_bin = cumsum[idx] - count_before
+def _rebin_histograms(
+    histograms: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    new_low: np.ndarray,
+    new_high: np.ndarray,
+    num_bins: int,
+) -> np.ndarray:
+    """Redistribute (D, bins) histograms with evenly spaced bins in [low, high] to `num_bins` evenly spaced
+    bins in [new_low, new_high].
 
-        # If no samples in this bin, use the bin edge
-        if count_in_bin == 0:
-            return edges[idx]
+    Counts are assumed uniformly spread within each bin: the cumulative counts are linearly interpolated at
+    the new edges. Counts falling outside of the new range are clamped into the first and last bins.
+    Zero width histograms hold all their counts at a single value.
+    """
+    histograms = histograms.astype(np.float64)
+    old_num_bins = histograms.shape[1]
+    cumsum = np.concatenate([np.zeros((histograms.shape[0], 1)), np.cumsum(histograms, axis=1)], axis=1)
+
+    new_edges = _linspace_edges(new_low, new_high, num_bins).astype(np.float64)
+    low = low.astype(np.float64)[:, None]
+    width = (high.astype(np.float64)[:, None] - low) / old_num_bins
+    with np.errstate(divide="ignore", invalid="ignore"):
+        position = np.clip((new_edges - low) / width, 0, old_num_bins)
+    position = np.where(width > 0, np.nan_to_num(position), np.where(new_edges >= low, old_num_bins, 0))
+
+    bin_idx = np.minimum(np.floor(position), old_num_bins - 1).astype(np.int64)
+    fraction = position - bin_idx
+    new_cumsum = np.take_along_axis(cumsum, bin_idx, axis=1) + fraction * np.take_along_axis(
+        histograms, bin_idx, axis=1
+    )
+    new_cumsum[:, 0] = 0
+    new_cumsum[:, -1] = cumsum[:, -1]
+    return np.diff(new_cumsum, axis=1)
+
+
+def _histogram_quantiles(
+    histograms: np.ndarray,
+    bin_edges: np.ndarray,
+    total_count: float | np.ndarray,
+    quantile_list: list[float],
+) -> list[np.ndarray]:
+    """Compute quantiles of (D, bins) histograms with (D, bins + 1) edges, interpolating within bins."""
+    num_bins = histograms.shape[1]
+    cumsum = np.cumsum(histograms, axis=1)
+    rows = np.arange(cumsum.shape[0])
+    total_count = np.asarray(total_count)
+
+    results = []
+    for q in quantile_list:
+        target_count = q * total_count
+        # Equivalent to a per-row `np.searchsorted(cumsum, target_count)` since cumsum is non-decreasing
+        idx = np.sum(cumsum < np.reshape(target_count, (-1, 1)), axis=1)
+        inner_idx = np.clip(idx, 1, num_bins - 1)
 
         # Linear interpolation within the bin
-        fraction = (target_count - count_before) / count_in_bin
-        return edges[idx] + fraction * (edges[idx + 1] - edges[idx])
+        count_before = cumsum[rows, inner_idx - 1]
+        count_in_bin = cumsum[rows, inner_idx] - count_before
+        left_edge = bin_edges[rows, inner_idx]
+        right_edge = bin_edges[rows, inner_idx + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = (target_count - count_before) / count_in_bin
+            interpolated = left_edge + fraction * (right_edge - left_edge)
+        q_values = np.where(count_in_bin == 0, left_edge, interpolated)
+
+        # Edge cases: quantile before the first or after the last bin
+        q_values = np.where(idx == 0, bin_edges[:, 0], q_values)
+        q_values = np.where(idx >= num_bins, bin_edges[:, -1], q_values)
+        results.append(q_values)
+    return results
 
 
 def estimate_num_samples(
@@ -227,14 +319,21 @@ def auto_downsample_height_width(img: np.ndarray, target_size: int = 150, max_si
     return img[:, ::downsample_factor, ::downsample_factor]
 
 
-def sample_images(image_paths: list[str]) -> np.ndarray:
+def sample_images(image_paths: list[str] | list[np.ndarray]) -> np.ndarray:
+    """Load a subsample of images as a uint8 (N, C, H, W) array.
+
+    Images can either be given as paths to image files, or as uint8 (C, H, W) arrays already in memory.
+    """
     sampled_indices = sample_indices(len(image_paths))
 
     images = None
     for i, idx in enumerate(sampled_indices):
         path = image_paths[idx]
-        # we load as uint8 to reduce memory usage
-        img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
+        if isinstance(path, np.ndarray):
+            img = path
+        else:
+            # we load as uint8 to reduce memory usage
+            img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
         img = auto_downsample_height_width(img)
 
         if images is None:
@@ -427,6 +526,7 @@ def get_feature_stats(
     axis: int | tuple[int, ...] | None,
     keepdims: bool,
     quantile_list: list[float] | None = None,
+    histogram_bins: int | None = None,
 ) -> dict[str, np.ndarray]:
     """Compute comprehensive statistics for array features along specified axes.
 
@@ -445,6 +545,8 @@ def get_feature_stats(
             - (1,): For computing across features
             - None: For global statistics over entire array
         keepdims: If True, reduced axes are kept as dimensions with size 1
+        histogram_bins: If set, also return a mergeable 'histogram' sketch with this number of evenly spaced
+            bins between min and max (last axis), used by `aggregate_stats` to merge quantiles accurately.
 
     Returns:
         Dictionary containing:
@@ -454,23 +556,35 @@ def get_feature_stats(
             - 'std': Standard deviation
             - 'count': Number of samples (always shape (1,))
             - 'q01', 'q10', 'q50', 'q90', 'q99': Quantile values
+            - 'histogram': Only if `histogram_bins` is set, counts with shape (*stats_shape, histogram_bins)
 
     """
     if quantile_list is None:
         quantile_list = DEFAULT_QUANTILES
+    if histogram_bins is not None and histogram_bins < 2:
+        raise ValueError(f"histogram_bins must be at least 2, got {histogram_bins}")
 
     original_shape = array.shape
     reshaped, sample_count = _prepare_array_for_stats(array, axis)
 
+    histogram = None
     if reshaped.shape[0] < 2:
         stats = _compute_basic_stats(reshaped, sample_count, quantile_list)
+        if histogram_bins is not None:
+            # All the values of a dimension are equal, they fit in a single bin
+            histogram = np.zeros((reshaped.shape[-1], histogram_bins))
+            histogram[:, 0] = reshaped.shape[0]
     else:
-        running_stats = RunningQuantileStats()
+        running_stats = RunningQuantileStats(quantile_list)
         running_stats.update(reshaped)
         stats = running_stats.get_statistics()
         stats["count"] = np.array([sample_count])
+        if histogram_bins is not None:
+            histogram = running_stats.get_histogram(histogram_bins)
 
     stats = _reshape_stats_by_axis(stats, axis, keepdims, original_shape)
+    if histogram is not None:
+        stats["histogram"] = histogram.reshape(*stats["mean"].shape, histogram_bins)
     return stats
 
 
@@ -478,6 +592,7 @@ def compute_episode_stats(
     episode_data: dict[str, list[str] | np.ndarray],
     features: dict,
     quantile_list: list[float] | None = None,
+    histogram_bins: int | None = None,
 ) -> dict:
     """Compute comprehensive statistics for all features in an episode.
 
@@ -491,6 +606,8 @@ def compute_episode_stats(
             - For images/videos: list of file paths
             - For numerical data: numpy arrays
         features: Dictionary describing each feature's dtype and shape
+        histogram_bins: If set, each feature also carries a mergeable 'histogram' sketch, see
+            `get_feature_stats`.
 
     Returns:
         Dictionary mapping feature names to their statistics dictionaries.
@@ -518,12 +635,18 @@ def compute_episode_stats(
             keepdims = data.ndim == 1
 
         ep_stats[key] = get_feature_stats(
-            ep_ft_array, axis=axes_to_reduce, keepdims=keepdims, quantile_list=quantile_list
+            ep_ft_array,
+            axis=axes_to_reduce,
+            keepdims=keepdims,
+            quantile_list=quantile_list,
+            histogram_bins=histogram_bins,
         )
 
         if features[key]["dtype"] in ["image", "video"]:
+            # Histogram bins follow min and max, so its counts stay valid once they are rescaled
             ep_stats[key] = {
-                k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in ep_stats[key].items()
+                k: v if k == "count" else np.squeeze(v if k == "histogram" else v / 255.0, axis=0)
+                for k, v in ep_stats[key].items()
             }
 
     return ep_stats
@@ -543,7 +666,7 @@ def _validate_stat_value(value: np.ndarray, key: str, feature_key: str) -> None:
     if key == "count" and value.shape != (1,):
         raise ValueError(f"Shape of 'count' must be (1), but is {value.shape} instead.")
 
-    if "image" in feature_key and key != "count" and value.shape != (3, 1, 1):
+    if "image" in feature_key and key not in ("count", "histogram") and value.shape != (3, 1, 1):
         raise ValueError(f"Shape of quantile '{key}' must be (3,1,1), but is {value.shape} instead.")
 
 
@@ -562,6 +685,42 @@ def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
                 _validate_stat_value(stat_value, stat_key, feature_key)
 
 
+def _has_mergeable_histograms(stats_ft_list: list[dict[str, np.ndarray]]) -> bool:
+    """Whether all the stats carry histograms with the same number of bins."""
+    if not all("histogram" in s for s in stats_ft_list):
+        return False
+    return len({s["histogram"].shape for s in stats_ft_list}) == 1
+
+
+def _merge_histograms(
+    stats_ft_list: list[dict[str, np.ndarray]], total_min: np.ndarray, total_max: np.ndarray
+) -> np.ndarray:
+    """Re-bin all the histograms over the aggregated [min, max] range, at once, and sum them."""
+    histograms = np.stack([s["histogram"] for s in stats_ft_list])
+    num_stats, *stats_shape, num_bins = histograms.shape
+
+    rebinned = _rebin_histograms(
+        histograms.reshape(-1, num_bins),
+        np.stack([s["min"] for s in stats_ft_list]).reshape(-1),
+        np.stack([s["max"] for s in stats_ft_list]).reshape(-1),
+        np.tile(np.reshape(total_min, -1), num_stats),
+        np.tile(np.reshape(total_max, -1), num_stats),
+        num_bins,
+    )
+    return rebinned.reshape(num_stats, *stats_shape, num_bins).sum(axis=0)
+
+
+def _histogram_sketch_quantiles(
+    histogram: np.ndarray, min_values: np.ndarray, max_values: np.ndarray, quantile_list: list[float]
+) -> list[np.ndarray]:
+    """Compute quantiles from a histogram sketch whose bins are evenly spaced between min and max."""
+    *stats_shape, num_bins = histogram.shape
+    histogram = histogram.reshape(-1, num_bins)
+    bin_edges = _linspace_edges(np.reshape(min_values, -1), np.reshape(max_values, -1), num_bins)
+    results = _histogram_quantiles(histogram, bin_edges, histogram.sum(axis=1), quantile_list)
+    return [q_values.reshape(stats_shape) for q_values in results]
+
+
 def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
     """Aggregates stats for a single feature."""
     means = np.stack([s["mean"] for s in stats_ft_list])
@@ -592,9 +751,19 @@ def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, d
 
     if stats_ft_list:
         quantile_keys = [k for k in stats_ft_list[0] if k.startswith("q") and k[1:].isdigit()]
+        quantile_keys = [k for k in quantile_keys if all(k in s for s in stats_ft_list)]
 
-        for q_key in quantile_keys:
-            if all(q_key in s for s in stats_ft_list):
+        if _has_mergeable_histograms(stats_ft_list):
+            histogram = _merge_histograms(stats_ft_list, aggregated["min"], aggregated["max"])
+            quantile_list = [int(q_key[1:]) / 100 for q_key in quantile_keys]
+            quantiles = _histogram_sketch_quantiles(
+                histogram, aggregated["min"], aggregated["max"], quantile_list
+            )
+            aggregated.update(zip(quantile_keys, quantiles, strict=True))
+            aggregated["histogram"] = histogram
+        else:
+            # Approximation: count-weighted average of the quantiles
+            for q_key in quantile_keys:
                 quantile_values = np.stack([s[q_key] for s in stats_ft_list])
                 weighted_quantiles = quantile_values * counts
                 aggregated[q_key] = weighted_quantiles.sum(axis=0) / total_count
@@ -612,6 +781,8 @@ def aggregate_stats(stats_list: list[dict[str, dict]]) -> dict[str, dict[str, np
     - new_max = max(max_dataset_0, max_dataset_1, ...)
     - new_mean = (mean of all data, weighted by counts)
     - new_std = (std of all data)
+    - new_quantiles = (quantiles of the merged histograms if all stats carry a 'histogram', otherwise
+      average of the quantiles weighted by counts)
     """
 
     _assert_type_and_shape(stats_list)
@@ -23,6 +23,8 @@ This module provides utilities for:
 - Merging datasets (wrapper around aggregate functionality)
 """
 
+import concurrent.futures
+import io
 import logging
 import shutil
 from collections.abc import Callable
@@ -31,12 +33,14 @@ from pathlib import Path
 import datasets
 import numpy as np
 import pandas as pd
+import PIL.Image
+import pyarrow as pa
 import pyarrow.parquet as pq
 import torch
 from tqdm import tqdm
 
 from lerobot.datasets.aggregate import aggregate_datasets
-from lerobot.datasets.compute_stats import aggregate_stats
+from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats, sample_indices
 from lerobot.datasets.lerobot_dataset import LeRobotDataset, LeRobotDatasetMetadata
 from lerobot.datasets.utils import (
     DATA_DIR,
@@ -44,15 +48,25 @@ from lerobot.datasets.utils import (
     DEFAULT_DATA_FILE_SIZE_IN_MB,
     DEFAULT_DATA_PATH,
     DEFAULT_EPISODES_PATH,
+    cast_stats_to_numpy,
+    column_to_numpy,
     get_parquet_file_size_in_mb,
     load_episodes,
+    load_image_as_numpy,
+    load_json,
+    serialize_dict,
     update_chunk_file_indices,
     write_info,
+    write_json,
     write_stats,
     write_tasks,
 )
+from lerobot.datasets.video_utils import decode_video_frames
 from lerobot.utils.constants import HF_LEROBOT_HOME
 
+# Episode stats computed by `recompute_stats`, kept until all the episodes are processed
+STATS_CHECKPOINT_DIR = "meta/stats_checkpoint"
+
 
 def _load_episode_with_stats(src_dataset: LeRobotDataset, episode_idx: int) -> dict:
     """Load a single episode's metadata including stats from parquet file.
@@ -76,6 +90,13 @@ def _load_episode_with_stats(src_dataset: LeRobotDataset, episode_idx: int) -> d
     return episode_row.to_dict()
 
 
+def _stack_nested_arrays(value: np.ndarray) -> np.ndarray:
+    """Turn nested object arrays, as deserialized from multi-dimensional parquet lists, into a numeric array."""
+    if isinstance(value, np.ndarray) and value.dtype == object:
+        return np.stack([_stack_nested_arrays(item) for item in value])
+    return np.asarray(value)
+
+
 def delete_episodes(
     dataset: LeRobotDataset,
     episode_indices: list[int],
@@ -440,6 +461,95 @@ def remove_feature(
     )
 
 
+def recompute_stats(
+    meta: LeRobotDatasetMetadata,
+    num_workers: int | None = None,
+    histogram_bins: int | None = None,
+    video_backend: str | None = None,
+    tolerance_s: float = 1e-4,
+    resume: bool = True,
+) -> dict[str, dict[str, np.ndarray]]:
+    """Recompute the stats of all the episodes of a dataset and write them to `meta/stats.json`.
+
+    Data files are processed in parallel by a pool of processes. Each job reads the needed columns of one
+    parquet file in bulk, and decodes the same subset of camera frames per episode as `compute_episode_stats`
+    does at record time. Episode stats are checkpointed after every data file, so that an interrupted
+    recomputation resumes where it stopped.
+
+    Args:
+        meta: Metadata of the dataset, stats are written in place.
+        num_workers: Number of processes. If 0, data files are processed in the current process. Defaults to
+            None, which uses one process per CPU.
+        histogram_bins: If set, episode stats carry histogram sketches with this number of bins, which gives
+            accurate quantiles for the whole dataset (see `aggregate_stats`).
+        video_backend: Backend used to decode video frames. Defaults to the backend of `decode_video_frames`.
+        tolerance_s: Tolerance in seconds used to decode video frames.
+        resume: If True, reuse the episode stats checkpointed by a previous interrupted run.
+
+    Returns:
+        The recomputed stats, also set on `meta.stats`.
+    """
+    if meta.episodes is None:
+        meta.episodes = load_episodes(meta.root)
+
+    checkpoint_dir = meta.root / STATS_CHECKPOINT_DIR
+    if not resume and checkpoint_dir.exists():
+        shutil.rmtree(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    # Checkpoints computed with other settings, or before the features changed, are recomputed
+    settings = {
+        "histogram_bins": histogram_bins,
+        "features": {key: ft["dtype"] for key, ft in meta.features.items()},
+    }
+    jobs = _get_stats_jobs(meta, histogram_bins, video_backend, tolerance_s)
+    episodes_stats = {}
+    pending_jobs = []
+    for job in jobs:
+        checkpoint = _load_stats_checkpoint(checkpoint_dir / job["checkpoint_name"], settings)
+        if checkpoint is None:
+            pending_jobs.append(job)
+        else:
+            episodes_stats.update(checkpoint)
+
+    if len(pending_jobs) < len(jobs):
+        logging.info(f"Resuming stats computation, {len(jobs) - len(pending_jobs)}/{len(jobs)} files done")
+
+    def _save_results(job: dict, job_stats: dict[int, dict]) -> None:
+        checkpoint = {
+            "settings": settings,
+            "episodes": {str(ep_idx): serialize_dict(ep_stats) for ep_idx, ep_stats in job_stats.items()},
+        }
+        # Write then rename, so that an interruption never leaves a partial checkpoint behind
+        tmp_path = checkpoint_dir / f"{job['checkpoint_name']}.tmp"
+        write_json(checkpoint, tmp_path)
+        tmp_path.replace(checkpoint_dir / job["checkpoint_name"])
+        episodes_stats.update(job_stats)
+
+    progress = tqdm(total=len(pending_jobs), desc="Computing stats per data file")
+    if num_workers == 0:
+        for job in pending_jobs:
+            _save_results(job, _compute_data_file_stats(job))
+            progress.update(1)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(_compute_data_file_stats, job): job for job in pending_jobs}
+            for future in concurrent.futures.as_completed(futures):
+                _save_results(futures[future], future.result())
+                progress.update(1)
+    progress.close()
+
+    missing = set(range(meta.total_episodes)) - set(episodes_stats)
+    if missing:
+        raise RuntimeError(f"Stats are missing for episodes {sorted(missing)}")
+
+    stats = aggregate_stats([episodes_stats[ep_idx] for ep_idx in range(meta.total_episodes)])
+    write_stats(stats, meta.root)
+    meta.stats = stats
+    shutil.rmtree(checkpoint_dir)
+    return stats
+
+
 def _fractions_to_episode_indices(
     total_episodes: int,
     splits: dict[str, float],
@@ -853,7 +963,9 @@ def _copy_and_reindex_episodes_metadata(
 
                     value = src_episode_full[key]
 
-                    if feature_name in src_dataset.meta.features:
+                    if stat_name == "histogram":
+                        value = _stack_nested_arrays(value)
+                    elif feature_name in src_dataset.meta.features:
                         feature_dtype = src_dataset.meta.features[feature_name]["dtype"]
                         if feature_dtype in ["image", "video"] and stat_name != "count":
                             if isinstance(value, np.ndarray) and value.dtype == object:
@@ -1083,3 +1195,115 @@ def _copy_episodes_metadata_and_stats(
     else:
         if src_dataset.meta.stats:
             write_stats(src_dataset.meta.stats, dst_meta.root)
+
+
+def _get_stats_jobs(
+    meta: LeRobotDatasetMetadata,
+    histogram_bins: int | None,
+    video_backend: str | None,
+    tolerance_s: float,
+) -> list[dict]:
+    """Group episodes by data file into picklable jobs for `_compute_data_file_stats`."""
+    episodes = meta.episodes.to_pandas()
+    jobs = {}
+    for ep in episodes.to_dict(orient="records"):
+        chunk_idx, file_idx = ep["data/chunk_index"], ep["data/file_index"]
+        if (chunk_idx, file_idx) not in jobs:
+            jobs[(chunk_idx, file_idx)] = {
+                "data_path": meta.root / meta.data_path.format(chunk_index=chunk_idx, file_index=file_idx),
+                "checkpoint_name": f"chunk-{chunk_idx:03d}_file-{file_idx:03d}.json",
+                "features": meta.features,
+                "histogram_bins": histogram_bins,
+                "video_backend": video_backend,
+                "tolerance_s": tolerance_s,
+                "episodes": {},
+            }
+        videos = {}
+        for video_key in meta.video_keys:
+            video_path = meta.video_path.format(
+                video_key=video_key,
+                chunk_index=ep[f"videos/{video_key}/chunk_index"],
+                file_index=ep[f"videos/{video_key}/file_index"],
+            )
+            videos[video_key] = (meta.root / video_path, ep[f"videos/{video_key}/from_timestamp"])
+        jobs[(chunk_idx, file_idx)]["episodes"][ep["episode_index"]] = {
+            "length": ep["length"],
+            "videos": videos,
+        }
+    return list(jobs.values())
+
+
+def _load_stats_checkpoint(path: Path, settings: dict) -> dict[int, dict] | None:
+    """Load checkpointed episode stats, or None if they are missing or were computed with other settings."""
+    if not path.exists():
+        return None
+    checkpoint = load_json(path)
+    if checkpoint.get("settings") != settings:
+        return None
+    return {int(ep_idx): cast_stats_to_numpy(ep_stats) for ep_idx, ep_stats in checkpoint["episodes"].items()}
+
+
+def _load_parquet_image(image: dict) -> np.ndarray:
+    """Load an image stored in a parquet file as a uint8 (C, H, W) array."""
+    if image["bytes"] is not None:
+        array = np.array(PIL.Image.open(io.BytesIO(image["bytes"])))
+        if array.ndim == 2:
+            # Grayscale images have no channel dimension
+            array = array[:, :, None]
+        return array.transpose(2, 0, 1)
+    return load_image_as_numpy(image["path"], dtype=np.uint8, channel_first=True)
+
+
+def _read_parquet_rows(parquet_file: pq.ParquetFile, columns: list[str], rows: np.ndarray) -> pa.Table:
+    """Read some sorted rows of a parquet file, only loading the row groups which contain them."""
+    metadata = parquet_file.metadata
+    group_offsets = np.cumsum([0] + [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])
+    row_groups = np.searchsorted(group_offsets, rows, side="right") - 1
+    read_groups = np.unique(row_groups)
+    table = parquet_file.read_row_groups(read_groups.tolist(), columns=columns)
+    # Offsets of the row groups which were read, in the table they were concatenated into
+    read_sizes = np.diff(group_offsets)[read_groups]
+    read_offsets = np.cumsum(read_sizes) - read_sizes
+    positions = rows - group_offsets[row_groups] + read_offsets[np.searchsorted(read_groups, row_groups)]
+    return table.take(positions)
+
+
+def _compute_data_file_stats(job: dict) -> dict[int, dict]:
+    """Compute the stats of all the episodes stored in a data file."""
+    features = job["features"]
+    columns = [key for key, ft in features.items() if ft["dtype"] not in ["string", "image", "video"]]
+    image_keys = [key for key, ft in features.items() if ft["dtype"] == "image"]
+    parquet_file = pq.ParquetFile(job["data_path"])
+    # Images are only read for the sampled frames, the other columns are small enough to be read whole
+    table = parquet_file.read(columns=columns)
+    episode_index = column_to_numpy(table["episode_index"])
+    timestamp = column_to_numpy(table["timestamp"])
+
+    file_stats = {}
+    for ep_idx, ep in job["episodes"].items():
+        rows = np.flatnonzero(episode_index == ep_idx)
+        # Only the frames `compute_episode_stats` samples from cameras are loaded, the others are left to None
+        sampled = sample_indices(ep["length"])
+
+        episode_data = {key: column_to_numpy(table[key].take(rows)) for key in columns}
+
+        if image_keys:
+            images = _read_parquet_rows(parquet_file, image_keys, rows[sampled])
+            for key in image_keys:
+                episode_data[key] = [None] * ep["length"]
+                for idx, image in zip(sampled, images[key].to_pylist(), strict=True):
+                    episode_data[key][idx] = _load_parquet_image(image)
+
+        for key, (video_path, from_timestamp) in ep["videos"].items():
+            timestamps = (from_timestamp + timestamp[rows[sampled]]).tolist()
+            frames = decode_video_frames(
+                video_path, timestamps, job["tolerance_s"], job["video_backend"], return_uint8=True
+            )
+            episode_data[key] = [None] * ep["length"]
+            for idx, frame in zip(sampled, frames.numpy(), strict=True):
+                episode_data[key][idx] = frame
+
+        file_stats[ep_idx] = compute_episode_stats(
+            episode_data, features, histogram_bins=job["histogram_bins"]
+        )
+    return file_stats
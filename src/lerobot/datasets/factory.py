@@ -68,6 +68,24 @@ def resolve_delta_timestamps(
     return delta_timestamps
 
 
+def resolve_dataset_columns(cfg: PreTrainedConfig, ds_meta: LeRobotDatasetMetadata) -> list[str] | None:
+    """Resolves the dataset features consumed by a policy, from its input and output features.
+
+    Args:
+        cfg (PreTrainedConfig): The PreTrainedConfig to read input_features and output_features from.
+        ds_meta (LeRobotDatasetMetadata): The dataset from which features are selected.
+
+    Returns:
+        list[str] | None: The features of the dataset used by the policy, e.g.:
+            ["observation.state", "action"]
+            returns `None` if the policy features are not known yet, in which case all features are needed.
+    """
+    if not cfg.input_features or not cfg.output_features:
+        return None
+    policy_features = {**cfg.input_features, **cfg.output_features}
+    return [key for key in ds_meta.features if key in policy_features]
+
+
 def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDataset:
     """Handles the logic of setting up delta timestamps and image transforms before creating a dataset.
 
@@ -89,6 +107,7 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
             cfg.dataset.repo_id, root=cfg.dataset.root, revision=cfg.dataset.revision
         )
         delta_timestamps = resolve_delta_timestamps(cfg.policy, ds_meta)
+        columns = resolve_dataset_columns(cfg.policy, ds_meta) if cfg.dataset.prune_columns else None
         if not cfg.dataset.streaming:
             dataset = LeRobotDataset(
                 cfg.dataset.repo_id,
@@ -98,6 +117,11 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 image_transforms=image_transforms,
                 revision=cfg.dataset.revision,
                 video_backend=cfg.dataset.video_backend,
+                frame_cache_bytes=cfg.dataset.frame_cache_bytes,
+                return_uint8_images=cfg.dataset.return_uint8_images,
+                columns=columns,
+                in_memory=cfg.dataset.in_memory,
+                share_memory=cfg.dataset.share_memory,
             )
         else:
             dataset = StreamingLeRobotDataset(
@@ -107,7 +131,11 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 delta_timestamps=delta_timestamps,
                 image_transforms=image_transforms,
                 revision=cfg.dataset.revision,
-                max_num_shards=cfg.num_workers,
+                # At least one shard is read when the data is loaded in the main process
+                max_num_shards=max(1, cfg.num_workers),
+                read_row_groups=cfg.dataset.read_row_groups,
+                prefetch_episodes=cfg.dataset.prefetch_episodes,
+                prefetch_buffer_bytes=cfg.dataset.prefetch_buffer_bytes,
             )
     else:
         raise NotImplementedError("The MultiLeRobotDataset isn't supported for now.")
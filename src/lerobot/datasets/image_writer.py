@@ -16,6 +16,9 @@
 import multiprocessing
 import queue
 import threading
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -104,21 +107,79 @@ def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path, compress_level
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+@dataclass(frozen=True)
+class SharedFrame:
+    """Reference to a frame stored in a slot of a `SharedFrameRing`, sent to the workers instead of the frame."""
+
+    shm_name: str
+    slot: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedFrameRing:
+    """Pre-allocated shared-memory buffer holding up to `num_slots` frames of the same shape and dtype.
+
+    Frames are copied in place into a free slot, so that only a `SharedFrame` reference has to be sent to the
+    worker processes. Slots are handed back once the frame was written on disk.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: np.dtype, num_slots: int):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        frame_nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=max(frame_nbytes * num_slots, 1))
+        self.frames = np.ndarray((num_slots, *self.shape), dtype=self.dtype, buffer=self.shm.buf)
+        self.free_slots = deque(range(num_slots))
+
+    def put(self, image: np.ndarray, slot: int) -> SharedFrame:
+        self.frames[slot] = image
+        return SharedFrame(self.shm.name, slot, self.shape, self.dtype.str)
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared memory blocks attached by the current worker process, indexed by name
+_attached_shared_memory: dict[str, shared_memory.SharedMemory] = {}
+_attached_shared_memory_lock = threading.Lock()
+
+
+def read_shared_frame(frame: SharedFrame) -> np.ndarray:
+    """Return a view on the frame referenced by `frame`, attaching its shared memory block if needed."""
+    with _attached_shared_memory_lock:
+        shm = _attached_shared_memory.get(frame.shm_name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=frame.shm_name)
+            _attached_shared_memory[frame.shm_name] = shm
+    dtype = np.dtype(frame.dtype)
+    offset = frame.slot * int(np.prod(frame.shape)) * dtype.itemsize
+    return np.ndarray(frame.shape, dtype=dtype, buffer=shm.buf, offset=offset)
+
+
+def worker_thread_loop(queue: queue.Queue, release_queue: queue.Queue | None = None):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath, compress_level = item
-        write_image(image_array, fpath, compress_level)
+        if isinstance(image_array, SharedFrame):
+            write_image(read_shared_frame(image_array), fpath, compress_level)
+            # Hand the slot back to the main process once the frame is on disk
+            release_queue.put((image_array.shm_name, image_array.slot))
+        else:
+            write_image(image_array, fpath, compress_level)
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(queue: queue.Queue, num_threads: int, release_queue: queue.Queue | None = None):
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, release_queue))
         t.daemon = True
         t.start()
         threads.append(t)
@@ -139,14 +200,23 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    When using processes, numpy images are not pickled through the queue: they are copied into a shared-memory
+    ring buffer of `shared_memory_slots` frames allocated for each image shape (i.e. for each camera
+    resolution), and only the slot index is sent to the subprocesses. `save_image` blocks when all the slots are
+    waiting to be written on disk. Set `shared_memory_slots=0` to send the images through the queue instead.
     """
 
-    def __init__(self, num_processes: int = 0, num_threads: int = 1):
+    def __init__(self, num_processes: int = 0, num_threads: int = 1, shared_memory_slots: int = 32):
         self.num_processes = num_processes
         self.num_threads = num_threads
+        self.shared_memory_slots = shared_memory_slots
         self.queue = None
         self.threads = []
         self.processes = []
+        self.rings: dict[tuple[tuple[int, ...], str], SharedFrameRing] = {}
+        self._rings_by_name: dict[str, SharedFrameRing] = {}
+        self._release_queue = None
         self._stopped = False
 
         if num_threads <= 0 and num_processes <= 0:
@@ -163,8 +233,15 @@ class AsyncImageWriter:
         else:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
+            if self.shared_memory_slots > 0:
+                self._release_queue = multiprocessing.Queue()
+                # Subprocesses must share the resource tracker of this process. Otherwise they would each start
+                # their own, which unlinks the shared memory blocks they attached to when they exit.
+                resource_tracker.ensure_running()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process, args=(self.queue, self.num_threads, self._release_queue)
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
@@ -175,8 +252,33 @@ class AsyncImageWriter:
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        if self._release_queue is not None and isinstance(image, np.ndarray):
+            image = self._put_in_shared_memory(image)
         self.queue.put((image, fpath, compress_level))
 
+    def _put_in_shared_memory(self, image: np.ndarray) -> SharedFrame:
+        key = (image.shape, image.dtype.str)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = SharedFrameRing(image.shape, image.dtype, self.shared_memory_slots)
+            self.rings[key] = ring
+            self._rings_by_name[ring.shm.name] = ring
+
+        self._collect_released_slots(block=False)
+        while not ring.free_slots:
+            # All the slots are waiting to be written on disk
+            self._collect_released_slots(block=True)
+        return ring.put(image, ring.free_slots.popleft())
+
+    def _collect_released_slots(self, block: bool) -> None:
+        try:
+            while True:
+                shm_name, slot = self._release_queue.get(block=block)
+                self._rings_by_name[shm_name].free_slots.append(slot)
+                block = False
+        except queue.Empty:
+            pass
+
     def wait_until_done(self):
         self.queue.join()
 
@@ -200,4 +302,12 @@ class AsyncImageWriter:
             self.queue.close()
             self.queue.join_thread()
 
+            if self._release_queue is not None:
+                self._release_queue.close()
+                self._release_queue.join_thread()
+            for ring in self.rings.values():
+                ring.close()
+            self.rings.clear()
+            self._rings_by_name.clear()
+
         self._stopped = True
@@ -13,12 +13,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
 import concurrent.futures
 import contextlib
+import functools
 import logging
 import shutil
 import tempfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 import datasets
@@ -33,14 +35,20 @@ import torch.utils
 from huggingface_hub import HfApi, snapshot_download
 from huggingface_hub.errors import RevisionNotFoundError
 
-from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
+from lerobot.datasets.compute_stats import (
+    aggregate_stats,
+    auto_downsample_height_width,
+    compute_episode_stats,
+)
 from lerobot.datasets.image_writer import AsyncImageWriter, write_image
 from lerobot.datasets.utils import (
     DEFAULT_EPISODES_PATH,
     DEFAULT_FEATURES,
     DEFAULT_IMAGE_PATH,
     INFO_PATH,
+    EpisodeLookup,
     _validate_feature_names,
+    arrow_column_to_torch,
     check_delta_timestamps,
     check_version_compatibility,
     create_empty_dataset_info,
@@ -67,6 +75,8 @@ from lerobot.datasets.utils import (
     write_tasks,
 )
 from lerobot.datasets.video_utils import (
+    DecodedFrameCache,
+    StreamingVideoEncoder,
     VideoFrame,
     concatenate_video_files,
     decode_video_frames,
@@ -563,6 +573,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        frame_cache_bytes: int | None = None,
+        return_uint8_images: bool = False,
+        streaming_encoding: bool = False,
+        video_encoding_workers: int | None = None,
+        stats_histogram_bins: int | None = None,
+        columns: list[str] | None = None,
+        in_memory: bool = False,
+        share_memory: bool = False,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -675,6 +693,36 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            frame_cache_bytes (int | None, optional): If set, decoded video frames are kept in a per-process
+                cache of at most this many bytes, so that frames shared by neighbouring samples (e.g. through
+                `delta_timestamps`) are decoded only once. This pays off when samples are read in temporal
+                order, see `EpisodeAwareSampler(block_size=...)`. Only supported by the 'torchcodec' video
+                backend. Defaults to None.
+            return_uint8_images (bool, optional): If True, camera frames (from videos or images) are returned as
+                uint8 tensors in [0, 255] instead of float32 tensors in [0, 1]. This divides by 4 the size of the
+                batches sent through DataLoader workers and pinned in host memory; use `ImageToFloatProcessorStep`
+                to convert them to float after moving them to the device. Defaults to False.
+            streaming_encoding (bool, optional): If True, frames of video features added with `add_frame` are
+                encoded on the fly by a background thread instead of being written as PNG images and encoded
+                in `save_episode`. Not compatible with `batch_encoding_size > 1`. Defaults to False.
+            video_encoding_workers (int | None, optional): Number of processes of the pool encoding videos in
+                parallel across cameras and episodes. The pool is started on first use and kept until
+                `finalize()`. Defaults to None, which uses one process per camera.
+            stats_histogram_bins (int | None, optional): If set, the stats of episodes recorded with
+                `save_episode` carry a histogram sketch with this number of bins, so that aggregated stats get
+                accurate quantiles instead of count-weighted averages of per-episode quantiles. Defaults to None.
+            columns (list[str] | None, optional): If set, only these features, the keys of `delta_timestamps` and
+                the default features (e.g. "index", "timestamp") are read from the parquet files, converted and
+                returned. Other cameras are neither loaded nor decoded. See `resolve_dataset_columns` to derive
+                them from a policy config. Defaults to None, which loads all the features.
+            in_memory (bool, optional): If True, the numeric columns of the parquet files (e.g. states, actions,
+                indices, timestamps) are loaded once into contiguous tensors, and samples as well as their
+                `delta_timestamps` windows are gathered from them by tensor indexing instead of going through
+                Arrow rows and `hf_transform_to_torch`. Images embedded in the parquet files and videos are still
+                read as usual. Meant for datasets which fit in RAM. Defaults to False.
+            share_memory (bool, optional): If True, the tensors loaded with `in_memory` are moved to shared
+                memory, so that DataLoader workers started with the 'spawn' or 'forkserver' methods reuse them
+                instead of receiving copies. Requires `in_memory`. Defaults to False.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -685,9 +733,25 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.tolerance_s = tolerance_s
         self.revision = revision if revision else CODEBASE_VERSION
         self.video_backend = video_backend if video_backend else get_safe_default_codec()
+        if frame_cache_bytes and self.video_backend != "torchcodec":
+            raise ValueError(
+                f"frame_cache_bytes is only supported by the 'torchcodec' video backend, not '{self.video_backend}'."
+            )
+        self.frame_cache = DecodedFrameCache(frame_cache_bytes) if frame_cache_bytes else None
+        self.return_uint8_images = return_uint8_images
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
+        self._set_streaming_encoding(streaming_encoding)
+        self.video_encoding_workers = video_encoding_workers
+        self._encoding_pool = None
+        # Episodes saved with `batch_encoding_size > 1` whose metadata waits for their videos to be encoded
+        self._pending_episodes = []
+        self.stats_histogram_bins = stats_histogram_bins
+        if share_memory and not in_memory:
+            raise ValueError("share_memory requires in_memory=True.")
+        self.in_memory = in_memory
+        self.share_memory = share_memory
 
         # Unused attributes
         self.image_writer = None
@@ -702,6 +766,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.meta = LeRobotDatasetMetadata(
             self.repo_id, self.root, self.revision, force_cache_sync=force_cache_sync
         )
+        self.columns = self._resolve_columns(columns)
 
         # Track dataset state for efficient incremental writing
         self._lazy_loading = False
@@ -723,13 +788,20 @@ class LeRobotDataset(torch.utils.data.Dataset):
             self.hf_dataset = self.load_hf_dataset()
 
         # Create mapping from absolute indices to relative indices when only a subset of the episodes are loaded
-        # Build a mapping: absolute_index -> relative_index_in_filtered_dataset
+        # Build an array: absolute_index -> relative_index_in_filtered_dataset (-1 for frames not loaded)
         self._absolute_to_relative_idx = None
         if self.episodes is not None:
-            self._absolute_to_relative_idx = {
-                abs_idx.item() if isinstance(abs_idx, torch.Tensor) else abs_idx: rel_idx
-                for rel_idx, abs_idx in enumerate(self.hf_dataset["index"])
-            }
+            abs_indices = self.hf_dataset.data.column("index").to_numpy()
+            self._absolute_to_relative_idx = np.full(abs_indices.max(initial=-1) + 1, -1, dtype=np.int64)
+            self._absolute_to_relative_idx[abs_indices] = np.arange(len(abs_indices))
+
+        # Built on first read from the episodes metadata, see `_get_episode_lookup`
+        self._episode_lookup = None
+
+        # Built now rather than on first read, so that DataLoader workers inherit it instead of each building one
+        self._column_cache = None
+        if self.in_memory:
+            self._get_column_cache()
 
         # Setup delta_indices
         if self.delta_timestamps is not None:
@@ -827,6 +899,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         # TODO(rcadene, aliberts): implement faster transfer
         # https://huggingface.co/docs/huggingface_hub/en/guides/download#faster-downloads
         ignore_patterns = None if download_videos else "videos/"
+        if download_videos and self.columns is not None:
+            # Videos of the cameras which are not loaded are not downloaded either
+            ignore_patterns = [
+                f"videos/{key}/" for key in self.meta.video_keys if key not in self._video_keys
+            ] or None
         files = None
         if self.episodes is not None:
             files = self.get_episodes_file_paths()
@@ -835,10 +912,10 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def get_episodes_file_paths(self) -> list[Path]:
         episodes = self.episodes if self.episodes is not None else list(range(self.meta.total_episodes))
         fpaths = [str(self.meta.get_data_file_path(ep_idx)) for ep_idx in episodes]
-        if len(self.meta.video_keys) > 0:
+        if len(self._video_keys) > 0:
             video_files = [
                 str(self.meta.get_video_file_path(ep_idx, vid_key))
-                for vid_key in self.meta.video_keys
+                for vid_key in self._video_keys
                 for ep_idx in episodes
             ]
             fpaths += video_files
@@ -846,11 +923,40 @@ class LeRobotDataset(torch.utils.data.Dataset):
         fpaths = list(set(fpaths))
         return fpaths
 
+    def _resolve_columns(self, columns: list[str] | None) -> list[str] | None:
+        """Features to load among the ones of the dataset, in their order, or None to load them all."""
+        if columns is None:
+            return None
+        unknown = set(columns) - set(self.features)
+        if unknown:
+            raise ValueError(f"Columns {sorted(unknown)} are not features of the dataset {self.repo_id}.")
+        selected = set(columns) | set(DEFAULT_FEATURES) | set(self.delta_timestamps or {})
+        return [key for key in self.features if key in selected]
+
+    @property
+    def _video_keys(self) -> list[str]:
+        """Video features which are loaded, see `columns`."""
+        return [key for key in self.meta.video_keys if self.columns is None or key in self.columns]
+
+    @property
+    def _camera_keys(self) -> list[str]:
+        """Camera features (from videos or images) which are loaded, see `columns`."""
+        return [key for key in self.meta.camera_keys if self.columns is None or key in self.columns]
+
     def load_hf_dataset(self) -> datasets.Dataset:
         """hf_dataset contains all the observations, states, actions, rewards, etc."""
         features = get_hf_features_from_features(self.features)
-        hf_dataset = load_nested_dataset(self.root / "data", features=features, episodes=self.episodes)
-        hf_dataset.set_transform(hf_transform_to_torch)
+        columns = None
+        if self.columns is not None:
+            # Videos are not stored in the parquet files
+            columns = [key for key in features if key in self.columns]
+            features = datasets.Features({key: features[key] for key in columns})
+        hf_dataset = load_nested_dataset(
+            self.root / "data", features=features, episodes=self.episodes, columns=columns
+        )
+        hf_dataset.set_transform(
+            functools.partial(hf_transform_to_torch, uint8_images=self.return_uint8_images)
+        )
         return hf_dataset
 
     def _check_cached_episodes_sufficient(self) -> bool:
@@ -875,9 +981,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
             return False
 
         # Check if all required video files exist
-        if len(self.meta.video_keys) > 0:
+        if len(self._video_keys) > 0:
             for ep_idx in requested_episodes:
-                for vid_key in self.meta.video_keys:
+                for vid_key in self._video_keys:
                     video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
                     if not video_path.exists():
                         return False
@@ -911,7 +1017,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
     @property
     def num_episodes(self) -> int:
         """Number of episodes selected."""
-        return len(self.episodes) if self.episodes is not None else self.meta.total_episodes
+        if self.episodes is not None:
+            return len(self.episodes)
+        return self.meta.total_episodes + len(self._pending_episodes)
 
     @property
     def features(self) -> dict[str, dict]:
@@ -925,10 +1033,29 @@ class LeRobotDataset(torch.utils.data.Dataset):
         else:
             return get_hf_features_from_features(self.features)
 
+    def _get_episode_lookup(self) -> EpisodeLookup:
+        """Arrays of per-episode metadata used in the read path, built once from `meta.episodes`."""
+        if self._episode_lookup is None:
+            self._episode_lookup = EpisodeLookup.build(
+                self.meta.episodes, self.meta.video_keys, self.meta.video_path
+            )
+        return self._episode_lookup
+
+    def _get_column_cache(self) -> dict[str, torch.Tensor] | None:
+        """Numeric columns of `hf_dataset` as tensors, built once with `in_memory`, see `_take_column`."""
+        if self.in_memory and self._column_cache is None:
+            self._column_cache = {}
+            for key in self.hf_dataset.column_names:
+                values = arrow_column_to_torch(self.hf_dataset.data.column(key))
+                if values is None:
+                    continue
+                self._column_cache[key] = values.share_memory_() if self.share_memory else values
+        return self._column_cache
+
     def _get_query_indices(self, idx: int, ep_idx: int) -> tuple[dict[str, list[int | bool]]]:
-        ep = self.meta.episodes[ep_idx]
-        ep_start = ep["dataset_from_index"]
-        ep_end = ep["dataset_to_index"]
+        episode_lookup = self._get_episode_lookup()
+        ep_start = episode_lookup.from_index[ep_idx].item()
+        ep_end = episode_lookup.to_index[ep_idx].item()
         query_indices = {
             key: [max(ep_start, min(ep_end - 1, idx + delta)) for delta in delta_idx]
             for key, delta_idx in self.delta_indices.items()
@@ -941,16 +1068,64 @@ class LeRobotDataset(torch.utils.data.Dataset):
         }
         return query_indices, padding
 
+    def _get_batch_query_indices(
+        self, abs_indices: np.ndarray, ep_indices: np.ndarray
+    ) -> tuple[dict[str, np.ndarray], dict[str, torch.Tensor]]:
+        """Vectorized counterpart of `_get_query_indices` for a batch of samples.
+
+        Returns, for each key of `delta_indices`, a (batch_size, num_deltas) array of absolute indices clamped
+        to the boundaries of each sample's episode, along with the matching `{key}_is_pad` masks.
+        """
+        episode_lookup = self._get_episode_lookup()
+        ep_start = episode_lookup.from_index[ep_indices][:, None]
+        ep_end = episode_lookup.to_index[ep_indices][:, None]
+
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            query = abs_indices[:, None] + np.asarray(delta_idx)[None, :]
+            query_indices[key] = np.clip(query, ep_start, ep_end - 1)
+            # Pad values outside of current episode range
+            padding[f"{key}_is_pad"] = torch.from_numpy((query < ep_start) | (query >= ep_end))
+        return query_indices, padding
+
+    def _to_relative_indices(self, abs_indices: np.ndarray) -> np.ndarray:
+        """Map absolute dataset indices to row indices of `hf_dataset` (which differ when only a subset of the
+        episodes is loaded)."""
+        if self._absolute_to_relative_idx is None:
+            return abs_indices
+        return self._absolute_to_relative_idx[abs_indices]
+
+    def _take_column(self, key: str, relative_indices: np.ndarray) -> torch.Tensor | list:
+        """Gather a column of `hf_dataset` at an array of row indices with a single Arrow take.
+
+        Numeric columns are returned as a tensor of shape (*relative_indices.shape, *feature_shape), with the
+        same dtypes as `hf_transform_to_torch`. Other columns (e.g. images) go through the dataset transform
+        and are stacked when they are tensors.
+        """
+        column_cache = self._get_column_cache()
+        if column_cache is not None and key in column_cache:
+            return column_cache[key][torch.from_numpy(relative_indices)]
+
+        flat_indices = relative_indices.ravel()
+        values = arrow_column_to_torch(self.hf_dataset.data.column(key).take(flat_indices))
+        if values is None:
+            values = self.hf_dataset.select_columns(key)[flat_indices.tolist()][key]
+            if not isinstance(values[0], torch.Tensor):
+                return values
+            values = torch.stack(values)
+        return values.reshape(*relative_indices.shape, *values.shape[1:])
+
     def _get_query_timestamps(
         self,
         current_ts: float,
         query_indices: dict[str, list[int]] | None = None,
     ) -> dict[str, list[float]]:
         query_timestamps = {}
-        for key in self.meta.video_keys:
+        for key in self._video_keys:
             if query_indices is not None and key in query_indices:
                 if self._absolute_to_relative_idx is not None:
-                    relative_indices = [self._absolute_to_relative_idx[idx] for idx in query_indices[key]]
+                    relative_indices = self._absolute_to_relative_idx[query_indices[key]].tolist()
                     timestamps = self.hf_dataset[relative_indices]["timestamp"]
                 else:
                     timestamps = self.hf_dataset[query_indices[key]]["timestamp"]
@@ -980,7 +1155,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
             relative_indices = (
                 q_idx
                 if self._absolute_to_relative_idx is None
-                else [self._absolute_to_relative_idx[idx] for idx in q_idx]
+                else self._absolute_to_relative_idx[q_idx].tolist()
             )
             try:
                 result[key] = torch.stack(self.hf_dataset[key][relative_indices])
@@ -988,23 +1163,59 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 result[key] = torch.stack(self.hf_dataset[relative_indices][key])
         return result
 
+    def _query_hf_dataset_batch(self, query_indices: dict[str, np.ndarray]) -> dict[str, torch.Tensor]:
+        """Batched counterpart of `_query_hf_dataset`, skipping video keys.
+
+        Returns:
+            Dict mapping keys to tensors of shape (batch_size, num_deltas, *feature_shape).
+        """
+        return {
+            key: self._take_column(key, self._to_relative_indices(q_idx))
+            for key, q_idx in query_indices.items()
+            if key not in self.meta.video_keys
+        }
+
+    def _get_batch_query_timestamps(
+        self,
+        current_ts: torch.Tensor,
+        query_indices: dict[str, np.ndarray] | None = None,
+    ) -> list[dict[str, list[float]]]:
+        """Batched counterpart of `_get_query_timestamps`, returning one dict of timestamps per sample."""
+        query_timestamps = {}
+        for key in self._video_keys:
+            if query_indices is not None and key in query_indices:
+                relative_indices = self._to_relative_indices(query_indices[key])
+                query_timestamps[key] = self._take_column("timestamp", relative_indices).tolist()
+            else:
+                query_timestamps[key] = current_ts[:, None].tolist()
+
+        return [{key: ts[i] for key, ts in query_timestamps.items()} for i in range(len(current_ts))]
+
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
         in the main process (e.g. by using a second Dataloader with num_workers=0). It will result in a
         Segmentation Fault. This probably happens because a memory reference to the video loader is created in
         the main process and a subprocess fails to access it.
         """
-        ep = self.meta.episodes[ep_idx]
+        episode_lookup = self._get_episode_lookup()
         item = {}
         for vid_key, query_ts in query_timestamps.items():
             # Episodes are stored sequentially on a single mp4 to reduce the number of files.
             # Thus we load the start timestamp of the episode on this mp4 and,
             # shift the query timestamp accordingly.
-            from_timestamp = ep[f"videos/{vid_key}/from_timestamp"]
+            from_timestamp = episode_lookup.video_from_timestamps[vid_key][ep_idx].item()
             shifted_query_ts = [from_timestamp + ts for ts in query_ts]
 
-            video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, shifted_query_ts, self.tolerance_s, self.video_backend)
+            video_file_id = episode_lookup.video_file_ids[vid_key][ep_idx]
+            video_path = self.root / episode_lookup.video_files[video_file_id]
+            frames = decode_video_frames(
+                video_path,
+                shifted_query_ts,
+                self.tolerance_s,
+                self.video_backend,
+                self.frame_cache,
+                return_uint8=self.return_uint8_images,
+            )
             item[vid_key] = frames.squeeze(0)
 
         return item
@@ -1017,6 +1228,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self._close_writer()
                 self._writer_closed_for_reading = True
             self.hf_dataset = self.load_hf_dataset()
+            self._episode_lookup = None
+            self._column_cache = None
             self._lazy_loading = False
 
     def __len__(self):
@@ -1025,25 +1238,31 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def __getitem__(self, idx) -> dict:
         # Ensure dataset is loaded when we actually need to read from it
         self._ensure_hf_dataset_loaded()
+        if self.in_memory:
+            # Tensor indexing in the column cache is cheaper than materializing an Arrow row
+            return self.__getitems__([idx])[0]
         item = self.hf_dataset[idx]
         ep_idx = item["episode_index"].item()
 
         query_indices = None
         if self.delta_indices is not None:
-            query_indices, padding = self._get_query_indices(idx, ep_idx)
+            # Episode boundaries are expressed in absolute indices, which differ from `idx` when only a subset
+            # of the episodes is loaded
+            abs_idx = item["index"].item()
+            query_indices, padding = self._get_query_indices(abs_idx, ep_idx)
             query_result = self._query_hf_dataset(query_indices)
             item = {**item, **padding}
             for key, val in query_result.items():
                 item[key] = val
 
-        if len(self.meta.video_keys) > 0:
+        if len(self._video_keys) > 0:
             current_ts = item["timestamp"].item()
             query_timestamps = self._get_query_timestamps(current_ts, query_indices)
             video_frames = self._query_videos(query_timestamps, ep_idx)
             item = {**video_frames, **item}
 
         if self.image_transforms is not None:
-            image_keys = self.meta.camera_keys
+            image_keys = self._camera_keys
             for cam in image_keys:
                 item[cam] = self.image_transforms(item[cam])
 
@@ -1052,6 +1271,44 @@ class LeRobotDataset(torch.utils.data.Dataset):
         item["task"] = self.meta.tasks.iloc[task_idx].name
         return item
 
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Batched counterpart of `__getitem__`, used by `torch.utils.data.DataLoader` when batching.
+
+        Query indices and padding masks are computed for the whole batch with a few NumPy operations against
+        the episode boundaries, and each queried column is gathered with a single take instead of one lookup
+        per sample and per key (or by tensor indexing with `in_memory`). Video decoding, image transforms and task lookup remain per sample.
+        """
+        self._ensure_hf_dataset_loaded()
+        indices = np.asarray(indices, dtype=np.int64)
+        batch = {key: self._take_column(key, indices) for key in self.hf_dataset.column_names}
+        items = [{key: values[i] for key, values in batch.items()} for i in range(len(indices))]
+        ep_indices = batch["episode_index"].numpy()
+
+        query_indices = None
+        if self.delta_indices is not None:
+            abs_indices = batch["index"].numpy()
+            query_indices, padding = self._get_batch_query_indices(abs_indices, ep_indices)
+            query_result = self._query_hf_dataset_batch(query_indices)
+            for i, item in enumerate(items):
+                item.update({key: val[i] for key, val in padding.items()})
+                item.update({key: val[i] for key, val in query_result.items()})
+
+        if len(self._video_keys) > 0:
+            query_timestamps = self._get_batch_query_timestamps(batch["timestamp"], query_indices)
+            for i in range(len(items)):
+                video_frames = self._query_videos(query_timestamps[i], ep_indices[i].item())
+                items[i] = {**video_frames, **items[i]}
+
+        for item in items:
+            if self.image_transforms is not None:
+                for cam in self._camera_keys:
+                    item[cam] = self.image_transforms(item[cam])
+
+            # Add task as a string
+            task_idx = item["task_index"].item()
+            item["task"] = self.meta.tasks.iloc[task_idx].name
+        return items
+
     def __repr__(self):
         feature_keys = list(self.features)
         return (
@@ -1070,9 +1327,10 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """
         self._close_writer()
         self.meta._close_writer()
+        self._stop_encoding_pool()
 
     def create_episode_buffer(self, episode_index: int | None = None) -> dict:
-        current_ep_idx = self.meta.total_episodes if episode_index is None else episode_index
+        current_ep_idx = self.num_episodes if episode_index is None else episode_index
         ep_buffer = {}
         # size and task are special cases that are not in self.features
         ep_buffer["size"] = 0
@@ -1131,7 +1389,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
                     f"An element of the frame is not in the features. '{key}' not in '{self.features.keys()}'."
                 )
 
-            if self.features[key]["dtype"] in ["image", "video"]:
+            if self.features[key]["dtype"] == "video" and self.streaming_encoding:
+                self.episode_buffer[key].append(self._stream_video_frame(key, frame[key], frame_index))
+            elif self.features[key]["dtype"] in ["image", "video"]:
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
@@ -1161,12 +1421,16 @@ class LeRobotDataset(torch.utils.data.Dataset):
             episode_data (dict | None, optional): Dict containing the episode data to save. If None, this will
                 save the current episode in self.episode_buffer, which is filled with 'add_frame'. Defaults to
                 None.
-            parallel_encoding (bool, optional): If True, encode videos in parallel using ProcessPoolExecutor.
-                Defaults to True on Linux, False on macOS as it tends to use all the CPU available already.
+            parallel_encoding (bool, optional): If True, encode videos in parallel using the encoding process
+                pool of the dataset (see `video_encoding_workers`). Defaults to True on Linux, False on macOS
+                as it tends to use all the CPU available already.
         """
         episode_buffer = episode_data if episode_data is not None else self.episode_buffer
 
-        validate_episode_buffer(episode_buffer, self.meta.total_episodes, self.features)
+        # Episodes waiting for batch encoding are not in the metadata yet
+        total_episodes = self.meta.total_episodes + len(self._pending_episodes)
+        total_frames = self.meta.total_frames + sum(ep["episode_length"] for ep in self._pending_episodes)
+        validate_episode_buffer(episode_buffer, total_episodes, self.features)
 
         # size and task are special cases that won't be added to hf_dataset
         episode_length = episode_buffer.pop("size")
@@ -1174,7 +1438,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         episode_tasks = list(set(tasks))
         episode_index = episode_buffer["episode_index"]
 
-        episode_buffer["index"] = np.arange(self.meta.total_frames, self.meta.total_frames + episode_length)
+        episode_buffer["index"] = np.arange(total_frames, total_frames + episode_length)
         episode_buffer["episode_index"] = np.full((episode_length,), episode_index)
 
         # Update tasks and task indices with new tasks if any
@@ -1192,71 +1456,55 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         # Wait for image writer to end, so that episode stats over images can be computed
         self._wait_image_writer()
-        ep_stats = compute_episode_stats(episode_buffer, self.features)
+        ep_stats = compute_episode_stats(
+            episode_buffer, self.features, histogram_bins=self.stats_histogram_bins
+        )
 
         ep_metadata = self._save_episode_data(episode_buffer)
         has_video_keys = len(self.meta.video_keys) > 0
         use_batched_encoding = self.batch_encoding_size > 1
 
-        if has_video_keys and not use_batched_encoding:
-            num_cameras = len(self.meta.video_keys)
-            if parallel_encoding and num_cameras > 1:
-                # TODO(Steven): Ideally we would like to control the number of threads per encoding such that:
-                # num_cameras * num_threads = (total_cpu -1)
-                with concurrent.futures.ProcessPoolExecutor(max_workers=num_cameras) as executor:
-                    future_to_key = {
-                        executor.submit(
-                            _encode_video_worker,
-                            video_key,
-                            episode_index,
-                            self.root,
-                            self.fps,
-                        ): video_key
-                        for video_key in self.meta.video_keys
-                    }
-
-                    results = {}
-                    for future in concurrent.futures.as_completed(future_to_key):
-                        video_key = future_to_key[future]
-                        try:
-                            temp_path = future.result()
-                            results[video_key] = temp_path
-                        except Exception as exc:
-                            logging.error(f"Video encoding failed for {video_key}: {exc}")
-                            raise exc
-
-                for video_key in self.meta.video_keys:
-                    temp_path = results[video_key]
-                    ep_metadata.update(
-                        self._save_episode_video(video_key, episode_index, temp_path=temp_path)
-                    )
-            else:
-                for video_key in self.meta.video_keys:
-                    ep_metadata.update(self._save_episode_video(video_key, episode_index))
-
-        # `meta.save_episode` need to be executed after encoding the videos
-        self.meta.save_episode(episode_index, episode_length, episode_tasks, ep_stats, ep_metadata)
+        if has_video_keys and self.streaming_encoding:
+            for video_key in self.meta.video_keys:
+                temp_path = self._streaming_encoders.pop(video_key).finish()
+                ep_metadata.update(self._save_episode_video(video_key, episode_index, temp_path=temp_path))
+        elif has_video_keys and not use_batched_encoding:
+            for _, video_key, temp_path in self._encode_episodes_videos([episode_index], parallel_encoding):
+                ep_metadata.update(self._save_episode_video(video_key, episode_index, temp_path=temp_path))
 
+        episode = {
+            "episode_index": episode_index,
+            "episode_length": episode_length,
+            "episode_tasks": episode_tasks,
+            "episode_stats": ep_stats,
+            "episode_metadata": ep_metadata,
+        }
         if has_video_keys and use_batched_encoding:
-            # Check if we should trigger batch encoding
+            # `meta.save_episode` need to be executed after encoding the videos, which happens in batches
+            self._pending_episodes.append(episode)
             self.episodes_since_last_encoding += 1
             if self.episodes_since_last_encoding == self.batch_encoding_size:
                 start_ep = self.num_episodes - self.batch_encoding_size
                 end_ep = self.num_episodes
-                self._batch_save_episode_video(start_ep, end_ep)
-                self.episodes_since_last_encoding = 0
+                self._batch_save_episode_video(start_ep, end_ep, parallel_encoding)
+        else:
+            self.meta.save_episode(**episode)
 
         if not episode_data:
             # Reset episode buffer and clean up temporary images (if not already deleted during video encoding)
             self.clear_episode_buffer(delete_images=len(self.meta.image_keys) > 0)
 
-    def _batch_save_episode_video(self, start_episode: int, end_episode: int | None = None) -> None:
+    def _batch_save_episode_video(
+        self, start_episode: int, end_episode: int | None = None, parallel_encoding: bool = True
+    ) -> None:
         """
         Batch save videos for multiple episodes.
 
         Args:
             start_episode: Starting episode index (inclusive)
             end_episode: Ending episode index (exclusive). If None, encodes all episodes from start_episode to the current episode.
+            parallel_encoding: If True, all cameras of all episodes are encoded concurrently by the encoding pool,
+                while the encoded videos are concatenated in order.
         """
         if end_episode is None:
             end_episode = self.num_episodes
@@ -1265,43 +1513,84 @@ class LeRobotDataset(torch.utils.data.Dataset):
             f"Batch encoding {self.batch_encoding_size} videos for episodes {start_episode} to {end_episode - 1}"
         )
 
-        chunk_idx = self.meta.episodes[start_episode]["data/chunk_index"]
-        file_idx = self.meta.episodes[start_episode]["data/file_index"]
-        episode_df_path = self.root / DEFAULT_EPISODES_PATH.format(chunk_index=chunk_idx, file_index=file_idx)
-        episode_df = pd.read_parquet(episode_df_path)
+        # The metadata of the episodes is saved in order once their videos are encoded, so that each video
+        # is concatenated after the one of the previous episode
+        episodes = [ep for ep in self._pending_episodes if start_episode <= ep["episode_index"] < end_episode]
+        encoded_videos = self._encode_episodes_videos(
+            [ep["episode_index"] for ep in episodes], parallel_encoding
+        )
+        for episode in episodes:
+            ep_idx = episode["episode_index"]
+            logging.info(f"Saving videos for episode {ep_idx}")
+            for video_key in self.meta.video_keys:
+                _, _, temp_path = next(encoded_videos)
+                episode["episode_metadata"].update(
+                    self._save_episode_video(video_key, ep_idx, temp_path=temp_path)
+                )
+            self.meta.save_episode(**episode)
+            self._pending_episodes.remove(episode)
+
+        self.episodes_since_last_encoding = len(self._pending_episodes)
 
-        for ep_idx in range(start_episode, end_episode):
-            logging.info(f"Encoding videos for episode {ep_idx}")
+    def _get_encoding_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the process pool encoding videos, starting it on first use."""
+        if self._encoding_pool is None:
+            self._encoding_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._get_num_encoding_workers()
+            )
+        return self._encoding_pool
 
-            if (
-                self.meta.episodes[ep_idx]["data/chunk_index"] != chunk_idx
-                or self.meta.episodes[ep_idx]["data/file_index"] != file_idx
-            ):
-                # The current episode is in a new chunk or file.
-                # Save previous episode dataframe and update the Hugging Face dataset by reloading it.
-                episode_df.to_parquet(episode_df_path)
-                self.meta.episodes = load_episodes(self.root)
-
-                # Load new episode dataframe
-                chunk_idx = self.meta.episodes[ep_idx]["data/chunk_index"]
-                file_idx = self.meta.episodes[ep_idx]["data/file_index"]
-                episode_df_path = self.root / DEFAULT_EPISODES_PATH.format(
-                    chunk_index=chunk_idx, file_index=file_idx
-                )
-                episode_df = pd.read_parquet(episode_df_path)
+    def _get_num_encoding_workers(self) -> int:
+        return self.video_encoding_workers or max(len(self.meta.video_keys), 1)
 
-            # Save the current episode's video metadata to the dataframe
-            video_ep_metadata = {}
-            for video_key in self.meta.video_keys:
-                video_ep_metadata.update(self._save_episode_video(video_key, ep_idx))
-            video_ep_metadata.pop("episode_index")
-            video_ep_df = pd.DataFrame(video_ep_metadata, index=[ep_idx]).convert_dtypes(
-                dtype_backend="pyarrow"
-            )  # allows NaN values along with integers
+    def _stop_encoding_pool(self, cancel_futures: bool = False) -> None:
+        if self._encoding_pool is not None:
+            self._encoding_pool.shutdown(wait=True, cancel_futures=cancel_futures)
+            self._encoding_pool = None
+
+    def _encode_episodes_videos(
+        self, episode_indices: list[int], parallel_encoding: bool = True
+    ) -> Iterator[tuple[int, str, Path]]:
+        """Encode the videos of all cameras of `episode_indices` into temporary files.
+
+        Yields `(episode_index, video_key, temp_path)` ordered by episode, then by camera. With
+        `parallel_encoding`, the encodings run concurrently in the encoding pool. To bound the number of
+        temporary videos waiting on disk, at most twice as many encodings as pool processes are pending.
+        """
+        jobs = [(ep_idx, video_key) for ep_idx in episode_indices for video_key in self.meta.video_keys]
+        if not parallel_encoding or len(jobs) <= 1:
+            for ep_idx, video_key in jobs:
+                yield ep_idx, video_key, self._encode_temporary_episode_video(video_key, ep_idx)
+            return
 
-            episode_df = episode_df.combine_first(video_ep_df)
-            episode_df.to_parquet(episode_df_path)
-            self.meta.episodes = load_episodes(self.root)
+        # TODO(Steven): Ideally we would like to control the number of threads per encoding such that:
+        # num_workers * num_threads = (total_cpu -1)
+        pool = self._get_encoding_pool()
+        max_pending = 2 * self._get_num_encoding_workers()
+        pending = collections.deque()
+        jobs_iter = iter(jobs)
+        completed = False
+        try:
+            while True:
+                for ep_idx, video_key in jobs_iter:
+                    future = pool.submit(_encode_video_worker, video_key, ep_idx, self.root, self.fps)
+                    pending.append((ep_idx, video_key, future))
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    completed = True
+                    return
+                ep_idx, video_key, future = pending.popleft()
+                try:
+                    temp_path = future.result()
+                except Exception as exc:
+                    logging.error(f"Video encoding failed for {video_key}: {exc}")
+                    raise exc
+                yield ep_idx, video_key, temp_path
+        finally:
+            if not completed:
+                # On errors, here or in the caller, don't leave the pool encoding the remaining videos
+                self._stop_encoding_pool(cancel_futures=True)
 
     def _save_episode_data(self, episode_buffer: dict) -> dict:
         """Save episode data to a parquet file and update the Hugging Face dataset of frames data.
@@ -1492,9 +1781,45 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 if img_dir.is_dir():
                     shutil.rmtree(img_dir)
 
+        # Discard the videos of the current episode that are still being encoded
+        for encoder in self._streaming_encoders.values():
+            encoder.cancel()
+            shutil.rmtree(encoder.video_path.parent, ignore_errors=True)
+        self._streaming_encoders = {}
+
         # Reset the buffer
         self.episode_buffer = self.create_episode_buffer()
 
+    def _set_streaming_encoding(self, streaming_encoding: bool) -> None:
+        if streaming_encoding and self.batch_encoding_size > 1:
+            raise ValueError("streaming_encoding is not compatible with batch_encoding_size > 1.")
+        self.streaming_encoding = streaming_encoding
+        self._streaming_encoders: dict[str, StreamingVideoEncoder] = {}
+
+    def _stream_video_frame(
+        self, video_key: str, image: np.ndarray | PIL.Image.Image, frame_index: int
+    ) -> np.ndarray:
+        """Send a frame to the streaming encoder of `video_key`, and return a downsampled copy for stats."""
+        if frame_index == 0:
+            episode_index = self.episode_buffer["episode_index"]
+            temp_path = Path(tempfile.mkdtemp(dir=self.root)) / f"{video_key}_{episode_index:03d}.mp4"
+            self._streaming_encoders[video_key] = StreamingVideoEncoder(temp_path, self.fps)
+
+        if isinstance(image, PIL.Image.Image):
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            array = np.asarray(image).transpose(2, 0, 1)
+        else:
+            # Arrays are converted to images by the encoder thread, off the recording loop
+            array = image if image.shape[0] == 3 else image.transpose(2, 0, 1)
+        self._streaming_encoders[video_key].add_frame(image)
+
+        # Only a downsampled version of the frames is kept in memory, as `compute_episode_stats` would load it
+        array = auto_downsample_height_width(array)
+        if array.dtype != np.uint8:
+            array = (array * 255).astype(np.uint8)
+        return np.ascontiguousarray(array)
+
     def start_image_writer(self, num_processes: int = 0, num_threads: int = 4) -> None:
         if isinstance(self.image_writer, AsyncImageWriter):
             logging.warning(
@@ -1542,6 +1867,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
         image_writer_threads: int = 0,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        streaming_encoding: bool = False,
+        video_encoding_workers: int | None = None,
+        stats_histogram_bins: int | None = None,
     ) -> "LeRobotDataset":
         """Create a LeRobot Dataset from scratch in order to record data."""
         obj = cls.__new__(cls)
@@ -1560,6 +1888,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.image_writer = None
         obj.batch_encoding_size = batch_encoding_size
         obj.episodes_since_last_encoding = 0
+        obj._set_streaming_encoding(streaming_encoding)
+        obj.video_encoding_workers = video_encoding_workers
+        obj._encoding_pool = None
+        obj._pending_episodes = []
+        obj.stats_histogram_bins = stats_histogram_bins
 
         if image_writer_processes or image_writer_threads:
             obj.start_image_writer(image_writer_processes, image_writer_threads)
@@ -1573,7 +1906,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.delta_timestamps = None
         obj.delta_indices = None
         obj._absolute_to_relative_idx = None
+        obj._episode_lookup = None
         obj.video_backend = video_backend if video_backend is not None else get_safe_default_codec()
+        obj.frame_cache = None
+        obj.return_uint8_images = False
+        obj.columns = None
+        obj.in_memory = False
+        obj.share_memory = False
+        obj._column_cache = None
         obj.writer = None
         obj.latest_episode = None
         obj._current_file_start_frame = None
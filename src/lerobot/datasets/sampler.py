@@ -15,6 +15,7 @@
 # limitations under the License.
 from collections.abc import Iterator
 
+import numpy as np
 import torch
 
 
@@ -27,6 +28,7 @@ class EpisodeAwareSampler:
         drop_n_first_frames: int = 0,
         drop_n_last_frames: int = 0,
         shuffle: bool = False,
+        block_size: int | None = None,
     ):
         """Sampler that optionally incorporates episode boundary information.
 
@@ -38,24 +40,47 @@ class EpisodeAwareSampler:
             drop_n_first_frames: Number of frames to drop from the start of each episode.
             drop_n_last_frames: Number of frames to drop from the end of each episode.
             shuffle: Whether to shuffle the indices.
+            block_size: If set, indices are shuffled by blocks of up to `block_size` consecutive frames that
+                        never span two episodes, and each block is yielded in temporal order. This keeps
+                        neighbouring frames together for caches of decoded video frames, at the cost of less
+                        randomness within a batch.
         """
-        indices = []
-        for episode_idx, (start_index, end_index) in enumerate(
-            zip(dataset_from_indices, dataset_to_indices, strict=True)
-        ):
-            if episode_indices_to_use is None or episode_idx in episode_indices_to_use:
-                indices.extend(range(start_index + drop_n_first_frames, end_index - drop_n_last_frames))
-
-        self.indices = indices
+        if block_size is not None and block_size < 1:
+            raise ValueError(f"block_size must be at least 1, got {block_size}.")
+        from_indices = np.asarray(dataset_from_indices, dtype=np.int64)
+        to_indices = np.asarray(dataset_to_indices, dtype=np.int64)
+        if len(from_indices) != len(to_indices):
+            raise ValueError(
+                f"dataset_from_indices and dataset_to_indices must have the same length, got "
+                f"{len(from_indices)} and {len(to_indices)}."
+            )
+
+        if episode_indices_to_use is not None:
+            episode_mask = np.isin(np.arange(len(from_indices)), np.asarray(episode_indices_to_use))
+            from_indices, to_indices = from_indices[episode_mask], to_indices[episode_mask]
+
+        starts = from_indices + drop_n_first_frames
+        lengths = np.clip(to_indices - drop_n_last_frames - starts, 0, None)
+        # Concatenate the ranges [start, start + length) of all episodes without a Python loop
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.indices = (np.repeat(starts, lengths) + offsets).tolist()
         self.shuffle = shuffle
+        self.block_size = block_size
+
+        if block_size is not None:
+            # Positions in `self.indices` where each block starts, restarting at every episode boundary
+            block_starts = np.flatnonzero(offsets % block_size == 0)
+            self._block_bounds = np.append(block_starts, len(self.indices)).tolist()
 
     def __iter__(self) -> Iterator[int]:
-        if self.shuffle:
-            for i in torch.randperm(len(self.indices)):
+        if self.shuffle and self.block_size is not None:
+            for b in torch.randperm(len(self._block_bounds) - 1).tolist():
+                yield from self.indices[self._block_bounds[b] : self._block_bounds[b + 1]]
+        elif self.shuffle:
+            for i in torch.randperm(len(self.indices)).tolist():
                 yield self.indices[i]
         else:
-            for i in self.indices:
-                yield i
+            yield from self.indices
 
     def __len__(self) -> int:
         return len(self.indices)
@@ -13,13 +13,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import io
+import logging
+import math
+from collections import OrderedDict
 from collections.abc import Callable, Generator, Iterator
 from pathlib import Path
 
 import datasets
+import fsspec
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import torch
 from datasets import load_dataset
+from PIL import Image as PILImage
+from torchvision import transforms
 
 from lerobot.datasets.lerobot_dataset import CODEBASE_VERSION, LeRobotDatasetMetadata
 from lerobot.datasets.utils import (
@@ -27,6 +36,7 @@ from lerobot.datasets.utils import (
     LookAheadError,
     LookBackError,
     check_version_compatibility,
+    column_to_numpy,
     find_float_index,
     get_delta_indices,
     is_float_in_list,
@@ -34,7 +44,9 @@ from lerobot.datasets.utils import (
     safe_shard,
 )
 from lerobot.datasets.video_utils import (
+    DecodedFrameCache,
     VideoDecoderCache,
+    VideoSegmentPrefetcher,
     decode_video_frames_torchcodec,
 )
 from lerobot.utils.constants import HF_LEROBOT_HOME, LOOKAHEAD_BACKTRACKTABLE, LOOKBACK_BACKTRACKTABLE
@@ -94,6 +106,9 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         seed: int = 42,
         rng: np.random.Generator | None = None,
         shuffle: bool = True,
+        read_row_groups: bool = False,
+        prefetch_episodes: int = 0,
+        prefetch_buffer_bytes: int = 2 * 1024**3,
     ):
         """Initialize a StreamingLeRobotDataset.
 
@@ -112,8 +127,23 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
             seed (int, optional): Reproducibility random seed.
             rng (np.random.Generator | None, optional): Random number generator.
             shuffle (bool, optional): Whether to shuffle the dataset across exhaustions. Defaults to True.
+            read_row_groups (bool, optional): Read whole parquet row groups instead of streaming frames one by
+                one through `datasets`. Delta windows are then sliced from the row group arrays, row groups
+                are sharded across DataLoader workers and distributed ranks, and up to `max_num_shards` of
+                them are interleaved through the shuffle buffer. Frames are returned as tensors, like
+                `LeRobotDataset`. Defaults to False.
+            prefetch_episodes (int, optional): Number of upcoming episodes of each shard whose video segments
+                are decoded sequentially in background threads, ahead of their frames being queried. With
+                `read_row_groups`, the frames of the row groups being interleaved are prefetched instead,
+                along with those of the next `prefetch_episodes` row groups this iterator will read. 0
+                disables prefetching. Defaults to 0.
+            prefetch_buffer_bytes (int, optional): Maximum number of bytes held by the prefetched frames, per
+                process. It should fit the frames of all the segments prefetched for the shards being
+                interleaved, a warning is logged otherwise. Defaults to 2 GiB.
         """
         super().__init__()
+        if max_num_shards < 1:
+            raise ValueError(f"max_num_shards must be at least 1, got {max_num_shards}.")
         self.repo_id = repo_id
         self.root = Path(root) if root else HF_LEROBOT_HOME / repo_id
         self.streaming_from_local = root is not None
@@ -131,6 +161,11 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
 
         # We cache the video decoders to avoid re-initializing them at each frame (avoiding a ~10x slowdown)
         self.video_decoder_cache = None
+        self.prefetch_episodes = prefetch_episodes
+        self.prefetch_buffer_bytes = prefetch_buffer_bytes
+        self.video_prefetcher = None
+        # Episodes whose upcoming video segments were recently scheduled for prefetching
+        self._prefetched_episodes: OrderedDict[int, None] = OrderedDict()
 
         self.root.mkdir(exist_ok=True, parents=True)
 
@@ -140,6 +175,10 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         )
         # Check version
         check_version_compatibility(self.repo_id, self.meta._version, CODEBASE_VERSION)
+        # Selected episodes in order, to find the episodes following a given one
+        self._sorted_episodes = (
+            np.arange(self.meta.total_episodes) if episodes is None else np.unique(np.asarray(episodes))
+        )
 
         self.delta_timestamps = None
         self.delta_indices = None
@@ -149,6 +188,21 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
             self.delta_timestamps = delta_timestamps
             self.delta_indices = get_delta_indices(self.delta_timestamps, self.fps)
 
+        self.read_row_groups = read_row_groups
+        self.max_num_shards = max_num_shards
+        # (data file, row group index, number of rows) of the dataset, listed on the first iteration
+        self._row_groups: list[tuple[str, int, int]] | None = None
+        # First row of each row group of a data file, followed by the number of rows of the file
+        self._row_group_offsets: dict[str, np.ndarray] = {}
+        # Dataset index of the first row of each data file
+        self._data_file_from_index: dict[str, int] = {}
+
+        if self.read_row_groups:
+            # Parquet files are read directly, so `datasets` is not needed
+            self.hf_dataset = None
+            self.num_shards = max_num_shards
+            return
+
         self.hf_dataset: datasets.IterableDataset = load_dataset(
             self.repo_id if not self.streaming_from_local else str(self.root),
             split="train",
@@ -183,17 +237,29 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         while True:
             yield rng.choice(elements)
 
-    # TODO(fracapuano): Implement multi-threaded prefetching to accelerate data loading.
-    # The current sequential iteration is a bottleneck. A producer-consumer pattern
-    # could be used with a ThreadPoolExecutor to run `make_frame` (especially video decoding)
-    # in parallel, feeding a queue from which this iterator will yield processed items.
     def __iter__(self) -> Iterator[dict[str, torch.Tensor]]:
         if self.video_decoder_cache is None:
             self.video_decoder_cache = VideoDecoderCache()
+        if self.prefetch_episodes > 0 and len(self.meta.video_keys) > 0 and self.video_prefetcher is None:
+            if self.read_row_groups:
+                # The row groups being interleaved, and the next ones (one segment per episode and camera)
+                num_segments = self.num_shards + self.prefetch_episodes
+            else:
+                # The current and next episodes of each of the shards being interleaved
+                num_segments = self.num_shards * (self.prefetch_episodes + 1)
+                self._check_prefetch_buffer_size(num_segments * self.num_frames / self.num_episodes)
+            self.video_prefetcher = VideoSegmentPrefetcher(
+                DecodedFrameCache(self.prefetch_buffer_bytes),
+                max_segments=num_segments * len(self.meta.video_keys),
+            )
 
         # keep the same seed across exhaustions if shuffle is False, otherwise shuffle data across exhaustions
         rng = np.random.default_rng(self.seed) if not self.shuffle else self.rng
 
+        if self.read_row_groups:
+            yield from self._iter_row_groups(rng)
+            return
+
         buffer_indices_generator = self._iter_random_indices(rng, self.buffer_size)
 
         idx_to_backtrack_dataset = {
@@ -229,6 +295,248 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         rng.shuffle(frames_buffer)
         yield from frames_buffer
 
+    @staticmethod
+    def _get_worker_shard() -> tuple[int, int]:
+        """Returns the index of this DataLoader worker across all distributed ranks, and the number of them."""
+        worker_info = torch.utils.data.get_worker_info()
+        worker_id, num_workers = (worker_info.id, worker_info.num_workers) if worker_info else (0, 1)
+        rank, world_size = 0, 1
+        if torch.distributed.is_available() and torch.distributed.is_initialized():
+            rank, world_size = torch.distributed.get_rank(), torch.distributed.get_world_size()
+        return rank * num_workers + worker_id, world_size * num_workers
+
+    def _get_data_file_paths(self) -> list[str]:
+        episodes = range(self.meta.total_episodes) if self.episodes is None else self.episodes
+        return sorted({str(self.meta.get_data_file_path(ep_idx)) for ep_idx in episodes})
+
+    def _open_parquet_file(self, data_path: str) -> pq.ParquetFile:
+        if self.streaming_from_local:
+            return pq.ParquetFile(self.root / data_path)
+        fs, fs_path = fsspec.core.url_to_fs(f"{self.meta.url_root}/{data_path}")
+        return pq.ParquetFile(fs.open(fs_path, "rb"))
+
+    def _get_row_groups(self) -> list[tuple[str, int, int]]:
+        if self._row_groups is None:
+            self._row_groups = []
+            for data_path in self._get_data_file_paths():
+                metadata = self._open_parquet_file(data_path).metadata
+                sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+                self._row_groups.extend((data_path, i, size) for i, size in enumerate(sizes))
+                self._row_group_offsets[data_path] = np.concatenate([[0], np.cumsum(sizes)])
+            # Data files hold contiguous episodes, which may not all be selected
+            for ep_idx, from_index in enumerate(self.meta.episodes["dataset_from_index"]):
+                data_path = str(self.meta.get_data_file_path(ep_idx))
+                self._data_file_from_index[data_path] = min(
+                    self._data_file_from_index.get(data_path, from_index), from_index
+                )
+        return self._row_groups
+
+    def _get_row_group_video_segments(self, data_path: str, row_group: int) -> list[tuple[str, float, float]]:
+        """Returns the `(video path, from_timestamp, to_timestamp)` segments queried by a row group's frames.
+
+        Only the frames of the row group (and of their delta windows) are covered, rather than whole episodes.
+        """
+        offsets = self._row_group_offsets[data_path] + self._data_file_from_index[data_path]
+        start, stop = int(offsets[row_group]), int(offsets[row_group + 1])
+        ep_from = np.asarray(self.meta.episodes["dataset_from_index"])
+        ep_to = np.asarray(self.meta.episodes["dataset_to_index"])
+        first_ep = int(np.searchsorted(ep_to, start, side="right"))
+        last_ep = int(np.searchsorted(ep_from, stop, side="left"))
+        selected = self._sorted_episodes[
+            np.searchsorted(self._sorted_episodes, first_ep) : np.searchsorted(self._sorted_episodes, last_ep)
+        ]
+
+        segments = []
+        for ep_idx in selected.tolist():
+            episode = self.meta.episodes[ep_idx]
+            boundaries = {
+                key: (episode[f"videos/{key}/from_timestamp"], episode[f"videos/{key}/to_timestamp"])
+                for key in self.meta.video_keys
+            }
+            # Frames are queried at `index / fps`, like in `_iter_row_group_frames`
+            first_ts = self._get_query_timestamps(
+                max(start, ep_from[ep_idx]) / self.fps, self.delta_indices, boundaries
+            )
+            last_ts = self._get_query_timestamps(
+                (min(stop, ep_to[ep_idx]) - 1) / self.fps, self.delta_indices, boundaries
+            )
+            for key in self.meta.video_keys:
+                segments.append(
+                    (self._get_video_path(ep_idx, key), min(first_ts[key]), max(last_ts[key]) + 1 / self.fps)
+                )
+        return segments
+
+    def _check_prefetch_buffer_size(self, num_frames: float):
+        """Warns when the frames of the prefetched segments do not fit in `prefetch_buffer_bytes`."""
+        frame_bytes = sum(math.prod(self.meta.features[key]["shape"]) for key in self.meta.video_keys)
+        prefetched_bytes = num_frames * frame_bytes
+        if prefetched_bytes > self.prefetch_buffer_bytes:
+            logging.warning(
+                f"The ~{prefetched_bytes / 1024**3:.1f} GiB of video frames prefetched for the shards being "
+                f"interleaved exceed the {self.prefetch_buffer_bytes / 1024**3:.1f} GiB of "
+                "`prefetch_buffer_bytes`, so frames will be evicted before being read. Lower "
+                "`prefetch_episodes` or `max_num_shards`, or raise `prefetch_buffer_bytes`."
+            )
+
+    def _iter_row_groups(self, rng: np.random.Generator) -> Iterator[dict[str, torch.Tensor]]:
+        """Iterates over the frames of whole row groups, sharded across workers and ranks.
+
+        All the workers draw the same permutation of the row groups from `rng` and keep every n-th of them, so
+        that each row group is read by exactly one worker. Up to `max_num_shards` row groups are then read at
+        once and their frames are interleaved through the shuffle buffer.
+        """
+        shard_id, num_shards = self._get_worker_shard()
+        row_groups = self._get_row_groups()
+        order = rng.permutation(len(row_groups))
+        pending = [row_groups[i] for i in order[shard_id::num_shards]]
+        next_pending = next_prefetched = 0
+        if self.video_prefetcher is not None:
+            num_rows = sum(row_group[2] for row_group in row_groups)
+            self._check_prefetch_buffer_size(
+                (self.max_num_shards + self.prefetch_episodes) * num_rows / len(row_groups)
+            )
+        # Workers share the permutation above, but must not draw the same frames from their buffers
+        rng = np.random.default_rng([int(rng.integers(2**32)), shard_id])
+        buffer_indices_generator = self._iter_random_indices(rng, self.buffer_size)
+
+        # Each data file is opened once, and kept open while its row groups are likely to be read
+        parquet_files: OrderedDict[str, pq.ParquetFile] = OrderedDict()
+        active: list[Iterator[dict]] = []
+        frames_buffer = []
+        while True:
+            while len(active) < self.max_num_shards and next_pending < len(pending):
+                data_path, row_group, _ = pending[next_pending]
+                next_pending += 1
+                # Keep the video segments of the next row groups scheduled, in the order they will be read
+                while self.video_prefetcher is not None and next_prefetched < min(
+                    len(pending), next_pending + self.prefetch_episodes
+                ):
+                    for video_segment in self._get_row_group_video_segments(*pending[next_prefetched][:2]):
+                        self.video_prefetcher.prefetch(*video_segment)
+                    next_prefetched += 1
+                if data_path not in parquet_files:
+                    parquet_files[data_path] = self._open_parquet_file(data_path)
+                    if len(parquet_files) > self.max_num_shards:
+                        parquet_files.popitem(last=False)
+                parquet_files.move_to_end(data_path)
+                active.append(self._iter_row_group_frames(parquet_files[data_path], data_path, row_group))
+            if not active:
+                break
+
+            shard_key = int(rng.integers(len(active)))
+            frame = next(active[shard_key], None)
+            if frame is None:
+                del active[shard_key]  # Remove exhausted row group, onto the next one
+            elif len(frames_buffer) == self.buffer_size:
+                i = next(buffer_indices_generator)  # samples a element from the buffer
+                yield frames_buffer[i]
+                frames_buffer[i] = frame
+            else:
+                frames_buffer.append(frame)
+
+        # Once row groups are all exhausted, shuffle the buffer and yield the remaining frames
+        rng.shuffle(frames_buffer)
+        yield from frames_buffer
+
+    def _read_rows(self, parquet_file: pq.ParquetFile, data_path: str, start: int, stop: int) -> pa.Table:
+        """Reads the rows [start, stop) of a data file, only loading the row groups they belong to."""
+        offsets = self._row_group_offsets[data_path]
+        first = int(np.searchsorted(offsets, start, side="right")) - 1
+        last = int(np.searchsorted(offsets, stop, side="left"))
+        table = parquet_file.read_row_groups(list(range(first, last)))
+        return table.slice(start - offsets[first], stop - start)
+
+    def _iter_row_group_frames(
+        self, parquet_file: pq.ParquetFile, data_path: str, row_group: int
+    ) -> Iterator[dict[str, torch.Tensor]]:
+        """Yields the frames of a row group, in order.
+
+        Delta windows are computed for all the frames at once with array indexing. The rows of the neighbouring
+        row groups are only read when a window spills over the boundaries of the row group.
+        """
+        offsets = self._row_group_offsets[data_path]
+        start, stop = int(offsets[row_group]), int(offsets[row_group + 1])
+
+        deltas = [
+            delta
+            for key, delta_indices in (self.delta_indices or {}).items()
+            if key not in self.meta.video_keys
+            for delta in delta_indices
+        ]
+        # Windows never cross episodes, which never cross data files. The block always contains the rows of
+        # the row group themselves, even when all the deltas are on the same side of 0.
+        block_start = max(0, start + min([0, *deltas]))
+        block_stop = min(int(offsets[-1]), stop + max([0, *deltas]))
+        if block_start == start and block_stop == stop:
+            block = parquet_file.read_row_group(row_group)
+        else:
+            block = self._read_rows(parquet_file, data_path, block_start, block_stop)
+
+        image_keys = [key for key in block.column_names if self.meta.features[key]["dtype"] == "image"]
+        columns = {
+            key: block[key].to_pylist() if key in image_keys else torch.tensor(column_to_numpy(block[key]))
+            for key in block.column_names
+        }
+        for key, column in columns.items():
+            if key in image_keys:
+                continue
+            # Same dtypes as the ones `hf_transform_to_torch` gives to the items of `LeRobotDataset`
+            if column.is_floating_point():
+                columns[key] = column.float()
+            elif column.dtype != torch.bool:
+                columns[key] = column.long()
+
+        # Rows of the row group, and the bounds of their episodes, as positions in `block`
+        rows = np.arange(start - block_start, stop - block_start)
+        index = columns["index"][rows].numpy()
+        episode_index = columns["episode_index"][rows].numpy()
+        ep_from = np.asarray(self.meta.episodes["dataset_from_index"])[episode_index]
+        ep_to = np.asarray(self.meta.episodes["dataset_to_index"])[episode_index]
+        ep_start_rows = rows - (index - ep_from)
+        ep_end_rows = rows + (ep_to - index)
+
+        delta_positions, delta_padding = {}, {}
+        for key, delta_indices in (self.delta_indices or {}).items():
+            if key in self.meta.video_keys:
+                continue
+            query_rows = rows[:, None] + np.asarray(delta_indices)[None, :]
+            delta_padding[key] = torch.from_numpy(
+                (query_rows < ep_start_rows[:, None]) | (query_rows >= ep_end_rows[:, None])
+            )
+            delta_positions[key] = np.clip(query_rows, ep_start_rows[:, None], ep_end_rows[:, None] - 1)
+
+        episodes = None if self.episodes is None else set(self.episodes)
+        for i, row in enumerate(rows):
+            ep_idx = int(episode_index[i])
+            if episodes is not None and ep_idx not in episodes:
+                continue
+
+            item = {}
+            for key, column in columns.items():
+                positions = delta_positions[key][i] if key in delta_positions else row
+                if key in image_keys:
+                    images = [self._decode_image(column[p]) for p in np.atleast_1d(positions)]
+                    item[key] = torch.stack(images) if key in delta_positions else images[0]
+                else:
+                    item[key] = column[positions]
+            for key, is_pad in delta_padding.items():
+                item[f"{key}_is_pad"] = is_pad[i]
+
+            if len(self.meta.video_keys) > 0:
+                item.update(self._get_video_frames(ep_idx, int(index[i]) / self.fps))
+
+            item["task"] = self.meta.tasks.iloc[int(item["task_index"])].name
+            yield item
+
+    def _decode_image(self, image: dict) -> torch.Tensor:
+        """Decodes an image stored in a parquet file to a (C, H, W) float32 tensor in [0, 1]."""
+        if image["bytes"] is not None:
+            pil_image = PILImage.open(io.BytesIO(image["bytes"]))
+        else:
+            pil_image = PILImage.open(image["path"])
+        frame = transforms.ToTensor()(pil_image.convert("RGB"))
+        return self.image_transforms(frame) if self.image_transforms is not None else frame
+
     def _get_window_steps(
         self, delta_timestamps: dict[str, list[float]] | None = None, dynamic_bounds: bool = False
     ) -> tuple[int, int]:
@@ -308,17 +616,6 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         # Get episode index from the item
         ep_idx = item["episode_index"]
 
-        # "timestamp" restarts from 0 for each episode, whereas we need a global timestep within the single .mp4 file (given by index/fps)
-        current_ts = item["index"] / self.fps
-
-        episode_boundaries_ts = {
-            key: (
-                self.meta.episodes[ep_idx][f"videos/{key}/from_timestamp"],
-                self.meta.episodes[ep_idx][f"videos/{key}/to_timestamp"],
-            )
-            for key in self.meta.video_keys
-        }
-
         # Apply delta querying logic if necessary
         if self.delta_indices is not None:
             query_result, padding = self._get_delta_frames(dataset_iterator, item)
@@ -327,27 +624,8 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
 
         # Load video frames, when needed
         if len(self.meta.video_keys) > 0:
-            original_timestamps = self._make_timestamps_from_indices(current_ts, self.delta_indices)
-
-            # Some timestamps might not result available considering the episode's boundaries
-            query_timestamps = self._get_query_timestamps(
-                current_ts, self.delta_indices, episode_boundaries_ts
-            )
-            video_frames = self._query_videos(query_timestamps, ep_idx)
-
-            if self.image_transforms is not None:
-                image_keys = self.meta.camera_keys
-                for cam in image_keys:
-                    video_frames[cam] = self.image_transforms(video_frames[cam])
-
-            updates.append(video_frames)
-
-            if self.delta_indices is not None:
-                # We always return the same number of frames. Unavailable frames are padded.
-                padding_mask = self._get_video_frame_padding_mask(
-                    video_frames, query_timestamps, original_timestamps
-                )
-                updates.append(padding_mask)
+            # "timestamp" restarts from 0 for each episode, whereas we need a global timestep within the single .mp4 file (given by index/fps)
+            updates.append(self._get_video_frames(ep_idx, item["index"] / self.fps))
 
         result = item.copy()
         for update in updates:
@@ -357,6 +635,39 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
 
         yield result
 
+    def _get_video_frames(self, ep_idx: int, current_ts: float) -> dict:
+        """Decodes the (delta) video frames of a sample, along with their padding masks."""
+        # Row groups schedule their own segments in `_iter_row_groups`
+        if self.video_prefetcher is not None and not self.read_row_groups:
+            self._prefetch_videos(ep_idx)
+
+        episode_boundaries_ts = {
+            key: (
+                self.meta.episodes[ep_idx][f"videos/{key}/from_timestamp"],
+                self.meta.episodes[ep_idx][f"videos/{key}/to_timestamp"],
+            )
+            for key in self.meta.video_keys
+        }
+        original_timestamps = self._make_timestamps_from_indices(current_ts, self.delta_indices)
+
+        # Some timestamps might not result available considering the episode's boundaries
+        query_timestamps = self._get_query_timestamps(current_ts, self.delta_indices, episode_boundaries_ts)
+        video_frames = self._query_videos(query_timestamps, ep_idx)
+
+        if self.image_transforms is not None:
+            image_keys = self.meta.camera_keys
+            for cam in image_keys:
+                video_frames[cam] = self.image_transforms(video_frames[cam])
+
+        if self.delta_indices is not None:
+            # We always return the same number of frames. Unavailable frames are padded.
+            padding_mask = self._get_video_frame_padding_mask(
+                video_frames, query_timestamps, original_timestamps
+            )
+            video_frames.update(padding_mask)
+
+        return video_frames
+
     def _get_query_timestamps(
         self,
         current_ts: float,
@@ -378,6 +689,33 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
 
         return query_timestamps
 
+    def _get_video_path(self, ep_idx: int, video_key: str) -> str:
+        root = self.meta.url_root if self.streaming and not self.streaming_from_local else self.root
+        return f"{root}/{self.meta.get_video_file_path(ep_idx, video_key)}"
+
+    def _prefetch_videos(self, ep_idx: int):
+        """Schedules the decoding of the video segments of `ep_idx` and of the episodes following it.
+
+        Each shard is read in order, so the episodes following the current one are the next ones to be read
+        from its shard. The episodes of all the shards being interleaved are remembered.
+        """
+        if ep_idx in self._prefetched_episodes:
+            self._prefetched_episodes.move_to_end(ep_idx)
+            return
+        self._prefetched_episodes[ep_idx] = None
+        while len(self._prefetched_episodes) > self.num_shards * (self.prefetch_episodes + 1):
+            self._prefetched_episodes.popitem(last=False)
+
+        position = int(np.searchsorted(self._sorted_episodes, ep_idx))
+        for next_ep_idx in self._sorted_episodes[position : position + self.prefetch_episodes + 1].tolist():
+            episode = self.meta.episodes[next_ep_idx]
+            for key in self.meta.video_keys:
+                self.video_prefetcher.prefetch(
+                    self._get_video_path(next_ep_idx, key),
+                    episode[f"videos/{key}/from_timestamp"],
+                    episode[f"videos/{key}/to_timestamp"],
+                )
+
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
         in the main process (e.g. by using a second Dataloader with num_workers=0). It will result in a
@@ -386,11 +724,18 @@ class StreamingLeRobotDataset(torch.utils.data.IterableDataset):
         """
 
         item = {}
+        frame_cache = None
         for video_key, query_ts in query_timestamps.items():
-            root = self.meta.url_root if self.streaming and not self.streaming_from_local else self.root
-            video_path = f"{root}/{self.meta.get_video_file_path(ep_idx, video_key)}"
+            video_path = self._get_video_path(ep_idx, video_key)
+            if self.video_prefetcher is not None:
+                self.video_prefetcher.wait(video_path, query_ts)
+                frame_cache = self.video_prefetcher.frame_cache
             frames = decode_video_frames_torchcodec(
-                video_path, query_ts, self.tolerance_s, decoder_cache=self.video_decoder_cache
+                video_path,
+                query_ts,
+                self.tolerance_s,
+                decoder_cache=self.video_decoder_cache,
+                frame_cache=frame_cache,
             )
 
             item[video_key] = frames.squeeze(0) if len(query_ts) == 1 else frames
@@ -19,6 +19,7 @@ import json
 import logging
 from collections import deque
 from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from pprint import pformat
 from typing import Any, Generic, TypeVar
@@ -28,6 +29,7 @@ import numpy as np
 import packaging.version
 import pandas
 import pandas as pd
+import pyarrow as pa
 import pyarrow.dataset as pa_ds
 import pyarrow.parquet as pq
 import torch
@@ -105,7 +107,10 @@ def update_chunk_file_indices(chunk_idx: int, file_idx: int, chunks_size: int) -
 
 
 def load_nested_dataset(
-    pq_dir: Path, features: datasets.Features | None = None, episodes: list[int] | None = None
+    pq_dir: Path,
+    features: datasets.Features | None = None,
+    episodes: list[int] | None = None,
+    columns: list[str] | None = None,
 ) -> Dataset:
     """Find parquet files in provided directory {pq_dir}/chunk-xxx/file-xxx.parquet
     Convert parquet files to pyarrow memory mapped in a cache folder for efficient RAM usage
@@ -115,6 +120,7 @@ def load_nested_dataset(
         pq_dir: Directory containing parquet files
         features: Optional features schema to ensure consistent loading of complex types like images
         episodes: Optional list of episode indices to filter. Uses PyArrow predicate pushdown for efficiency.
+        columns: Optional list of columns to load. The other columns are never read from the parquet files.
     """
     paths = sorted(pq_dir.glob("*/*.parquet"))
     if len(paths) == 0:
@@ -124,11 +130,11 @@ def load_nested_dataset(
         # When no filtering needed, Dataset uses memory-mapped loading for efficiency
         # PyArrow loads the entire dataset into memory
         if episodes is None:
-            return Dataset.from_parquet([str(path) for path in paths], features=features)
+            return Dataset.from_parquet([str(path) for path in paths], features=features, columns=columns)
 
         arrow_dataset = pa_ds.dataset(paths, format="parquet")
         filter_expr = pa_ds.field("episode_index").isin(episodes)
-        table = arrow_dataset.to_table(filter=filter_expr)
+        table = arrow_dataset.to_table(columns=columns, filter=filter_expr)
 
         if features is not None:
             table = table.cast(features.arrow_schema)
@@ -384,6 +390,66 @@ def load_episodes(local_dir: Path) -> datasets.Dataset:
     return episodes
 
 
+@dataclass
+class EpisodeLookup:
+    """Episode metadata needed to read frames, gathered into compact arrays indexed by episode_index.
+
+    Reading a row of `meta.episodes` materializes a full Arrow row, which is costly to do for every sample.
+    These arrays are built once when loading a dataset so that the read path only does array lookups.
+    """
+
+    # (num_episodes,) absolute index of the first frame of each episode
+    from_index: np.ndarray
+    # (num_episodes,) absolute index following the last frame of each episode
+    to_index: np.ndarray
+    # Unique video files referenced by the episodes, relative to the dataset root
+    video_files: list[Path]
+    # For each video key, (num_episodes,) position of the episode's video file in `video_files`
+    video_file_ids: dict[str, np.ndarray]
+    # For each video key, (num_episodes,) start timestamp of the episode in its video file
+    video_from_timestamps: dict[str, np.ndarray]
+
+    @classmethod
+    def build(
+        cls,
+        episodes: datasets.Dataset,
+        video_keys: list[str],
+        video_path: str | None,
+    ) -> "EpisodeLookup":
+        """Build the lookup arrays from the episodes metadata.
+
+        Args:
+            episodes (datasets.Dataset): Episodes metadata as returned by `load_episodes`, with one row per
+                episode ordered by episode_index.
+            video_keys (list[str]): Keys of the features stored as videos.
+            video_path (str | None): Formattable string for the video files.
+        """
+        table = episodes.data
+        video_files: list[Path] = []
+        video_file_ids = {}
+        video_from_timestamps = {}
+        for key in video_keys:
+            chunk_indices = table.column(f"videos/{key}/chunk_index").to_numpy()
+            file_indices = table.column(f"videos/{key}/file_index").to_numpy()
+            unique_files, file_ids = np.unique(
+                np.stack([chunk_indices, file_indices], axis=1), axis=0, return_inverse=True
+            )
+            video_file_ids[key] = file_ids.reshape(-1) + len(video_files)
+            video_files.extend(
+                Path(video_path.format(video_key=key, chunk_index=chunk_idx, file_index=file_idx))
+                for chunk_idx, file_idx in unique_files.tolist()
+            )
+            video_from_timestamps[key] = table.column(f"videos/{key}/from_timestamp").to_numpy()
+
+        return cls(
+            from_index=table.column("dataset_from_index").to_numpy(),
+            to_index=table.column("dataset_to_index").to_numpy(),
+            video_files=video_files,
+            video_file_ids=video_file_ids,
+            video_from_timestamps=video_from_timestamps,
+        )
+
+
 def load_image_as_numpy(
     fpath: str | Path, dtype: np.dtype = np.float32, channel_first: bool = True
 ) -> np.ndarray:
@@ -408,7 +474,9 @@ def load_image_as_numpy(
     return img_array
 
 
-def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[torch.Tensor | str]]:
+def hf_transform_to_torch(
+    items_dict: dict[str, list[Any]], uint8_images: bool = False
+) -> dict[str, list[torch.Tensor | str]]:
     """Convert a batch from a Hugging Face dataset to torch tensors.
 
     This transform function converts items from Hugging Face dataset format (pyarrow)
@@ -419,6 +487,7 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     Args:
         items_dict (dict): A dictionary representing a batch of data from a
             Hugging Face dataset.
+        uint8_images (bool): If True, images are kept as (C, H, W, uint8) tensors in the range [0, 255].
 
     Returns:
         dict: The batch with items converted to torch tensors.
@@ -426,7 +495,7 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     for key in items_dict:
         first_item = items_dict[key][0]
         if isinstance(first_item, PILImage.Image):
-            to_tensor = transforms.ToTensor()
+            to_tensor = transforms.PILToTensor() if uint8_images else transforms.ToTensor()
             items_dict[key] = [to_tensor(img) for img in items_dict[key]]
         elif first_item is None:
             pass
@@ -435,6 +504,43 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     return items_dict
 
 
+def arrow_column_to_torch(column: pa.Array | pa.ChunkedArray) -> torch.Tensor | None:
+    """Convert a numeric column from a pyarrow table to a single torch tensor.
+
+    This is a vectorized alternative to `hf_transform_to_torch` for scalar (`datasets.Value`) and
+    fixed-length 1D (`datasets.Sequence`) columns. Dtypes follow the ones `torch.tensor` infers from python
+    values in `hf_transform_to_torch`: floats are returned as float32, integers as int64.
+
+    Args:
+        column (pa.Array | pa.ChunkedArray): The column to convert.
+
+    Returns:
+        torch.Tensor | None: A tensor of shape (num_rows, *feature_shape), or None if the column type is not
+            supported (e.g. images or strings) and should go through `hf_transform_to_torch` instead.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+
+    if pa.types.is_fixed_size_list(column.type) and _is_numeric_arrow_type(column.type.value_type):
+        array = column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), column.type.list_size)
+    elif _is_numeric_arrow_type(column.type):
+        array = column.to_numpy(zero_copy_only=False)
+    else:
+        return None
+
+    if np.issubdtype(array.dtype, np.floating):
+        array = array.astype(np.float32, copy=False)
+    elif np.issubdtype(array.dtype, np.integer):
+        array = array.astype(np.int64, copy=False)
+    return torch.tensor(array)
+
+
+def _is_numeric_arrow_type(arrow_type: pa.DataType) -> bool:
+    return (
+        pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_boolean(arrow_type)
+    )
+
+
 def is_valid_version(version: str) -> bool:
     """Check if a string is a valid PEP 440 version.
 
@@ -1198,6 +1304,17 @@ def item_to_torch(item: dict) -> dict:
     return item
 
 
+def column_to_numpy(column: pa.ChunkedArray) -> np.ndarray:
+    """Convert a parquet column of scalars or (nested) fixed size lists to a (N, *shape) array."""
+    array = column.combine_chunks()
+    shape = [len(array)]
+    while pa.types.is_list(array.type) or pa.types.is_fixed_size_list(array.type):
+        if len(array) > 0:
+            shape.append(len(array[0]))
+        array = array.flatten()
+    return array.to_numpy(zero_copy_only=False).reshape(shape)
+
+
 def is_float_in_list(target, float_list, threshold=1e-6):
     return any(abs(target - x) <= threshold for x in float_list)
 
@@ -72,12 +72,15 @@ def has_quantile_stats(stats: dict[str, dict] | None, quantile_list_keys: list[s
     return False
 
 
-def process_single_episode(dataset: LeRobotDataset, episode_idx: int) -> dict:
+def process_single_episode(
+    dataset: LeRobotDataset, episode_idx: int, histogram_bins: int | None = None
+) -> dict:
     """Process a single episode and return its statistics.
 
     Args:
         dataset: The LeRobot dataset
         episode_idx: Index of the episode to process
+        histogram_bins: If set, the episode stats carry a mergeable histogram sketch with this number of bins
 
     Returns:
         Dictionary containing episode statistics
@@ -115,7 +118,11 @@ def process_single_episode(dataset: LeRobotDataset, episode_idx: int) -> dict:
             keepdims = data.ndim == 1
 
         ep_stats[key] = get_feature_stats(
-            data, axis=axes_to_reduce, keepdims=keepdims, quantile_list=DEFAULT_QUANTILES
+            data,
+            axis=axes_to_reduce,
+            keepdims=keepdims,
+            quantile_list=DEFAULT_QUANTILES,
+            histogram_bins=histogram_bins,
         )
 
         if dataset.features[key]["dtype"] in ["image", "video"]:
@@ -126,11 +133,15 @@ def process_single_episode(dataset: LeRobotDataset, episode_idx: int) -> dict:
     return ep_stats
 
 
-def compute_quantile_stats_for_dataset(dataset: LeRobotDataset) -> dict[str, dict]:
+def compute_quantile_stats_for_dataset(
+    dataset: LeRobotDataset, histogram_bins: int | None = None
+) -> dict[str, dict]:
     """Compute quantile statistics for all episodes in the dataset.
 
     Args:
         dataset: The LeRobot dataset to compute statistics for
+        histogram_bins: If set, episode quantiles are merged through histogram sketches with this number of
+            bins instead of being averaged
 
     Returns:
         Dictionary containing aggregated statistics with quantiles
@@ -148,7 +159,7 @@ def compute_quantile_stats_for_dataset(dataset: LeRobotDataset) -> dict[str, dic
     if has_videos:
         logging.info("Dataset contains video keys - using sequential processing for thread safety")
         for episode_idx in tqdm(range(dataset.num_episodes), desc="Processing episodes"):
-            ep_stats = process_single_episode(dataset, episode_idx)
+            ep_stats = process_single_episode(dataset, episode_idx, histogram_bins)
             episode_stats_list.append(ep_stats)
     else:
         logging.info("Dataset has no video keys - using parallel processing for better performance")
@@ -156,7 +167,7 @@ def compute_quantile_stats_for_dataset(dataset: LeRobotDataset) -> dict[str, dic
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_episode = {
-                executor.submit(process_single_episode, dataset, episode_idx): episode_idx
+                executor.submit(process_single_episode, dataset, episode_idx, histogram_bins): episode_idx
                 for episode_idx in range(dataset.num_episodes)
             }
 
@@ -183,6 +194,7 @@ def augment_dataset_with_quantile_stats(
     repo_id: str,
     root: str | Path | None = None,
     overwrite: bool = False,
+    histogram_bins: int | None = None,
 ) -> None:
     """Augment a dataset with quantile statistics if they are missing.
 
@@ -190,6 +202,7 @@ def augment_dataset_with_quantile_stats(
         repo_id: Repository ID of the dataset
         root: Local root directory for the dataset
         overwrite: Overwrite existing quantile statistics if they already exist
+        histogram_bins: If set, merge episode quantiles through histogram sketches with this number of bins
     """
     logging.info(f"Loading dataset: {repo_id}")
     dataset = LeRobotDataset(
@@ -203,7 +216,7 @@ def augment_dataset_with_quantile_stats(
 
     logging.info("Dataset does not contain quantile statistics. Computing them now...")
 
-    new_stats = compute_quantile_stats_for_dataset(dataset)
+    new_stats = compute_quantile_stats_for_dataset(dataset, histogram_bins)
 
     logging.info("Updating dataset metadata with new quantile statistics")
     dataset.meta.stats = new_stats
@@ -243,6 +256,13 @@ def main():
         action="store_true",
         help="Overwrite existing quantile statistics if they already exist",
     )
+    parser.add_argument(
+        "--histogram-bins",
+        type=int,
+        default=None,
+        help="Merge episode quantiles through histogram sketches with this number of bins (e.g. 512), "
+        "which gives accurate dataset quantiles and keeps the sketch in the stats for later merges",
+    )
 
     args = parser.parse_args()
     root = Path(args.root) if args.root else None
@@ -253,6 +273,7 @@ def main():
         repo_id=args.repo_id,
         root=root,
         overwrite=args.overwrite,
+        histogram_bins=args.histogram_bins,
     )
 
 
@@ -16,9 +16,15 @@
 import glob
 import importlib
 import logging
+import os
+import queue
 import shutil
 import tempfile
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
@@ -26,12 +32,18 @@ from typing import Any, ClassVar
 
 import av
 import fsspec
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
 from datasets.features.features import register_feature
 from PIL import Image
 
+from lerobot.datasets.image_writer import image_array_to_pil_image
+
+# Rough number of decoded frames kept in memory by a torchcodec decoder, used to estimate its footprint.
+DECODER_BUFFERED_FRAMES = 4
+
 
 def get_safe_default_codec():
     if importlib.util.find_spec("torchcodec"):
@@ -48,6 +60,8 @@ def decode_video_frames(
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    frame_cache: "DecodedFrameCache | None" = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -57,6 +71,9 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        frame_cache (DecodedFrameCache, optional): Cache of decoded frames reused across calls. Only supported
+            by the "torchcodec" backend.
+        return_uint8 (bool, optional): Return uint8 frames in [0, 255] instead of float32 frames in [0, 1].
 
     Returns:
         torch.Tensor: Decoded frames.
@@ -66,9 +83,17 @@ def decode_video_frames(
     if backend is None:
         backend = get_safe_default_codec()
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
+        return decode_video_frames_torchcodec(
+            video_path, timestamps, tolerance_s, frame_cache=frame_cache, return_uint8=return_uint8
+        )
     elif backend in ["pyav", "video_reader"]:
-        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
+        if frame_cache is not None:
+            raise ValueError(
+                f"A decoded frame cache is only supported by the 'torchcodec' backend, not '{backend}'."
+            )
+        return decode_video_frames_torchvision(
+            video_path, timestamps, tolerance_s, backend, return_uint8=return_uint8
+        )
     else:
         raise ValueError(f"Unsupported video backend: {backend}")
 
@@ -79,10 +104,12 @@ def decode_video_frames_torchvision(
     tolerance_s: float,
     backend: str = "pyav",
     log_loaded_timestamps: bool = False,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated to the requested timestamps of a video
 
     The backend can be either "pyav" (default) or "video_reader".
+    Frames are returned as float32 in [0, 1], or as uint8 in [0, 255] if `return_uint8` is True.
     "video_reader" requires installing torchvision from source, see:
     https://github.com/pytorch/vision/blob/main/torchvision/csrc/io/decoder/gpu/README.rst
     (note that you need to compile against ffmpeg<4.3)
@@ -165,48 +192,362 @@ def decode_video_frames_torchvision(
         logging.info(f"{closest_ts=}")
 
     # convert to the pytorch format which is float32 in [0,1] range (and channel first)
-    closest_frames = closest_frames.type(torch.float32) / 255
+    if not return_uint8:
+        closest_frames = closest_frames.type(torch.float32) / 255
 
     assert len(timestamps) == len(closest_frames)
     return closest_frames
 
 
 class VideoDecoderCache:
-    """Thread-safe cache for video decoders to avoid expensive re-initialization."""
+    """Thread-safe, size-bounded LRU cache for video decoders to avoid expensive re-initialization.
 
-    def __init__(self):
-        self._cache: dict[str, tuple[Any, Any]] = {}
-        self._lock = Lock()
+    Each cached entry keeps a torchcodec decoder and its fsspec file handle open. To keep the number of open
+    file descriptors and the memory held by decoders bounded on datasets with many video files, the least
+    recently used decoders are evicted once `max_decoders` entries are cached or once their estimated
+    footprint exceeds `max_bytes`.
 
-    def get_decoder(self, video_path: str):
-        """Get a cached decoder or create a new one."""
+    The cache is re-initialized when it is first accessed from a new process (e.g. a forked DataLoader
+    worker), so that decoders and file handles are never shared across processes.
+
+    Args:
+        max_decoders: Maximum number of decoders kept open. `None` disables the bound.
+        max_bytes: Maximum estimated memory held by the cached decoders, in bytes. `None` disables the bound.
+    """
+
+    def __init__(self, max_decoders: int | None = 64, max_bytes: int | None = None):
+        if max_decoders is not None and max_decoders < 1:
+            raise ValueError(f"max_decoders must be at least 1, got {max_decoders}.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}.")
+        self.max_decoders = max_decoders
+        self.max_bytes = max_bytes
+        self._reset()
+
+    def _reset(self):
+        self._cache: OrderedDict[str, tuple[Any, Any, int]] = OrderedDict()
+        self._lock = Lock()
+        self._pid = os.getpid()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._open_time_s = 0.0
+
+    def _check_pid(self):
+        # Decoders and file handles inherited from the parent process must not be used (nor closed) by a
+        # forked worker, so the child simply starts from an empty cache.
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def __getstate__(self):
+        return {"max_decoders": self.max_decoders, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.max_decoders = state["max_decoders"]
+        self.max_bytes = state["max_bytes"]
+        self._reset()
+
+    def _open_decoder(self, video_path: str) -> tuple[Any, Any]:
+        """Open a new decoder on `video_path` and return it along with its file handle."""
         if importlib.util.find_spec("torchcodec"):
             from torchcodec.decoders import VideoDecoder
         else:
             raise ImportError("torchcodec is required but not available.")
 
+        file_handle = fsspec.open(video_path).__enter__()
+        decoder = VideoDecoder(file_handle, seek_mode="approximate")
+        return decoder, file_handle
+
+    @staticmethod
+    def _estimate_decoder_bytes(decoder) -> int:
+        """Rough estimate of the memory held by a decoder: its buffered frames in decoded RGB format."""
+        metadata = getattr(decoder, "metadata", None)
+        width = getattr(metadata, "width", None) or 0
+        height = getattr(metadata, "height", None) or 0
+        return width * height * 3 * DECODER_BUFFERED_FRAMES
+
+    def _evict_if_needed(self):
+        # The most recently inserted decoder is always kept, even if it alone exceeds `max_bytes`.
+        while len(self._cache) > 1 and (
+            (self.max_decoders is not None and len(self._cache) > self.max_decoders)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            # Evicted entries are only dereferenced, not closed: a caller may still be decoding from them
+            # outside of the lock. The file handle is closed once the last reference to the decoder is dropped.
+            _, (_, _, nbytes) = self._cache.popitem(last=False)
+            self._bytes -= nbytes
+            self._evictions += 1
+
+    def get_decoder(self, video_path: str):
+        """Get a cached decoder or create a new one."""
         video_path = str(video_path)
+        self._check_pid()
 
         with self._lock:
-            if video_path not in self._cache:
-                file_handle = fsspec.open(video_path).__enter__()
-                decoder = VideoDecoder(file_handle, seek_mode="approximate")
-                self._cache[video_path] = (decoder, file_handle)
-
-            return self._cache[video_path][0]
+            if video_path in self._cache:
+                self._cache.move_to_end(video_path)
+                self._hits += 1
+                return self._cache[video_path][0]
+
+            self._misses += 1
+            start = time.perf_counter()
+            decoder, file_handle = self._open_decoder(video_path)
+            self._open_time_s += time.perf_counter() - start
+
+            nbytes = self._estimate_decoder_bytes(decoder)
+            self._cache[video_path] = (decoder, file_handle, nbytes)
+            self._bytes += nbytes
+            self._evict_if_needed()
+            return decoder
 
     def clear(self):
         """Clear the cache and close file handles."""
+        self._check_pid()
         with self._lock:
-            for _, file_handle in self._cache.values():
+            for _, file_handle, _ in self._cache.values():
                 file_handle.close()
             self._cache.clear()
+            self._bytes = 0
 
     def size(self) -> int:
         """Return the number of cached decoders."""
+        self._check_pid()
+        with self._lock:
+            return len(self._cache)
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the cache counters of the current process, e.g. for logging."""
+        self._check_pid()
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "open_time_s": self._open_time_s,
+            }
+
+
+class DecodedFrameCache:
+    """Thread-safe LRU cache of decoded video frames, bounded by the number of bytes it holds.
+
+    Frames are keyed by video path and frame index, and stored as uint8 tensors along with their presentation
+    timestamp. When neighbouring samples are read in sequence (e.g. with `delta_timestamps` spanning several
+    frames), the frames they share are decoded only once, and the decoder only has to decode forward from its
+    current position in the group of pictures for the frames that are missing.
+
+    Like `VideoDecoderCache`, the cache is re-initialized when it is first accessed from a new process.
+
+    Args:
+        max_bytes: Maximum number of bytes held by the cached frames.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}.")
+        self.max_bytes = max_bytes
+        self._reset()
+
+    def _reset(self):
+        self._cache: OrderedDict[tuple[str, int], tuple[torch.Tensor, float]] = OrderedDict()
+        self._lock = Lock()
+        self._pid = os.getpid()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _check_pid(self):
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def __getstate__(self):
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.max_bytes = state["max_bytes"]
+        self._reset()
+
+    def get(self, video_path: str, frame_index: int) -> tuple[torch.Tensor, float] | None:
+        """Return the cached `(frame, pts_seconds)` pair, or None if the frame is not cached."""
+        self._check_pid()
+        key = (str(video_path), frame_index)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, video_path: str, frame_index: int, frame: torch.Tensor, pts: float):
+        """Cache a decoded uint8 frame, evicting the least recently used frames if needed."""
+        if frame.dtype != torch.uint8:
+            raise TypeError(f"Only uint8 frames can be cached, got {frame.dtype}.")
+        self._check_pid()
+        key = (str(video_path), frame_index)
+        # Clone to avoid keeping alive the whole batch the frame may be a view of
+        frame = frame.clone()
+        nbytes = frame.numel()
+        with self._lock:
+            if key in self._cache:
+                self._bytes -= self._cache.pop(key)[0].numel()
+            self._cache[key] = (frame, pts)
+            self._bytes += nbytes
+            while len(self._cache) > 1 and self._bytes > self.max_bytes:
+                _, (evicted, _) = self._cache.popitem(last=False)
+                self._bytes -= evicted.numel()
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all cached frames."""
+        self._check_pid()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def size(self) -> int:
+        """Return the number of cached frames."""
+        self._check_pid()
         with self._lock:
             return len(self._cache)
 
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters of the current process, e.g. for logging."""
+        self._check_pid()
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+class VideoSegmentPrefetcher:
+    """Decodes upcoming video segments in background threads, ahead of the frames being queried.
+
+    Random access into a video requires seeking to the preceding key frame and decoding forward for every query,
+    which gets expensive with remote files. When the segments that are about to be read are known in advance
+    (e.g. the episodes of a shard being streamed), this prefetcher decodes them sequentially in background
+    threads into a `DecodedFrameCache`, which `decode_video_frames_torchcodec` then reads from. The cache bounds
+    the memory held by the decoded frames, so it should be large enough to hold the `max_segments` most
+    recently prefetched segments.
+
+    The background threads use their own decoders, as torchcodec decoders are not thread-safe. Like
+    `VideoDecoderCache`, the prefetcher is re-initialized when it is first accessed from a new process.
+
+    Args:
+        frame_cache: Cache the decoded frames are written to.
+        num_threads: Number of background decoding threads.
+        max_segments: Number of prefetched segments remembered, so that they are not decoded twice.
+        chunk_size: Number of frames decoded at once.
+    """
+
+    def __init__(
+        self,
+        frame_cache: DecodedFrameCache,
+        num_threads: int = 2,
+        max_segments: int = 16,
+        chunk_size: int = 32,
+    ):
+        if num_threads < 1:
+            raise ValueError(f"num_threads must be at least 1, got {num_threads}.")
+        self.frame_cache = frame_cache
+        self.num_threads = num_threads
+        self.max_segments = max_segments
+        self.chunk_size = chunk_size
+        self._reset()
+
+    def _reset(self):
+        self._executor = None
+        self._decoder_cache = VideoDecoderCache(max_decoders=self.num_threads)
+        self._segments: OrderedDict[tuple[str, float, float], Future] = OrderedDict()
+        self._path_locks: dict[str, Lock] = {}
+        self._lock = Lock()
+        self._pid = os.getpid()
+
+    def _check_pid(self):
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def __getstate__(self):
+        return {
+            "frame_cache": self.frame_cache,
+            "num_threads": self.num_threads,
+            "max_segments": self.max_segments,
+            "chunk_size": self.chunk_size,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def prefetch(self, video_path: str, from_timestamp: float, to_timestamp: float):
+        """Schedule the decoding of the frames of `video_path` within [from_timestamp, to_timestamp)."""
+        self._check_pid()
+        key = (str(video_path), from_timestamp, to_timestamp)
+        with self._lock:
+            if key in self._segments:
+                self._segments.move_to_end(key)
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.num_threads, thread_name_prefix="video_prefetch")
+            self._segments[key] = self._executor.submit(self._decode_segment, *key)
+            while len(self._segments) > self.max_segments:
+                self._segments.popitem(last=False)
+
+    def wait(self, video_path: str, timestamps: list[float]):
+        """Block until the prefetched segments of `video_path` containing `timestamps` are decoded."""
+        self._check_pid()
+        video_path = str(video_path)
+        with self._lock:
+            futures = [
+                future
+                for (path, from_ts, to_ts), future in self._segments.items()
+                if path == video_path and any(from_ts <= ts < to_ts for ts in timestamps)
+            ]
+        for future in futures:
+            future.result()  # re-raises the decoding errors, if any
+
+    def _decode_segment(self, video_path: str, from_timestamp: float, to_timestamp: float):
+        with self._lock:
+            path_lock = self._path_locks.setdefault(video_path, Lock())
+        with path_lock:
+            decoder = self._decoder_cache.get_decoder(video_path)
+            fps = decoder.metadata.average_fps
+            start = round(from_timestamp * fps)
+            stop = min(round(to_timestamp * fps), len(decoder))
+            # Decoding a contiguous range of frames never seeks back within a group of pictures
+            for chunk_start in range(start, stop, self.chunk_size):
+                chunk_stop = min(chunk_start + self.chunk_size, stop)
+                if all(
+                    self.frame_cache.get(video_path, i) is not None for i in range(chunk_start, chunk_stop)
+                ):
+                    continue
+                frames_batch = decoder.get_frames_in_range(start=chunk_start, stop=chunk_stop)
+                for idx, frame, pts in zip(
+                    range(chunk_start, chunk_stop),
+                    frames_batch.data,
+                    frames_batch.pts_seconds.tolist(),
+                    strict=True,
+                ):
+                    self.frame_cache.put(video_path, idx, frame, pts)
+
+    def close(self):
+        """Cancel the pending segments and stop the background threads."""
+        self._check_pid()
+        with self._lock:
+            self._segments.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._decoder_cache.clear()
+
 
 class FrameTimestampError(ValueError):
     """Helper error to indicate the retrieved timestamps exceed the queried ones"""
@@ -223,6 +564,8 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     log_loaded_timestamps: bool = False,
     decoder_cache: VideoDecoderCache | None = None,
+    frame_cache: DecodedFrameCache | None = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
@@ -232,6 +575,9 @@ def decode_video_frames_torchcodec(
         tolerance_s: Allowed deviation in seconds for frame retrieval.
         log_loaded_timestamps: Whether to log loaded timestamps.
         decoder_cache: Optional decoder cache instance. Uses default if None.
+        frame_cache: Optional cache of decoded frames. Only the frames missing from it are decoded.
+        return_uint8: Return uint8 frames in [0, 255] instead of float32 frames in [0, 1], e.g. to defer the
+            conversion until after the frames have been moved to the GPU.
 
     Note: Setting device="cuda" outside the main process, e.g. in data loader workers, will lead to CUDA initialization errors.
 
@@ -255,12 +601,16 @@ def decode_video_frames_torchcodec(
     average_fps = metadata.average_fps
     # convert timestamps to frame indices
     frame_indices = [round(ts * average_fps) for ts in timestamps]
-    # retrieve frames based on indices
-    frames_batch = decoder.get_frames_at(indices=frame_indices)
+    if frame_cache is None:
+        # retrieve frames based on indices
+        frames_batch = decoder.get_frames_at(indices=frame_indices)
+        decoded = zip(frames_batch.data, frames_batch.pts_seconds.tolist(), strict=True)
+    else:
+        decoded = _get_frames_at_with_cache(decoder, str(video_path), frame_indices, frame_cache)
 
-    for frame, pts in zip(frames_batch.data, frames_batch.pts_seconds, strict=True):
+    for frame, pts in decoded:
         loaded_frames.append(frame)
-        loaded_ts.append(pts.item())
+        loaded_ts.append(pts)
         if log_loaded_timestamps:
             logging.info(f"Frame loaded at timestamp={pts:.4f}")
 
@@ -290,7 +640,8 @@ def decode_video_frames_torchcodec(
         logging.info(f"{closest_ts=}")
 
     # convert to float32 in [0,1] range
-    closest_frames = (closest_frames / 255.0).type(torch.float32)
+    if not return_uint8:
+        closest_frames = (closest_frames / 255.0).type(torch.float32)
 
     if not len(timestamps) == len(closest_frames):
         raise FrameTimestampError(
@@ -300,6 +651,57 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
+def _get_frames_at_with_cache(
+    decoder, video_path: str, frame_indices: list[int], frame_cache: DecodedFrameCache
+) -> list[tuple[torch.Tensor, float]]:
+    """Return the `(frame, pts_seconds)` pairs at `frame_indices`, only decoding the frames not yet cached."""
+    entries = {idx: frame_cache.get(video_path, idx) for idx in set(frame_indices)}
+    missing = sorted(idx for idx, entry in entries.items() if entry is None)
+    if missing:
+        # Decoding in increasing order lets the decoder move forward within a group of pictures without seeking
+        frames_batch = decoder.get_frames_at(indices=missing)
+        for idx, frame, pts in zip(
+            missing, frames_batch.data, frames_batch.pts_seconds.tolist(), strict=True
+        ):
+            frame_cache.put(video_path, idx, frame, pts)
+            entries[idx] = (frame, pts)
+    return [entries[idx] for idx in frame_indices]
+
+
+def _check_pix_fmt(vcodec: str, pix_fmt: str) -> str:
+    """Return a pixel format compatible with `vcodec`."""
+    # Encoders/pixel formats incompatibility check
+    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
+        logging.warning(
+            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
+        )
+        pix_fmt = "yuv420p"
+    return pix_fmt
+
+
+def _get_video_options(
+    vcodec: str, g: int | None, crf: int | None, fast_decode: int, preset: int | None
+) -> dict[str, str]:
+    """Define video codec options."""
+    video_options = {}
+
+    if g is not None:
+        video_options["g"] = str(g)
+
+    if crf is not None:
+        video_options["crf"] = str(crf)
+
+    if fast_decode:
+        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
+        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
+        video_options[key] = value
+
+    if vcodec == "libsvtav1":
+        video_options["preset"] = str(preset) if preset is not None else "12"
+
+    return video_options
+
+
 def encode_video_frames(
     imgs_dir: Path | str,
     video_path: Path | str,
@@ -327,12 +729,7 @@ def encode_video_frames(
 
     video_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Encoders/pixel formats incompatibility check
-    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
-        logging.warning(
-            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
-        )
-        pix_fmt = "yuv420p"
+    pix_fmt = _check_pix_fmt(vcodec, pix_fmt)
 
     # Get input frames
     template = "frame-" + ("[0-9]" * 6) + ".png"
@@ -346,22 +743,7 @@ def encode_video_frames(
     with Image.open(input_list[0]) as dummy_image:
         width, height = dummy_image.size
 
-    # Define video codec options
-    video_options = {}
-
-    if g is not None:
-        video_options["g"] = str(g)
-
-    if crf is not None:
-        video_options["crf"] = str(crf)
-
-    if fast_decode:
-        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
-        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
-        video_options[key] = value
-
-    if vcodec == "libsvtav1":
-        video_options["preset"] = str(preset) if preset is not None else "12"
+    video_options = _get_video_options(vcodec, g, crf, fast_decode, preset)
 
     # Set logging level
     if log_level is not None:
@@ -397,6 +779,117 @@ def encode_video_frames(
         raise OSError(f"Video encoding did not work. File not found: {video_path}.")
 
 
+class StreamingVideoEncoder:
+    """Encodes frames into a video as they arrive, without writing them to disk as images first.
+
+    Frames passed to `add_frame` are put in a bounded queue and encoded by a background thread that keeps the
+    output stream open, so encoding happens while recording instead of after each episode. Once all frames
+    were added, `finish` flushes the encoder and returns the path to the video.
+
+    Args:
+        video_path: Path of the video to write.
+        fps: Frame rate of the video.
+        max_queue_size: Maximum number of frames waiting to be encoded. `add_frame` blocks when it is reached.
+
+    The remaining arguments are the same as for `encode_video_frames`.
+    """
+
+    def __init__(
+        self,
+        video_path: Path | str,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+        preset: int | None = None,
+        max_queue_size: int = 64,
+    ):
+        if vcodec not in ["h264", "hevc", "libsvtav1"]:
+            raise ValueError(
+                f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1."
+            )
+
+        self.video_path = Path(video_path)
+        self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fps = fps
+        self.vcodec = vcodec
+        self.pix_fmt = _check_pix_fmt(vcodec, pix_fmt)
+        self.video_options = _get_video_options(vcodec, g, crf, fast_decode, preset)
+        self.num_frames = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    def _encode_loop(self):
+        output = None
+        finished = False
+        try:
+            while True:
+                image = self._queue.get()
+                if image is None:
+                    finished = True
+                    break
+                # Frames are converted here rather than in `add_frame`, to keep the caller's thread free
+                if isinstance(image, np.ndarray):
+                    image = image_array_to_pil_image(image)
+                if image.mode != "RGB":
+                    image = image.convert("RGB")
+                if output is None:
+                    # The frame size is only known once the first frame arrives
+                    output = av.open(str(self.video_path), "w")
+                    output_stream = output.add_stream(self.vcodec, self.fps, options=self.video_options)
+                    output_stream.pix_fmt = self.pix_fmt
+                    output_stream.width = image.width
+                    output_stream.height = image.height
+                packet = output_stream.encode(av.VideoFrame.from_image(image))
+                if packet:
+                    output.mux(packet)
+
+            if output is not None:
+                # Flush the encoder
+                packet = output_stream.encode()
+                if packet:
+                    output.mux(packet)
+        except BaseException as e:
+            self._error = e
+            # Keep consuming so that producers blocked on a full queue are released
+            while not finished:
+                finished = self._queue.get() is None
+        finally:
+            if output is not None:
+                output.close()
+
+    def add_frame(self, image: np.ndarray | Image.Image) -> None:
+        """Queue a frame, either an array (C, H, W) or (H, W, C) in uint8 or in [0, 1] float, or a PIL image.
+
+        The frame is converted to RGB by the encoding thread, so it must not be modified once queued.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Video encoding of {self.video_path} failed.") from self._error
+        self._queue.put(image)
+        self.num_frames += 1
+
+    def finish(self) -> Path:
+        """Flush the encoder, wait for all frames to be encoded and return the path to the video."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError(f"Video encoding of {self.video_path} failed.") from self._error
+        if not self.video_path.exists():
+            raise OSError(f"Video encoding did not work. File not found: {self.video_path}.")
+        return self.video_path
+
+    def cancel(self) -> None:
+        """Stop encoding and remove the partially written video."""
+        self._queue.put(None)
+        self._thread.join()
+        self.video_path.unlink(missing_ok=True)
+
+
 def concatenate_video_files(
     input_video_paths: list[Path | str], output_video_path: Path, overwrite: bool = True
 ):
@@ -645,7 +1138,12 @@ class VideoEncodingManager:
                 f"Encoding remaining {self.dataset.episodes_since_last_encoding} episodes, "
                 f"from episode {start_ep} to {end_ep - 1}"
             )
-            self.dataset._batch_save_episode_video(start_ep, end_ep)
+            try:
+                self.dataset._batch_save_episode_video(start_ep, end_ep)
+            except Exception:
+                # Still close the writers and the encoding pool
+                self.dataset.finalize()
+                raise
 
         # Finalize the dataset to properly close all writers
         self.dataset.finalize()
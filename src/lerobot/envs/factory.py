@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import importlib
+import itertools
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 import gymnasium as gym
@@ -78,6 +81,7 @@ def make_env(
     use_async_envs: bool = False,
     hub_cache_dir: str | None = None,
     trust_remote_code: bool = False,
+    task_shard: tuple[int, int] | None = None,
 ) -> dict[str, dict[int, gym.vector.VectorEnv]]:
     """Makes a gym vector environment according to the config or Hub reference.
 
@@ -91,6 +95,9 @@ def make_env(
         hub_cache_dir (str | None): Optional cache path for downloaded hub files.
         trust_remote_code (bool): **Explicit consent** to execute remote code from the Hub.
             Default False — must be set to True to import/exec hub `env.py`.
+        task_shard (tuple[int, int] | None): Optional `(shard_index, num_shards)`. If set, only every
+            `num_shards`-th task starting from `shard_index` is built, and suites without any task of the
+            shard are left out. Not supported for Hub environments.
 
     Raises:
         ValueError: if n_envs < 1
@@ -106,6 +113,8 @@ def make_env(
     # if user passed a hub id string (e.g., "username/repo", "username/repo@main:env.py")
     # simplified: only support hub-provided `make_env`
     if isinstance(cfg, str):
+        if task_shard is not None:
+            raise ValueError("`task_shard` is not supported for Hub environments")
         # _download_hub_file will raise the same RuntimeError if trust_remote_code is False
         repo_id, file_path, local_file, revision = _download_hub_file(cfg, trust_remote_code, hub_cache_dir)
 
@@ -121,8 +130,46 @@ def make_env(
     if n_envs < 1:
         raise ValueError("`n_envs` must be at least 1")
 
-    env_cls = gym.vector.AsyncVectorEnv if use_async_envs else gym.vector.SyncVectorEnv
-
+    # Every vec env resets its finished sub-environments within the terminal step, which continuous batching
+    # evaluation relies on
+    autoreset_mode = gym.vector.AutoresetMode.SAME_STEP
+    if use_async_envs:
+        # Env workers write observations into shared memory, and `copy=False` hands them out as views of that
+        # memory instead of copying the whole batch at every step. `preprocess_observation` copies them into
+        # new tensors, so the buffers can safely be overwritten by the next step.
+        env_cls = partial(
+            gym.vector.AsyncVectorEnv, shared_memory=True, copy=False, autoreset_mode=autoreset_mode
+        )
+    else:
+        env_cls = partial(gym.vector.SyncVectorEnv, autoreset_mode=autoreset_mode)
+
+    if task_shard is not None:
+        # The env creators build one vec env per task, in task order, so the tasks of other shards are skipped
+        # by not building their vec envs at all. They are removed from the returned mapping below.
+        shard_index, num_shards = task_shard
+        task_counter = itertools.count()
+        build_env_cls = env_cls
+
+        def env_cls(env_fns, **kwargs):
+            if next(task_counter) % num_shards != shard_index:
+                return None
+            return build_env_cls(env_fns, **kwargs)
+
+    envs = _make_local_envs(cfg, n_envs, env_cls)
+    if task_shard is not None:
+        sharded_envs = {}
+        for suite, tasks in envs.items():
+            tasks = {tid: env for tid, env in tasks.items() if env is not None}
+            if tasks:
+                sharded_envs[suite] = tasks
+        envs = sharded_envs
+    return envs
+
+
+def _make_local_envs(
+    cfg: EnvConfig, n_envs: int, env_cls: Callable
+) -> dict[str, dict[int, gym.vector.VectorEnv]]:
+    """Builds the `{suite: {task_id: vec_env}}` envs of a local config, wrapping each task with `env_cls`."""
     if "libero" in cfg.type:
         from lerobot.envs.libero import create_libero_envs
 
@@ -168,7 +215,7 @@ def make_env(
     def _make_one():
         return gym.make(cfg.gym_id, disable_env_checker=cfg.disable_env_checker, **(cfg.gym_kwargs or {}))
 
-    vec = env_cls([_make_one for _ in range(n_envs)], autoreset_mode=gym.vector.AutoresetMode.SAME_STEP)
+    vec = env_cls([_make_one for _ in range(n_envs)])
 
     # normalize to {suite: {task_id: vec_env}} for consistency
     suite_name = cfg.type  # e.g., "pusht", "aloha"
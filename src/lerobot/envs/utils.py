@@ -39,7 +39,7 @@ def _convert_nested_dict(d):
         if isinstance(v, dict):
             result[k] = _convert_nested_dict(v)
         elif isinstance(v, np.ndarray):
-            result[k] = torch.from_numpy(v)
+            result[k] = torch.tensor(v)
         else:
             result[k] = v
     return result
@@ -48,6 +48,10 @@ def _convert_nested_dict(d):
 def preprocess_observation(observations: dict[str, np.ndarray]) -> dict[str, Tensor]:
     # TODO(aliberts, rcadene): refactor this to use features from the environment (no hardcoding)
     """Convert environment observation to LeRobot format observation.
+
+    The returned tensors never share memory with `observations`, so that the observation buffers of vector
+    envs created with `copy=False` (see `make_env`) can be read directly and reused on the next step.
+
     Args:
         observation: Dictionary of observation batches from a Gym vector environment.
     Returns:
@@ -76,22 +80,22 @@ def preprocess_observation(observations: dict[str, np.ndarray]) -> dict[str, Ten
             # sanity check that images are uint8
             assert img_tensor.dtype == torch.uint8, f"expect torch.uint8, but instead {img_tensor.dtype=}"
 
-            # convert to channel first of type float32 in range [0,1]
-            img_tensor = einops.rearrange(img_tensor, "b h w c -> b c h w").contiguous()
-            img_tensor = img_tensor.type(torch.float32)
+            # convert to channel first of type float32 in range [0,1], with a single copy of the image
+            img_tensor = einops.rearrange(img_tensor, "b h w c -> b c h w")
+            img_tensor = img_tensor.to(torch.float32, memory_format=torch.contiguous_format)
             img_tensor /= 255
 
             return_observations[imgkey] = img_tensor
 
     if "environment_state" in observations:
-        env_state = torch.from_numpy(observations["environment_state"]).float()
+        env_state = torch.tensor(observations["environment_state"], dtype=torch.float32)
         if env_state.dim() == 1:
             env_state = env_state.unsqueeze(0)
 
         return_observations[OBS_ENV_STATE] = env_state
 
     if "agent_pos" in observations:
-        agent_pos = torch.from_numpy(observations["agent_pos"]).float()
+        agent_pos = torch.tensor(observations["agent_pos"], dtype=torch.float32)
         if agent_pos.dim() == 1:
             agent_pos = agent_pos.unsqueeze(0)
         return_observations[OBS_STATE] = agent_pos
@@ -126,17 +130,26 @@ def are_all_envs_same_type(env: gym.vector.VectorEnv) -> bool:
     return all(type(e) is first_type for e in env.envs)  # Fast type check
 
 
+def _first_env_has_attr(env: gym.vector.VectorEnv, name: str) -> bool:
+    """`hasattr` on the first sub-environment, which also works when it lives in another process."""
+    if isinstance(env, gym.vector.SyncVectorEnv):
+        return hasattr(env.envs[0], name)
+    # `call` invokes callables in the env workers, so this returns `dir()` of each sub-environment.
+    return name in env.call("__dir__")[0]
+
+
 def check_env_attributes_and_types(env: gym.vector.VectorEnv) -> None:
     with warnings.catch_warnings():
         warnings.simplefilter("once", UserWarning)  # Apply filter only in this function
 
-        if not (hasattr(env.envs[0], "task_description") and hasattr(env.envs[0], "task")):
+        if not (_first_env_has_attr(env, "task_description") and _first_env_has_attr(env, "task")):
             warnings.warn(
                 "The environment does not have 'task_description' and 'task'. Some policies require these features.",
                 UserWarning,
                 stacklevel=2,
             )
-        if not are_all_envs_same_type(env):
+        # The sub-environments of an AsyncVectorEnv can't be inspected, but they come from the same factory.
+        if isinstance(env, gym.vector.SyncVectorEnv) and not are_all_envs_same_type(env):
             warnings.warn(
                 "The environments have different types. Make sure you infer the right task from each environment. Empty task will be passed instead.",
                 UserWarning,
@@ -144,35 +157,38 @@ def check_env_attributes_and_types(env: gym.vector.VectorEnv) -> None:
             )
 
 
-def add_envs_task(env: gym.vector.VectorEnv, observation: dict[str, Any]) -> dict[str, Any]:
-    """Adds task feature to the observation dict with respect to the first environment attribute."""
-    if hasattr(env.envs[0], "task_description"):
-        task_result = env.call("task_description")
+def get_envs_task(env: gym.vector.VectorEnv) -> list[str]:
+    """Returns the task of each sub-environment, with respect to the first environment attributes.
+
+    Tasks don't change when a sub-environment is reset, so rollouts can fetch them once after `env.reset()`
+    rather than at every step. Works with both SyncVectorEnv and AsyncVectorEnv.
+    """
+    for attr in ("task_description", "task"):
+        if not _first_env_has_attr(env, attr):
+            continue
+        task_result = env.call(attr)
 
         if isinstance(task_result, tuple):
             task_result = list(task_result)
 
         if not isinstance(task_result, list):
-            raise TypeError(f"Expected task_description to return a list, got {type(task_result)}")
+            raise TypeError(f"Expected {attr} to return a list, got {type(task_result)}")
         if not all(isinstance(item, str) for item in task_result):
-            raise TypeError("All items in task_description result must be strings")
+            raise TypeError(f"All items in {attr} result must be strings")
 
-        observation["task"] = task_result
-    elif hasattr(env.envs[0], "task"):
-        task_result = env.call("task")
+        return task_result
+    #  For envs without language instructions, e.g. aloha transfer cube and etc.
+    return ["" for _ in range(env.num_envs)]
 
-        if isinstance(task_result, tuple):
-            task_result = list(task_result)
 
-        if not isinstance(task_result, list):
-            raise TypeError(f"Expected task to return a list, got {type(task_result)}")
-        if not all(isinstance(item, str) for item in task_result):
-            raise TypeError("All items in task result must be strings")
+def add_envs_task(
+    env: gym.vector.VectorEnv, observation: dict[str, Any], tasks: list[str] | None = None
+) -> dict[str, Any]:
+    """Adds task feature to the observation dict with respect to the first environment attribute.
 
-        observation["task"] = task_result
-    else:  #  For envs without language instructions, e.g. aloha transfer cube and etc.
-        num_envs = observation[list(observation.keys())[0]].shape[0]
-        observation["task"] = ["" for _ in range(num_envs)]
+    `tasks` can be passed to reuse the result of `get_envs_task` instead of querying the environments.
+    """
+    observation["task"] = list(tasks) if tasks is not None else get_envs_task(env)
     return observation
 
 
@@ -48,6 +48,8 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
 
     config_class: None
     name: None
+    # Whether `predict_action_chunk` is implemented, which continuous batching evaluation relies on
+    supports_action_chunks: bool = True
 
     def __init__(self, config: PreTrainedConfig, *inputs, **kwargs):
         super().__init__()
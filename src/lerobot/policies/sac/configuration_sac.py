@@ -53,6 +53,13 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # Only push the parameters which require gradients (e.g. not a frozen vision encoder), and the buffers
+    policy_parameters_trainable_only: bool = False
+    # Push floating point parameters as "float16" or "bfloat16" instead of their own dtype
+    policy_parameters_dtype: str | None = None
+    # Number of pushes between two full pushes. The pushes in between only hold the parameters which changed since
+    # the last full push, as bfloat16 differences to it. With 1, every push is a full push.
+    policy_parameters_keyframe_frequency: int = 1
 
 
 @dataclass
@@ -143,6 +150,17 @@ class SACConfig(PreTrainedConfig):
     online_buffer_capacity: int = 100000
     # Capacity of the offline replay buffer
     offline_buffer_capacity: int = 100000
+    # Whether to store the images of the replay buffers as uint8 instead of float32
+    buffer_uint8_images: bool = False
+    # Whether to store each image of the replay buffers once, shared between a next_state and the following
+    # state, instead of deriving next_states from the following states
+    buffer_deduplicate_frames: bool = False
+    # Whether to sample the replay buffers by priority, updated from the TD errors of the critics
+    buffer_prioritized: bool = False
+    # Prioritization exponent, 0 corresponding to uniform sampling
+    buffer_priority_alpha: float = 0.6
+    # Exponent of the importance-sampling weights of the prioritized replay buffers
+    buffer_priority_beta: float = 0.4
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
     # Number of steps before learning starts
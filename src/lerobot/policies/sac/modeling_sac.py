@@ -41,6 +41,7 @@ class SACPolicy(
 ):
     config_class = SACConfig
     name = "sac"
+    supports_action_chunks = False
 
     def __init__(
         self,
@@ -152,6 +153,7 @@ class SACPolicy(
                 - done: Done mask tensor
                 - observation_feature: Optional pre-computed observation features
                 - next_observation_feature: Optional pre-computed next observation features
+                - weights: Optional importance-sampling weights of the transitions for the critic loss
             model: Which model to compute the loss for ("actor", "critic", "discrete_critic", or "temperature")
 
         Returns:
@@ -169,7 +171,7 @@ class SACPolicy(
             done: Tensor = batch["done"]
             next_observation_features: Tensor = batch.get("next_observation_feature")
 
-            loss_critic = self.compute_loss_critic(
+            loss_critic, td_errors = self.compute_loss_critic(
                 observations=observations,
                 actions=actions,
                 rewards=rewards,
@@ -177,9 +179,11 @@ class SACPolicy(
                 done=done,
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
+                weights=batch.get("weights"),
+                return_td_errors=True,
             )
 
-            return {"loss_critic": loss_critic}
+            return {"loss_critic": loss_critic, "td_errors": td_errors}
 
         if model == "discrete_critic" and self.config.num_discrete_actions is not None:
             # Extract critic-specific components
@@ -251,7 +255,18 @@ class SACPolicy(
         done,
         observation_features: Tensor | None = None,
         next_observation_features: Tensor | None = None,
-    ) -> Tensor:
+        weights: Tensor | None = None,
+        return_td_errors: bool = False,
+    ) -> Tensor | tuple[Tensor, Tensor]:
+        """
+        Compute the TD loss of the critic ensemble.
+
+        Args:
+            weights: Optional importance-sampling weights of shape (batch_size,) scaling the loss of each
+                transition, e.g. from a prioritized replay buffer.
+            return_td_errors: If True, also return the absolute TD errors of shape (batch_size,), averaged
+                over the critics, to update the priorities of a prioritized replay buffer.
+        """
         with torch.no_grad():
             next_action_preds, next_log_probs, _ = self.actor(next_observations, next_observation_features)
 
@@ -294,13 +309,17 @@ class SACPolicy(
         # Compute state-action value loss (TD loss) for all of the Q functions in the ensemble.
         td_target_duplicate = einops.repeat(td_target, "b -> e b", e=q_preds.shape[0])
         # You compute the mean loss of the batch for each critic and then to compute the final loss you sum them up
-        critics_loss = (
-            F.mse_loss(
-                input=q_preds,
-                target=td_target_duplicate,
-                reduction="none",
-            ).mean(dim=1)
-        ).sum()
+        critics_loss = F.mse_loss(
+            input=q_preds,
+            target=td_target_duplicate,
+            reduction="none",
+        )
+        if weights is not None:
+            critics_loss = critics_loss * weights
+        critics_loss = critics_loss.mean(dim=1).sum()
+        if return_td_errors:
+            td_errors = (q_preds.detach() - td_target_duplicate).abs().mean(dim=0)
+            return critics_loss, td_errors
         return critics_loss
 
     def compute_loss_discrete_critic(
@@ -103,6 +103,7 @@ class Classifier(PreTrainedPolicy):
 
     name = "reward_classifier"
     config_class = RewardClassifierConfig
+    supports_action_chunks = False
 
     def __init__(
         self,
@@ -15,8 +15,8 @@
 # limitations under the License.
 
 """
-This script defines a processor step for moving environment transition data to a specific torch device and casting
-its floating-point precision.
+This script defines processor steps for moving environment transition data to a specific torch device, casting
+its floating-point precision, and converting uint8 camera frames to floating point once they are on the device.
 """
 
 from dataclasses import dataclass
@@ -25,10 +25,11 @@ from typing import Any
 import torch
 
 from lerobot.configs.types import PipelineFeatureType, PolicyFeature
+from lerobot.utils.constants import OBS_IMAGE, OBS_IMAGES
 from lerobot.utils.utils import get_safe_torch_device
 
 from .core import EnvTransition, PolicyAction, TransitionKey
-from .pipeline import ProcessorStep, ProcessorStepRegistry
+from .pipeline import ObservationProcessorStep, ProcessorStep, ProcessorStepRegistry
 
 
 @ProcessorStepRegistry.register("device_processor")
@@ -192,3 +193,68 @@ class DeviceProcessorStep(ProcessorStep):
             The original dictionary of policy features.
         """
         return features
+
+
+@ProcessorStepRegistry.register("image_to_float_processor")
+@dataclass
+class ImageToFloatProcessorStep(ObservationProcessorStep):
+    """
+    Processor step to convert uint8 camera frames in [0, 255] to floating point in [0, 1].
+
+    Placed right after `DeviceProcessorStep`, it lets datasets return uint8 frames (see
+    `LeRobotDataset(return_uint8_images=True)`) so that the conversion, which quadruples the size of the frames,
+    happens on the device rather than in the DataLoader workers. Frames that are already floating point are
+    left untouched.
+
+    Attributes:
+        float_dtype: The target floating-point dtype as a string (e.g., "float32", "bfloat16").
+    """
+
+    float_dtype: str = "float32"
+
+    def __post_init__(self):
+        """Validates the `float_dtype` string and converts it to a `torch.dtype` object."""
+        if self.float_dtype not in DeviceProcessorStep.DTYPE_MAPPING:
+            raise ValueError(
+                f"Invalid float_dtype '{self.float_dtype}'. Available options: {list(DeviceProcessorStep.DTYPE_MAPPING.keys())}"
+            )
+        self._target_float_dtype = DeviceProcessorStep.DTYPE_MAPPING[self.float_dtype]
+
+    def observation(self, observation: dict[str, Any]) -> dict[str, Any]:
+        """
+        Converts the uint8 image tensors of an observation to the target floating-point dtype.
+
+        Args:
+            observation: The input observation dictionary.
+
+        Returns:
+            The observation dictionary with its uint8 images scaled to [0, 1].
+        """
+        for key, value in observation.items():
+            is_image = key == OBS_IMAGE or key.startswith(f"{OBS_IMAGES}.")
+            if is_image and isinstance(value, torch.Tensor) and value.dtype == torch.uint8:
+                observation[key] = value.to(dtype=self._target_float_dtype) / 255
+        return observation
+
+    def get_config(self) -> dict[str, Any]:
+        """
+        Returns the serializable configuration of the processor.
+
+        Returns:
+            A dictionary containing the float_dtype setting.
+        """
+        return {"float_dtype": self.float_dtype}
+
+    def transform_features(
+        self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
+    ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
+        """
+        Returns the input features unchanged, as only the dtype of the images is modified.
+
+        Args:
+            features: A dictionary of policy features.
+
+        Returns:
+            The original dictionary of policy features.
+        """
+        return features
@@ -64,13 +64,13 @@ from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
 from lerobot.processor import TransitionKey
 from lerobot.rl.process import ProcessSignalHandler
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.parameter_sync import ParameterSubscriber
+from lerobot.rl.queue import get_all_items_from_queue
 from lerobot.robots import so100_follower  # noqa: F401
 from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.teleoperators.utils import TeleopEvents
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import (
-    bytes_to_state_dict,
     grpc_channel_options,
     python_object_to_bytes,
     receive_bytes_in_chunks,
@@ -81,7 +81,6 @@ from lerobot.utils.random_utils import set_seed
 from lerobot.utils.robot_utils import precise_sleep
 from lerobot.utils.transition import (
     Transition,
-    move_state_dict_to_device,
     move_transition_to_device,
 )
 from lerobot.utils.utils import (
@@ -257,6 +256,7 @@ def act_with_policy(
     )
     policy = policy.eval()
     assert isinstance(policy, nn.Module)
+    parameter_subscriber = ParameterSubscriber()
 
     obs, info = online_env.reset()
     env_processor.reset()
@@ -351,7 +351,12 @@ def act_with_policy(
         if done or truncated:
             logging.info(f"[ACTOR] Global step {interaction_step}: Episode reward: {sum_reward_episode}")
 
-            update_policy_parameters(policy=policy, parameters_queue=parameters_queue, device=device)
+            update_policy_parameters(
+                policy=policy,
+                parameters_queue=parameters_queue,
+                device=device,
+                subscriber=parameter_subscriber,
+            )
 
             if len(list_transition_to_send_to_learner) > 0:
                 push_transitions_to_transport_queue(
@@ -649,33 +654,29 @@ def interactions_stream(
 #  Policy functions
 
 
-def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device):
-    bytes_state_dict = get_last_item_from_queue(parameters_queue, block=False)
-    if bytes_state_dict is not None:
+def update_policy_parameters(
+    policy: SACPolicy, parameters_queue: Queue, device, subscriber: ParameterSubscriber
+):
+    # Every pending message is loaded in order: the last one may be a delta relative to a previous keyframe
+    buffers = get_all_items_from_queue(parameters_queue, block=False)
+    if len(buffers) > 0:
         logging.info("[ACTOR] Load new parameters from Learner.")
-        state_dicts = bytes_to_state_dict(bytes_state_dict)
 
         # TODO: check encoder parameter synchronization possible issues:
         # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
         #    instead of the updated encoder params from critic (which is optimized separately)
-        # 2. When freeze_vision_encoder=True, we waste bandwidth sending/loading frozen params
-        # 3. Need to handle encoder params correctly for both actor and discrete_critic
+        # 2. Need to handle encoder params correctly for both actor and discrete_critic
         # Potential fixes:
         # - Send critic's encoder state when shared_encoder=True
-        # - Skip encoder params entirely when freeze_vision_encoder=True
         # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
+        # Frozen encoder params are not sent with `policy_parameters_trainable_only`.
 
-        # Load actor state dict
-        actor_state_dict = move_state_dict_to_device(state_dicts["policy"], device=device)
-        policy.actor.load_state_dict(actor_state_dict)
+        modules = {"policy": policy.actor}
+        if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
+            modules["discrete_critic"] = policy.discrete_critic
 
-        # Load discrete critic if present
-        if hasattr(policy, "discrete_critic") and "discrete_critic" in state_dicts:
-            discrete_critic_state_dict = move_state_dict_to_device(
-                state_dicts["discrete_critic"], device=device
-            )
-            policy.discrete_critic.load_state_dict(discrete_critic_state_dict)
-            logging.info("[ACTOR] Loaded discrete critic parameters from Learner.")
+        for buffer in buffers:
+            subscriber.load_message(buffer, modules, device=device)
 
 
 #  Utilities functions
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import functools
+import threading
 from collections.abc import Callable, Sequence
 from contextlib import suppress
 from typing import TypedDict
@@ -36,6 +37,11 @@ class BatchTransition(TypedDict):
     done: torch.Tensor
     truncated: torch.Tensor
     complementary_info: dict[str, torch.Tensor | float | int] | None = None
+    # Set by `ReplayBuffer.sample` in prioritized mode: importance-sampling weights, buffer indices and the
+    # number of writes to each index when it was sampled
+    weights: torch.Tensor | None = None
+    indices: torch.Tensor | None = None
+    write_counts: torch.Tensor | None = None
 
 
 def random_crop_vectorized(images: torch.Tensor, output_size: tuple) -> torch.Tensor:
@@ -77,6 +83,54 @@ def random_shift(images: torch.Tensor, pad: int = 4):
     return random_crop_vectorized(images=images, output_size=(h, w))
 
 
+class SumTree:
+    """
+    Array-based binary tree where each node holds the sum of its two children, used for prioritized sampling.
+
+    The leaves hold the priorities of `capacity` items, padded to a power of 2. Priorities are updated and
+    sampled in batches with one vectorized operation per level of the tree, in O(log capacity).
+    """
+
+    def __init__(self, capacity: int, device: str = "cpu"):
+        self.capacity = capacity
+        self.num_leaves = 1 << (capacity - 1).bit_length()
+        self.depth = self.num_leaves.bit_length() - 1
+        # The root is at index 1 and the children of node i at 2 * i and 2 * i + 1, index 0 is unused
+        self.tree = torch.zeros(2 * self.num_leaves, dtype=torch.float64, device=device)
+
+    @property
+    def total(self) -> float:
+        return self.tree[1].item()
+
+    def get(self, indices: torch.Tensor) -> torch.Tensor:
+        """Priorities of the items at `indices`."""
+        return self.tree[indices + self.num_leaves]
+
+    def update(self, indices: torch.Tensor, priorities: torch.Tensor):
+        """Sets the priorities of the items at `indices` and updates the sums of their ancestors."""
+        nodes = indices.to(self.tree.device) + self.num_leaves
+        self.tree[nodes] = priorities.to(self.tree)
+        for _ in range(self.depth):
+            nodes = torch.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values: torch.Tensor) -> torch.Tensor:
+        """
+        Indices of the items where each of `values`, in [0, total), falls in the cumulative sum of the
+        priorities, so that an item is found with a probability proportional to its priority.
+        """
+        values = values.to(self.tree).clone()
+        nodes = torch.ones(len(values), dtype=torch.int64, device=self.tree.device)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.tree[left]
+            # Never go towards an empty subtree, which rounding errors could otherwise do
+            go_right = (values >= left_sums) & (self.tree[left + 1] > 0)
+            values = torch.where(go_right, values - left_sums, values)
+            nodes = torch.where(go_right, left + 1, left)
+        return nodes - self.num_leaves
+
+
 class ReplayBuffer:
     def __init__(
         self,
@@ -87,6 +141,13 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        uint8_images: bool = False,
+        deduplicate_frames: bool = False,
+        frame_capacity: int | None = None,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
+        priority_eps: float = 1e-6,
     ):
         """
         Replay buffer for storing transitions.
@@ -104,9 +165,30 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+            uint8_images (bool): If True, images (keys starting with "observation.image") are stored as
+                uint8 instead of float32, which divides their memory by 4. They are converted back to float in
+                [0, 1] on `device` when sampling. Float images must be in [0, 1], other values are clamped.
+            deduplicate_frames (bool): If True, images are stored once in a pool of frames, which states and
+                next_states reference by index. The next_state of a transition and the state of the following
+                one share their frame when they are equal, so that each frame of an episode is stored once,
+                including the last next_state of the episode (unlike with `optimize_memory`).
+            frame_capacity (int | None): Number of frames of the pool used by `deduplicate_frames`. When it is
+                full, the oldest transitions are dropped along with their frames. Defaults to `capacity`, in
+                which case episodes of N transitions use N + 1 frames.
+            prioritized (bool): If True, transitions are sampled with a probability proportional to their
+                priority to the power `priority_alpha`, using a `SumTree`. Sampled batches then contain
+                the importance-sampling `weights` of their transitions, their `indices` and their
+                `write_counts`, to pass to `update_priorities` along with their TD errors. New transitions get
+                the highest priority.
+            priority_alpha (float): How much prioritization is used, 0 corresponding to uniform sampling.
+            priority_beta (float): Exponent of the importance-sampling weights, 1 fully compensating the
+                non-uniform sampling.
+            priority_eps (float): Added to the absolute TD errors, so that every transition can be sampled.
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
+        if deduplicate_frames and optimize_memory:
+            raise ValueError("deduplicate_frames and optimize_memory can't be used together.")
 
         self.capacity = capacity
         self.device = device
@@ -115,6 +197,22 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.uint8_images = uint8_images
+        self.deduplicate_frames = deduplicate_frames
+        self.frame_capacity = frame_capacity if frame_capacity is not None else capacity
+        self.prioritized = prioritized
+        self.priority_alpha = priority_alpha
+        self.priority_beta = priority_beta
+        self.priority_eps = priority_eps
+        self.priorities = SumTree(capacity, device=storage_device) if prioritized else None
+        # Number of transitions written to each index, to tell whether a sampled transition was overwritten
+        self.write_counts = (
+            torch.zeros(capacity, dtype=torch.int64, device=storage_device) if prioritized else None
+        )
+        # Priorities are updated by the training loop while the prefetching thread samples them
+        self._priorities_lock = threading.Lock()
+        # Priority of the new transitions, before the power `priority_alpha`
+        self.max_priority = 1.0
 
         # Track episode boundaries for memory optimization
         self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
@@ -139,10 +237,39 @@ class ReplayBuffer:
         # Determine shapes from the first transition
         state_shapes = {key: val.squeeze(0).shape for key, val in state.items()}
         action_shape = action.squeeze(0).shape
+        self.state_dtypes = {
+            key: torch.uint8 if self.uint8_images and key.startswith(OBS_IMAGE) else torch.float32
+            for key in state_shapes
+        }
+        # Keys stored in the frame pool instead of `states` and `next_states`
+        self.frame_keys = []
+        if self.deduplicate_frames:
+            self.frame_keys = [key for key in state_shapes if key.startswith(OBS_IMAGE)]
+
+        if self.frame_keys:
+            self.frames = {
+                key: torch.empty(
+                    (self.frame_capacity, *state_shapes[key]),
+                    dtype=self.state_dtypes[key],
+                    device=self.storage_device,
+                )
+                for key in self.frame_keys
+            }
+            # Index of the frames of each transition, counting all the frames ever written
+            self.state_frame_ids = torch.zeros(self.capacity, dtype=torch.int64, device=self.storage_device)
+            self.next_state_frame_ids = torch.zeros(
+                self.capacity, dtype=torch.int64, device=self.storage_device
+            )
+            self.num_written_frames = 0
+            # Frame of the next_state of the last transition, if its episode goes on
+            self._last_next_frame_id = None
+        state_shapes = {key: shape for key, shape in state_shapes.items() if key not in self.frame_keys}
 
         # Pre-allocate tensors for storage
         self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
+            key: torch.empty(
+                (self.capacity, *shape), dtype=self.state_dtypes[key], device=self.storage_device
+            )
             for key, shape in state_shapes.items()
         }
         self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
@@ -151,7 +278,9 @@ class ReplayBuffer:
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
             self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
+                key: torch.empty(
+                    (self.capacity, *shape), dtype=self.state_dtypes[key], device=self.storage_device
+                )
                 for key, shape in state_shapes.items()
             }
         else:
@@ -202,13 +331,28 @@ class ReplayBuffer:
         if not self.initialized:
             self._initialize_storage(state=state, action=action, complementary_info=complementary_info)
 
+        if self.frame_keys:
+            # Frames are shared with the previous transition, which `add_batch` takes care of
+            transition = Transition(
+                state=state,
+                action=action,
+                reward=reward,
+                next_state=next_state,
+                done=done,
+                truncated=truncated,
+                complementary_info=complementary_info,
+            )
+            self.add_batch(**stack_transitions([transition]))
+            return
+
         # Store the transition in pre-allocated tensors
         for key in self.states:
-            self.states[key][self.position].copy_(state[key].squeeze(dim=0))
+            self.states[key][self.position] = self._to_storage(key, state[key].squeeze(dim=0))
 
             if not self.optimize_memory:
                 # Only store next_states if not optimizing memory
-                self.next_states[key][self.position].copy_(next_state[key].squeeze(dim=0))
+                next_value = self._to_storage(key, next_state[key].squeeze(dim=0))
+                self.next_states[key][self.position] = next_value
 
         self.actions[self.position].copy_(action.squeeze(dim=0))
         self.rewards[self.position] = reward
@@ -226,38 +370,354 @@ class ReplayBuffer:
                     elif isinstance(value, (int | float)):
                         self.complementary_info[key][self.position] = value
 
+        if self.prioritized:
+            self._set_new_priorities(torch.tensor([self.position], device=self.storage_device))
+
         self.position = (self.position + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
 
-    def sample(self, batch_size: int) -> BatchTransition:
-        """Sample a random batch of transitions and collate them into batched tensors."""
-        if not self.initialized:
-            raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
+    def add_batch(
+        self,
+        state: dict[str, torch.Tensor],
+        action: torch.Tensor,
+        reward: torch.Tensor,
+        next_state: dict[str, torch.Tensor],
+        done: torch.Tensor,
+        truncated: torch.Tensor,
+        complementary_info: dict[str, torch.Tensor] | None = None,
+    ):
+        """Saves a batch of transitions stacked along their first dimension (see `stack_transitions`).
 
-        batch_size = min(batch_size, self.size)
-        high = max(0, self.size - 1) if self.optimize_memory and self.size < self.capacity else self.size
+        This is equivalent to calling `add` on each transition in order, but each key is written with a single
+        indexed copy, wrapping around the end of the buffer. When the batch is bigger than the capacity, only
+        its last transitions are kept.
+        """
+        batch_size = len(action)
+        if batch_size == 0:
+            return
 
-        # Random indices for sampling - create on the same device as storage
-        idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+        if not self.initialized:
+            self._initialize_storage(
+                state={key: val[:1] for key, val in state.items()},
+                action=action[:1],
+                complementary_info=(
+                    {key: val[:1] for key, val in complementary_info.items()}
+                    if complementary_info is not None
+                    else None
+                ),
+            )
 
-        # Identify image keys that need augmentation
-        image_keys = [k for k in self.states if k.startswith(OBS_IMAGE)] if self.use_drq else []
+        # Transitions which would be overwritten by later ones of the same batch are not written at all
+        offset = max(0, batch_size - self.capacity)
+        indices = (
+            self.position + offset + torch.arange(batch_size - offset, device=self.storage_device)
+        ) % self.capacity
 
-        # Create batched state and next_state
-        batch_state = {}
-        batch_next_state = {}
+        def write(storage: torch.Tensor, values: torch.Tensor):
+            storage[indices] = values[offset:].to(self.storage_device)
 
-        # First pass: load all state tensors to target device
         for key in self.states:
-            batch_state[key] = self.states[key][idx].to(self.device)
+            write(self.states[key], self._to_storage(key, state[key]))
 
             if not self.optimize_memory:
+                # Only store next_states if not optimizing memory
+                write(self.next_states[key], self._to_storage(key, next_state[key]))
+
+        if self.frame_keys:
+            self._write_frames(
+                state={key: self._to_storage(key, state[key][offset:]) for key in self.frame_keys},
+                next_state={key: self._to_storage(key, next_state[key][offset:]) for key in self.frame_keys},
+                ended=(done.bool() | truncated.bool())[offset:].to(self.storage_device),
+                indices=indices,
+                follows_last=offset == 0,
+            )
+
+        write(self.actions, action)
+        write(self.rewards, reward)
+        write(self.dones, done)
+        write(self.truncateds, truncated)
+
+        if complementary_info is not None and self.has_complementary_info:
+            for key in self.complementary_info_keys:
+                if key in complementary_info:
+                    write(self.complementary_info[key], complementary_info[key])
+
+        if self.prioritized:
+            self._set_new_priorities(indices)
+
+        self.position = (self.position + batch_size) % self.capacity
+        self.size = min(self.size + batch_size, self.capacity)
+
+        if self.frame_keys:
+            # Transitions and their frames are stored in order, with increasing state frame ids, so the
+            # transitions whose frames were overwritten are the oldest ones. A batch writes at most two frames
+            # per transition, so it drops at most twice as many transitions.
+            min_frame_id = self.num_written_frames - self.frame_capacity
+            num_candidates = min(self.size, 2 * batch_size)
+            oldest_indices = (
+                self.position - self.size + torch.arange(num_candidates, device=self.storage_device)
+            ) % self.capacity
+            dropped_indices = oldest_indices[self.state_frame_ids[oldest_indices] < min_frame_id]
+            self.size -= len(dropped_indices)
+            if self.prioritized and len(dropped_indices) > 0:
+                with self._priorities_lock:
+                    self.priorities.update(dropped_indices, torch.zeros(len(dropped_indices)))
+
+    def _set_new_priorities(self, indices: torch.Tensor):
+        """Gives the highest priority to new transitions written at `indices`, before `position` advances."""
+        priority = self.max_priority**self.priority_alpha
+        priorities = torch.full((len(indices),), priority, dtype=torch.float64)
+        with self._priorities_lock:
+            self.write_counts[indices] += 1
+            if self.optimize_memory:
+                # The next_state of the newest transition is not stored yet (see `sample`), so it can only be
+                # sampled once the following transition is added
+                if self.size > 0:
+                    previous_idx = torch.tensor(
+                        [(self.position - 1) % self.capacity], device=self.storage_device
+                    )
+                    self.priorities.update(previous_idx, torch.full((1,), priority, dtype=torch.float64))
+                priorities[-1] = 0
+            self.priorities.update(indices, priorities)
+
+    def update_priorities(
+        self, indices: torch.Tensor, td_errors: torch.Tensor, write_counts: torch.Tensor | None = None
+    ):
+        """
+        Updates the priorities of sampled transitions from their TD errors, in prioritized mode.
+
+        Args:
+            indices (torch.Tensor): The `indices` of a batch returned by `sample`.
+            td_errors (torch.Tensor): The TD errors of the transitions of the batch, of shape (batch_size,).
+            write_counts (torch.Tensor | None): The `write_counts` of the batch. Transitions overwritten since
+                they were sampled, e.g. while the batch was prefetched, are then left untouched.
+        """
+        if not self.prioritized:
+            raise RuntimeError("Priorities can only be updated when the buffer is prioritized.")
+
+        indices = indices.to(self.storage_device)
+        priorities = td_errors.detach().abs().to(self.storage_device, torch.float64) + self.priority_eps
+        with self._priorities_lock:
+            # Transitions dropped since they were sampled keep a priority of 0, and the transitions written
+            # over them keep their own
+            age = (self.position - 1 - indices) % self.capacity
+            is_stored = age < self.size
+            if self.optimize_memory:
+                is_stored &= age > 0
+            if write_counts is not None:
+                is_stored &= self.write_counts[indices] == write_counts.to(self.storage_device)
+            if not is_stored.any():
+                return
+
+            self.max_priority = max(self.max_priority, priorities[is_stored].max().item())
+            self.priorities.update(indices[is_stored], priorities[is_stored] ** self.priority_alpha)
+
+    def _to_storage(self, key: str, values: torch.Tensor) -> torch.Tensor:
+        """Converts values of a state key to its storage dtype, quantizing float images to uint8.
+
+        Float images are expected in [0, 1], like the ones of the environment processors. Values outside of
+        this range are clamped to it.
+        """
+        if self.state_dtypes[key] == torch.uint8 and values.is_floating_point():
+            return (values * 255).round_().clamp_(0, 255).to(torch.uint8)
+        return values
+
+    def _from_storage(self, key: str, values: torch.Tensor) -> torch.Tensor:
+        """Inverse of `_to_storage`, to call once the values are on the target device."""
+        if self.state_dtypes[key] == torch.uint8:
+            return values.float().div_(255)
+        return values
+
+    def _write_frames(
+        self,
+        state: dict[str, torch.Tensor],
+        next_state: dict[str, torch.Tensor],
+        ended: torch.Tensor,
+        indices: torch.Tensor,
+        follows_last: bool,
+    ):
+        """Writes the frames of a batch of transitions, already in their storage dtype, to the frame pool.
+
+        The state of a transition reuses the frame of the next_state of the previous transition when the
+        latter didn't end its episode and both frames are equal, so that most transitions write a single
+        frame.
+        """
+        batch_size = len(indices)
+        state = {key: val.to(self.storage_device) for key, val in state.items()}
+        next_state = {key: val.to(self.storage_device) for key, val in next_state.items()}
+
+        reuses_frame = torch.zeros(batch_size, dtype=torch.bool, device=self.storage_device)
+        reuses_frame[1:] = ~ended[:-1]
+        for key in self.frame_keys:
+            reuses_frame[1:] &= (state[key][1:] == next_state[key][:-1]).flatten(1).all(dim=1)
+        if follows_last and self._last_next_frame_id is not None:
+            last_slot = self._last_next_frame_id % self.frame_capacity
+            reuses_frame[0] = all(
+                torch.equal(state[key][0], self.frames[key][last_slot]) for key in self.frame_keys
+            )
+
+        # Each transition writes its next_state frame, preceded by its state frame unless it is reused
+        num_frames = (~reuses_frame).long() + 1
+        next_frame_ids = self.num_written_frames + torch.cumsum(num_frames, dim=0) - 1
+        previous_next_frame_ids = torch.roll(next_frame_ids, 1)
+        if self._last_next_frame_id is not None:
+            previous_next_frame_ids[0] = self._last_next_frame_id
+        state_frame_ids = torch.where(reuses_frame, previous_next_frame_ids, next_frame_ids - 1)
+
+        # Frames which would be overwritten by later ones of the same batch are not written at all
+        self.num_written_frames = next_frame_ids[-1].item() + 1
+        min_frame_id = self.num_written_frames - self.frame_capacity
+        written_states = ~reuses_frame & (state_frame_ids >= min_frame_id)
+        written_next_states = next_frame_ids >= min_frame_id
+        for key in self.frame_keys:
+            frames = self.frames[key]
+            frames[state_frame_ids[written_states] % self.frame_capacity] = state[key][written_states]
+            frames[next_frame_ids[written_next_states] % self.frame_capacity] = next_state[key][
+                written_next_states
+            ]
+
+        self.state_frame_ids[indices] = state_frame_ids
+        self.next_state_frame_ids[indices] = next_frame_ids
+        self._last_next_frame_id = None if ended[-1] else next_frame_ids[-1].item()
+
+    @staticmethod
+    def _take(
+        storage: torch.Tensor, idx: torch.Tensor, staging: dict[str, torch.Tensor] | None, name: str
+    ) -> torch.Tensor:
+        """Indexes `storage` along its first dimension, into the pinned buffer `staging[name]` if given."""
+        if staging is None:
+            return storage[idx]
+        shape = (len(idx), *storage.shape[1:])
+        out = staging.get(name)
+        if out is None or out.shape != shape:
+            out = staging[name] = torch.empty(shape, dtype=storage.dtype, pin_memory=True)
+        return torch.index_select(storage, 0, idx, out=out)
+
+    def _gather_states(
+        self, idx: torch.Tensor, staging: dict[str, torch.Tensor] | None = None
+    ) -> tuple[dict[str, torch.Tensor], dict[str, torch.Tensor]]:
+        """Gathers the states and next_states of transitions, in their storage dtype and device."""
+        batch_state = {}
+        batch_next_state = {}
+        for key in self.state_dtypes:
+            if key in self.frame_keys:
+                state_slots = self.state_frame_ids[idx] % self.frame_capacity
+                next_state_slots = self.next_state_frame_ids[idx] % self.frame_capacity
+                batch_state[key] = self._take(self.frames[key], state_slots, staging, f"state/{key}")
+                batch_next_state[key] = self._take(
+                    self.frames[key], next_state_slots, staging, f"next_state/{key}"
+                )
+            elif not self.optimize_memory:
+                batch_state[key] = self._take(self.states[key], idx, staging, f"state/{key}")
                 # Standard approach - load next_states directly
-                batch_next_state[key] = self.next_states[key][idx].to(self.device)
+                batch_next_state[key] = self._take(self.next_states[key], idx, staging, f"next_state/{key}")
             else:
+                batch_state[key] = self._take(self.states[key], idx, staging, f"state/{key}")
                 # Memory-optimized approach - get next_state from the next index
                 next_idx = (idx + 1) % self.capacity
-                batch_next_state[key] = self.states[key][next_idx].to(self.device)
+                batch_next_state[key] = self._take(self.states[key], next_idx, staging, f"next_state/{key}")
+        return batch_state, batch_next_state
+
+    def _sample_prioritized_indices(
+        self, batch_size: int
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Samples indices proportionally to their priority, with their importance-sampling weights and their
+        `write_counts`.
+        """
+        # Stratified sampling: one value in each of `batch_size` segments of the total priority
+        segments = torch.arange(batch_size, dtype=torch.float64, device=self.storage_device)
+        offsets = torch.rand(batch_size, dtype=torch.float64, device=self.storage_device)
+        with self._priorities_lock:
+            total = self.priorities.total
+            if total == 0:
+                # e.g. the only transition of an `optimize_memory` buffer, whose next_state is not stored yet
+                raise RuntimeError("Cannot sample from a buffer without any sampleable transition.")
+            idx = self.priorities.find((segments + offsets) * (total / batch_size))
+            probabilities = self.priorities.get(idx) / total
+            # Read before the transitions are gathered, which may be overwritten in the meantime
+            write_counts = self.write_counts[idx]
+        weights = (self.size * probabilities) ** -self.priority_beta
+        return idx, (weights / weights.max()).float(), write_counts
+
+    def sample(self, batch_size: int) -> BatchTransition:
+        """Sample a random batch of transitions and collate them into batched tensors."""
+        return self._finalize_batch(self._gather_batch(batch_size))
+
+    def _gather_batch(
+        self, batch_size: int, staging: dict[str, torch.Tensor] | None = None
+    ) -> BatchTransition:
+        """
+        First step of `sample`: samples indices and gathers their transitions on the storage device, in their
+        storage dtype.
+
+        Args:
+            batch_size (int): Number of transitions to sample, at most the size of the buffer.
+            staging (dict[str, torch.Tensor] | None): Pinned buffers to gather into, which are (re)allocated
+                when missing or of the wrong shape, to copy the batch to the device asynchronously.
+        """
+        if not self.initialized:
+            raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
+
+        batch_size = min(batch_size, self.size)
+
+        weights = write_counts = None
+        if self.prioritized:
+            idx, weights, write_counts = self._sample_prioritized_indices(batch_size)
+        else:
+            high = max(0, self.size - 1) if self.optimize_memory and self.size < self.capacity else self.size
+
+            # Random indices for sampling - create on the same device as storage
+            idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+            if self.size < self.capacity:
+                # Stored transitions don't start at 0 once the oldest ones are dropped
+                # (see `deduplicate_frames`)
+                idx = (self.position - self.size + idx) % self.capacity
+
+        batch_state, batch_next_state = self._gather_states(idx, staging)
+
+        # Sample complementary_info if available
+        batch_complementary_info = None
+        if self.has_complementary_info:
+            batch_complementary_info = {
+                key: self._take(self.complementary_info[key], idx, staging, f"complementary_info/{key}")
+                for key in self.complementary_info_keys
+            }
+
+        batch = BatchTransition(
+            state=batch_state,
+            action=self._take(self.actions, idx, staging, ACTION),
+            reward=self._take(self.rewards, idx, staging, "reward"),
+            next_state=batch_next_state,
+            done=self._take(self.dones, idx, staging, "done"),
+            truncated=self._take(self.truncateds, idx, staging, "truncated"),
+            complementary_info=batch_complementary_info,
+        )
+        if self.prioritized:
+            batch["weights"] = weights
+            batch["indices"] = idx
+            batch["write_counts"] = write_counts
+        return batch
+
+    def _finalize_batch(self, batch: BatchTransition, non_blocking: bool = False) -> BatchTransition:
+        """
+        Second step of `sample`: moves a batch of `_gather_batch` to `device`, converts its uint8 images to
+        float and applies the DrQ augmentation. The batch is updated in place and returned.
+        """
+
+        def to_device(value: torch.Tensor) -> torch.Tensor:
+            return value.to(self.device, non_blocking=non_blocking)
+
+        batch_size = len(batch[ACTION])
+
+        # Identify image keys that need augmentation
+        image_keys = [k for k in self.state_dtypes if k.startswith(OBS_IMAGE)] if self.use_drq else []
+
+        # First pass: load all state tensors to target device, where uint8 images are converted to float
+        batch_state = {key: self._from_storage(key, to_device(val)) for key, val in batch["state"].items()}
+        batch_next_state = {
+            key: self._from_storage(key, to_device(val)) for key, val in batch["next_state"].items()
+        }
 
         # Apply image augmentation in a batched way if needed
         if self.use_drq and image_keys:
@@ -280,28 +740,19 @@ class ReplayBuffer:
                 # Next states start after the states at index (i*2+1)*batch_size and also take up batch_size slots
                 batch_next_state[key] = augmented_images[(i * 2 + 1) * batch_size : (i + 1) * 2 * batch_size]
 
-        # Sample other tensors
-        batch_actions = self.actions[idx].to(self.device)
-        batch_rewards = self.rewards[idx].to(self.device)
-        batch_dones = self.dones[idx].to(self.device).float()
-        batch_truncateds = self.truncateds[idx].to(self.device).float()
-
-        # Sample complementary_info if available
-        batch_complementary_info = None
-        if self.has_complementary_info:
-            batch_complementary_info = {}
-            for key in self.complementary_info_keys:
-                batch_complementary_info[key] = self.complementary_info[key][idx].to(self.device)
-
-        return BatchTransition(
-            state=batch_state,
-            action=batch_actions,
-            reward=batch_rewards,
-            next_state=batch_next_state,
-            done=batch_dones,
-            truncated=batch_truncateds,
-            complementary_info=batch_complementary_info,
-        )
+        batch["state"] = batch_state
+        batch["next_state"] = batch_next_state
+        batch[ACTION] = to_device(batch[ACTION])
+        batch["reward"] = to_device(batch["reward"])
+        batch["done"] = to_device(batch["done"]).float()
+        batch["truncated"] = to_device(batch["truncated"]).float()
+        if batch["complementary_info"] is not None:
+            batch["complementary_info"] = {
+                key: to_device(val) for key, val in batch["complementary_info"].items()
+            }
+        if batch.get("weights") is not None:
+            batch["weights"] = to_device(batch["weights"])
+        return batch
 
     def get_iterator(
         self,
@@ -336,7 +787,8 @@ class ReplayBuffer:
         """
         Create an iterator that continuously yields prefetched batches in a
         background thread. The design is intentionally simple and avoids busy
-        waiting / complex state management.
+        waiting / complex state management. On a CUDA device, the batches are
+        copied and augmented on a side stream (see `BatchPrefetcher`).
 
         Args:
             batch_size (int): Size of batches to sample.
@@ -347,19 +799,22 @@ class ReplayBuffer:
             BatchTransition: A batch sampled from the replay buffer.
         """
         import queue
-        import threading
 
         data_queue: queue.Queue = queue.Queue(maxsize=queue_size)
         shutdown_event = threading.Event()
+        prefetcher = BatchPrefetcher(self, batch_size=batch_size)
 
         def producer() -> None:
-            """Continuously put sampled batches into the queue until shutdown."""
+            """Continuously put prefetched batches into the queue until shutdown."""
+            prefetched = None
             while not shutdown_event.is_set():
                 try:
-                    batch = self.sample(batch_size)
+                    if prefetched is None:
+                        prefetched = prefetcher.prefetch()
                     # The timeout ensures the thread unblocks if the queue is full
                     # and the shutdown event gets set meanwhile.
-                    data_queue.put(batch, block=True, timeout=0.5)
+                    data_queue.put(prefetched, block=True, timeout=0.5)
+                    prefetched = None
                 except queue.Full:
                     # Queue is full – loop again (will re-check shutdown_event)
                     continue
@@ -373,7 +828,7 @@ class ReplayBuffer:
         try:
             while not shutdown_event.is_set():
                 try:
-                    yield data_queue.get(block=True)
+                    yield prefetcher.wait(data_queue.get(block=True))
                 except Exception:
                     # If the producer already set the shutdown flag we exit.
                     if shutdown_event.is_set():
@@ -400,16 +855,18 @@ class ReplayBuffer:
         import collections
 
         queue = collections.deque()
+        prefetcher = BatchPrefetcher(self, batch_size=batch_size)
 
         def enqueue(n):
             for _ in range(n):
-                data = self.sample(batch_size)
-                queue.append(data)
+                queue.append(prefetcher.prefetch())
 
         enqueue(queue_size)
         while queue:
-            yield queue.popleft()
+            prefetched = queue.popleft()
+            # Issued before yielding, so that its copy to the device overlaps with the use of this batch
             enqueue(1)
+            yield prefetcher.wait(prefetched)
 
     @classmethod
     def from_lerobot_dataset(
@@ -422,6 +879,12 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        uint8_images: bool = False,
+        deduplicate_frames: bool = False,
+        frame_capacity: int | None = None,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
     ) -> "ReplayBuffer":
         """
         Convert a LeRobotDataset into a ReplayBuffer.
@@ -437,6 +900,12 @@ class ReplayBuffer:
             use_drq (bool): Whether to use DrQ image augmentation when sampling.
             storage_device (str): Device for storing tensor data. Using "cpu" saves GPU memory.
             optimize_memory (bool): If True, reduces memory usage by not duplicating state data.
+            uint8_images (bool): If True, images are stored as uint8, see `ReplayBuffer`.
+            deduplicate_frames (bool): If True, images are stored once in a frame pool, see `ReplayBuffer`.
+            frame_capacity (int | None): Number of frames of the pool used by `deduplicate_frames`.
+            prioritized (bool): If True, transitions are sampled by priority, see `ReplayBuffer`.
+            priority_alpha (float): How much prioritization is used, see `ReplayBuffer`.
+            priority_beta (float): Exponent of the importance-sampling weights, see `ReplayBuffer`.
 
         Returns:
             ReplayBuffer: The replay buffer with dataset transitions.
@@ -458,6 +927,12 @@ class ReplayBuffer:
             use_drq=use_drq,
             storage_device=storage_device,
             optimize_memory=optimize_memory,
+            uint8_images=uint8_images,
+            deduplicate_frames=deduplicate_frames,
+            frame_capacity=frame_capacity,
+            prioritized=prioritized,
+            priority_alpha=priority_alpha,
+            priority_beta=priority_beta,
         )
 
         # Convert dataset to transitions
@@ -538,9 +1013,10 @@ class ReplayBuffer:
         features[DONE] = {"dtype": "bool", "shape": (1,)}
 
         # Add state keys
-        for key in self.states:
-            sample_val = self.states[key][0]
-            f_info = guess_feature_info(t=sample_val, name=key)
+        oldest_idx = torch.tensor([(self.position - self.size) % self.capacity], device=self.storage_device)
+        sample_state, _ = self._gather_states(oldest_idx)
+        for key, sample_val in sample_state.items():
+            f_info = guess_feature_info(t=sample_val[0], name=key)
             features[key] = f_info
 
         # Add complementary_info keys if available
@@ -573,8 +1049,9 @@ class ReplayBuffer:
             frame_dict = {}
 
             # Fill the data for state keys
-            for key in self.states:
-                frame_dict[key] = self.states[key][actual_idx].cpu()
+            state, _ = self._gather_states(torch.tensor([actual_idx], device=self.storage_device))
+            for key, val in state.items():
+                frame_dict[key] = self._from_storage(key, val[0].cpu())
 
             # Fill action, reward, done
             frame_dict[ACTION] = self.actions[actual_idx].cpu()
@@ -735,6 +1212,82 @@ class ReplayBuffer:
         return transitions
 
 
+class BatchPrefetcher:
+    """
+    Prepares batches of a ReplayBuffer ahead of their use, for its iterators.
+
+    When the buffer samples to a CUDA device, the transitions of each batch are gathered into pinned staging
+    buffers on the host, then copied to the device without blocking and augmented on a side stream, so that
+    the batch is ready on the device while the default stream keeps computing. `prefetch` can run in a
+    background thread, and `wait` must be called by the thread which uses the batch.
+    Otherwise, batches are simply sampled by `prefetch`, which still overlaps with the training computations
+    when it runs in a background thread.
+
+    Args:
+        replay_buffer (ReplayBuffer): The buffer to sample from.
+        batch_size (int): Size of the batches.
+        num_staging_buffers (int): Number of sets of staging buffers, used in turn so that a batch can be
+            gathered while the previous ones are being copied.
+    """
+
+    def __init__(self, replay_buffer: ReplayBuffer, batch_size: int, num_staging_buffers: int = 2):
+        self.replay_buffer = replay_buffer
+        self.batch_size = batch_size
+
+        device = torch.device(replay_buffer.device)
+        self.stream = torch.cuda.Stream(device=device) if device.type == "cuda" else None
+        # Staging buffers are only useful to copy from the host to the device
+        use_staging = self.stream is not None and torch.device(replay_buffer.storage_device).type == "cpu"
+        self.staging_buffers = [{} for _ in range(num_staging_buffers)] if use_staging else []
+        self.copy_events = [None] * len(self.staging_buffers)
+        self.next_staging_index = 0
+
+    def prefetch(self) -> tuple[BatchTransition, "torch.cuda.Event | None"]:
+        """Starts preparing a batch, returned with the event to wait for before using it on the device."""
+        if self.stream is None:
+            return self.replay_buffer.sample(self.batch_size), None
+
+        staging = None
+        if self.staging_buffers:
+            staging_index = self.next_staging_index
+            self.next_staging_index = (staging_index + 1) % len(self.staging_buffers)
+            if self.copy_events[staging_index] is not None:
+                # The staging buffers are overwritten once the copy of their previous batch is done
+                self.copy_events[staging_index].synchronize()
+            staging = self.staging_buffers[staging_index]
+
+        batch = self.replay_buffer._gather_batch(self.batch_size, staging=staging)
+        if torch.device(self.replay_buffer.storage_device).type == "cuda":
+            # Gathering on a CUDA storage device runs on the current stream. Batches staged on the host don't
+            # wait for it, so that their copies overlap with the training computations queued on it.
+            self.stream.wait_stream(torch.cuda.current_stream(self.stream.device))
+        with torch.cuda.stream(self.stream):
+            batch = self.replay_buffer._finalize_batch(batch, non_blocking=True)
+            event = torch.cuda.Event()
+            event.record(self.stream)
+
+        if staging is not None:
+            self.copy_events[staging_index] = event
+        return batch, event
+
+    def wait(self, prefetched: tuple[BatchTransition, "torch.cuda.Event | None"]) -> BatchTransition:
+        """Makes the current stream wait for a batch returned by `prefetch`, and returns the batch."""
+        batch, event = prefetched
+        if event is None:
+            return batch
+
+        stream = torch.cuda.current_stream(self.stream.device)
+        stream.wait_event(event)
+        # The batch was allocated on the side stream, whose memory could otherwise be reused while the
+        # current stream still uses the batch
+        for value in batch.values():
+            tensors = value.values() if isinstance(value, dict) else [value]
+            for tensor in tensors:
+                if isinstance(tensor, torch.Tensor) and tensor.is_cuda:
+                    tensor.record_stream(stream)
+        return batch
+
+
 # Utility function to guess shapes/dtypes from a tensor
 def guess_feature_info(t, name: str):
     """
@@ -777,8 +1330,12 @@ def concatenate_batch_transitions(
         BatchTransition: The concatenated batch (same object as left_batch_transitions).
 
     Warning:
-        This function modifies the left_batch_transitions object in place.
+        This function modifies the left_batch_transitions object in place. The `indices` and `write_counts`
+        of prioritized batches are dropped, so they must be read before concatenating.
     """
+    # Read before the fields of the left batch are replaced by the concatenated ones
+    left_batch_size = len(left_batch_transitions[ACTION])
+
     # Concatenate state fields
     left_batch_transitions["state"] = {
         key: torch.cat(
@@ -831,4 +1388,69 @@ def concatenate_batch_transitions(
                 else:
                     left_info[key] = right_info[key]
 
+    # Importance-sampling weights default to 1 for a batch sampled uniformly
+    left_weights = left_batch_transitions.get("weights")
+    right_weights = right_batch_transition.get("weights")
+    if left_weights is not None or right_weights is not None:
+        if left_weights is None:
+            left_weights = right_weights.new_ones(left_batch_size)
+        if right_weights is None:
+            right_weights = left_weights.new_ones(len(right_batch_transition[ACTION]))
+        left_batch_transitions["weights"] = torch.cat([left_weights, right_weights], dim=0)
+
+    # Indices refer to the buffer each batch was sampled from, so they can't be concatenated
+    left_batch_transitions.pop("indices", None)
+    left_batch_transitions.pop("write_counts", None)
+
     return left_batch_transitions
+
+
+def stack_transitions(transitions: list[Transition]) -> BatchTransition:
+    """
+    Stacks a list of transitions into a BatchTransition, to be added with `ReplayBuffer.add_batch`.
+
+    Like in `ReplayBuffer.add`, a leading batch dimension of size 1 is squeezed from the tensors of each
+    transition. The complementary_info keys missing from some transitions are filled with zeros for them,
+    e.g. `IS_INTERVENTION` which may only be set by the interventions.
+    """
+
+    def stack(values: list) -> torch.Tensor:
+        return torch.stack([torch.as_tensor(value).squeeze(0) for value in values])
+
+    complementary_info = None
+    infos = [transition.get("complementary_info") or {} for transition in transitions]
+    if any(transition.get("complementary_info") is not None for transition in transitions):
+        complementary_info = {}
+        for key in dict.fromkeys(key for info in infos for key in info):
+            zeros = torch.zeros_like(torch.as_tensor(next(info[key] for info in infos if key in info)))
+            complementary_info[key] = stack([info.get(key, zeros) for info in infos])
+
+    return BatchTransition(
+        state={key: stack([t["state"][key] for t in transitions]) for key in transitions[0]["state"]},
+        action=stack([t[ACTION] for t in transitions]),
+        reward=torch.tensor([float(t["reward"]) for t in transitions]),
+        next_state={
+            key: stack([t["next_state"][key] for t in transitions]) for key in transitions[0]["next_state"]
+        },
+        done=torch.tensor([bool(t["done"]) for t in transitions]),
+        truncated=torch.tensor([bool(t["truncated"]) for t in transitions]),
+        complementary_info=complementary_info,
+    )
+
+
+def select_batch_transitions(batch: BatchTransition, index: torch.Tensor) -> BatchTransition:
+    """Selects the transitions of a BatchTransition at an index (e.g. a boolean mask) along dimension 0."""
+    complementary_info = batch.get("complementary_info")
+    return BatchTransition(
+        state={key: val[index] for key, val in batch["state"].items()},
+        action=batch[ACTION][index],
+        reward=batch["reward"][index],
+        next_state={key: val[index] for key, val in batch["next_state"].items()},
+        done=batch["done"][index],
+        truncated=batch["truncated"][index],
+        complementary_info=(
+            {key: val[index] for key, val in complementary_info.items()}
+            if complementary_info is not None
+            else None
+        ),
+    )
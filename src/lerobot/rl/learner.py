@@ -66,7 +66,14 @@ from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
-from lerobot.rl.buffer import ReplayBuffer, concatenate_batch_transitions
+from lerobot.rl.buffer import (
+    BatchTransition,
+    ReplayBuffer,
+    concatenate_batch_transitions,
+    select_batch_transitions,
+    stack_transitions,
+)
+from lerobot.rl.parameter_sync import ParameterPublisher
 from lerobot.rl.process import ProcessSignalHandler
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.robots import so100_follower  # noqa: F401
@@ -77,7 +84,6 @@ from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
     bytes_to_python_object,
     bytes_to_transitions,
-    state_to_bytes,
 )
 from lerobot.utils.constants import (
     ACTION,
@@ -93,7 +99,7 @@ from lerobot.utils.train_utils import (
     save_checkpoint,
     update_last_checkpoint,
 )
-from lerobot.utils.transition import move_state_dict_to_device, move_transition_to_device
+from lerobot.utils.transition import move_transition_to_device
 from lerobot.utils.utils import (
     format_big_number,
     get_safe_torch_device,
@@ -315,7 +321,13 @@ def add_actor_information_and_train(
 
     policy.train()
 
-    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+    actor_learner_config = cfg.policy.actor_learner_config
+    parameter_publisher = ParameterPublisher(
+        trainable_only=actor_learner_config.policy_parameters_trainable_only,
+        dtype=actor_learner_config.policy_parameters_dtype,
+        keyframe_frequency=actor_learner_config.policy_parameters_keyframe_frequency,
+    )
+    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy, publisher=parameter_publisher)
 
     last_time_policy_pushed = time.time()
 
@@ -394,9 +406,14 @@ def add_actor_information_and_train(
         for _ in range(utd_ratio - 1):
             # Sample from the iterators
             batch = next(online_iterator)
+            # Read before concatenating the batches, which drops them
+            online_indices, online_write_counts = batch.get("indices"), batch.get("write_counts")
+            offline_indices = offline_write_counts = None
 
             if dataset_repo_id is not None:
                 batch_offline = next(offline_iterator)
+                offline_indices = batch_offline.get("indices")
+                offline_write_counts = batch_offline.get("write_counts")
                 batch = concatenate_batch_transitions(
                     left_batch_transitions=batch, right_batch_transition=batch_offline
                 )
@@ -421,6 +438,7 @@ def add_actor_information_and_train(
                 "done": done,
                 "observation_feature": observation_features,
                 "next_observation_feature": next_observation_features,
+                "weights": batch.get("weights"),
                 "complementary_info": batch["complementary_info"],
             }
 
@@ -436,6 +454,16 @@ def add_actor_information_and_train(
             )
             optimizers["critic"].step()
 
+            update_replay_buffer_priorities(
+                td_errors=critic_output["td_errors"],
+                replay_buffer=replay_buffer,
+                online_indices=online_indices,
+                online_write_counts=online_write_counts,
+                offline_replay_buffer=offline_replay_buffer,
+                offline_indices=offline_indices,
+                offline_write_counts=offline_write_counts,
+            )
+
             # Discrete critic optimization (if available)
             if policy.config.num_discrete_actions is not None:
                 discrete_critic_output = policy.forward(forward_batch, model="discrete_critic")
@@ -452,9 +480,14 @@ def add_actor_information_and_train(
 
         # Sample for the last update in the UTD ratio
         batch = next(online_iterator)
+        # Read before concatenating the batches, which drops them
+        online_indices, online_write_counts = batch.get("indices"), batch.get("write_counts")
+        offline_indices = offline_write_counts = None
 
         if dataset_repo_id is not None:
             batch_offline = next(offline_iterator)
+            offline_indices = batch_offline.get("indices")
+            offline_write_counts = batch_offline.get("write_counts")
             batch = concatenate_batch_transitions(
                 left_batch_transitions=batch, right_batch_transition=batch_offline
             )
@@ -480,6 +513,7 @@ def add_actor_information_and_train(
             "done": done,
             "observation_feature": observation_features,
             "next_observation_feature": next_observation_features,
+            "weights": batch.get("weights"),
         }
 
         critic_output = policy.forward(forward_batch, model="critic")
@@ -492,6 +526,16 @@ def add_actor_information_and_train(
         ).item()
         optimizers["critic"].step()
 
+        update_replay_buffer_priorities(
+            td_errors=critic_output["td_errors"],
+            replay_buffer=replay_buffer,
+            online_indices=online_indices,
+            online_write_counts=online_write_counts,
+            offline_replay_buffer=offline_replay_buffer,
+            offline_indices=offline_indices,
+            offline_write_counts=offline_write_counts,
+        )
+
         # Initialize training info dictionary
         training_infos = {
             "loss_critic": loss_critic.item(),
@@ -550,7 +594,9 @@ def add_actor_information_and_train(
 
         # Push policy to actors if needed
         if time.time() - last_time_policy_pushed > policy_parameters_push_frequency:
-            push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+            push_actor_policy_to_queue(
+                parameters_queue=parameters_queue, policy=policy, publisher=parameter_publisher
+            )
             last_time_policy_pushed = time.time()
 
         # Update target networks (main and discrete)
@@ -952,7 +998,12 @@ def initialize_replay_buffer(
             device=device,
             state_keys=cfg.policy.input_features.keys(),
             storage_device=storage_device,
-            optimize_memory=True,
+            optimize_memory=not cfg.policy.buffer_deduplicate_frames,
+            uint8_images=cfg.policy.buffer_uint8_images,
+            deduplicate_frames=cfg.policy.buffer_deduplicate_frames,
+            prioritized=cfg.policy.buffer_prioritized,
+            priority_alpha=cfg.policy.buffer_priority_alpha,
+            priority_beta=cfg.policy.buffer_priority_beta,
         )
 
     logging.info("Resume training load the online dataset")
@@ -971,7 +1022,12 @@ def initialize_replay_buffer(
         capacity=cfg.policy.online_buffer_capacity,
         device=device,
         state_keys=cfg.policy.input_features.keys(),
-        optimize_memory=True,
+        optimize_memory=not cfg.policy.buffer_deduplicate_frames,
+        uint8_images=cfg.policy.buffer_uint8_images,
+        deduplicate_frames=cfg.policy.buffer_deduplicate_frames,
+        prioritized=cfg.policy.buffer_prioritized,
+        priority_alpha=cfg.policy.buffer_priority_alpha,
+        priority_beta=cfg.policy.buffer_priority_beta,
     )
 
 
@@ -1008,7 +1064,12 @@ def initialize_offline_replay_buffer(
         device=device,
         state_keys=cfg.policy.input_features.keys(),
         storage_device=storage_device,
-        optimize_memory=True,
+        optimize_memory=not cfg.policy.buffer_deduplicate_frames,
+        uint8_images=cfg.policy.buffer_uint8_images,
+        deduplicate_frames=cfg.policy.buffer_deduplicate_frames,
+        prioritized=cfg.policy.buffer_prioritized,
+        priority_alpha=cfg.policy.buffer_priority_alpha,
+        priority_beta=cfg.policy.buffer_priority_beta,
         capacity=cfg.policy.offline_buffer_capacity,
     )
     return offline_replay_buffer
@@ -1044,6 +1105,40 @@ def get_observation_features(
     return observation_features, next_observation_features
 
 
+def update_replay_buffer_priorities(
+    td_errors: torch.Tensor,
+    replay_buffer: ReplayBuffer,
+    online_indices: torch.Tensor | None,
+    online_write_counts: torch.Tensor | None = None,
+    offline_replay_buffer: ReplayBuffer | None = None,
+    offline_indices: torch.Tensor | None = None,
+    offline_write_counts: torch.Tensor | None = None,
+):
+    """
+    Update the priorities of the transitions of a training batch from their TD errors.
+
+    Only the buffers which are prioritized return indices when sampling. The online transitions come first
+    in the batch, followed by the offline ones (see `concatenate_batch_transitions`).
+
+    Args:
+        td_errors: The TD errors of the batch returned by the critic forward
+        replay_buffer: The online replay buffer
+        online_indices: The indices of the online batch, or None if the buffer isn't prioritized
+        online_write_counts: The write counts of the online batch, to skip the overwritten transitions
+        offline_replay_buffer: The offline replay buffer, if any
+        offline_indices: The indices of the offline batch, or None if the buffer isn't prioritized
+        offline_write_counts: The write counts of the offline batch, to skip the overwritten transitions
+    """
+    if online_indices is not None:
+        replay_buffer.update_priorities(
+            online_indices, td_errors[: len(online_indices)], write_counts=online_write_counts
+        )
+    if offline_indices is not None:
+        offline_replay_buffer.update_priorities(
+            offline_indices, td_errors[-len(offline_indices) :], write_counts=offline_write_counts
+        )
+
+
 def use_threads(cfg: TrainRLServerPipelineConfig) -> bool:
     return cfg.policy.concurrency.learner == "threads"
 
@@ -1094,21 +1189,35 @@ def check_nan_in_transition(
     return nan_detected
 
 
-def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
+def get_nan_transitions_mask(batch: BatchTransition) -> torch.Tensor:
+    """
+    Vectorized counterpart of `check_nan_in_transition` for a batch of transitions.
+
+    Args:
+        batch: Transitions stacked along their first dimension
+
+    Returns:
+        torch.Tensor: Boolean mask of the transitions whose state, next state or action contain NaN values
+    """
+    tensors = [*batch["state"].values(), *batch["next_state"].values(), batch[ACTION]]
+    nan_mask = torch.zeros(len(batch[ACTION]), dtype=torch.bool, device=batch[ACTION].device)
+    for tensor in tensors:
+        nan_mask |= torch.isnan(tensor).reshape(len(tensor), -1).any(dim=1)
+    return nan_mask
+
+
+def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module, publisher: ParameterPublisher):
     logging.debug("[LEARNER] Pushing actor policy to the queue")
 
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
+    # Create a dictionary to hold all the modules to synchronize
+    modules = {"policy": policy.actor}
 
     # Add discrete critic if it exists
     if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
+        modules["discrete_critic"] = policy.discrete_critic
         logging.debug("[LEARNER] Including discrete critic in state dict push")
 
-    state_bytes = state_to_bytes(state_dicts)
-    parameters_queue.put(state_bytes)
+    parameters_queue.put(publisher.make_message(modules))
 
 
 def process_interaction_message(
@@ -1147,26 +1256,26 @@ def process_transitions(
     while not transition_queue.empty() and not shutdown_event.is_set():
         transition_list = transition_queue.get()
         transition_list = bytes_to_transitions(buffer=transition_list)
+        if len(transition_list) == 0:
+            continue
+
+        # The whole chunk is stacked, moved and written to the buffers at once
+        batch = move_transition_to_device(transition=stack_transitions(transition_list), device=device)
+
+        # Skip transitions with NaN values
+        nan_mask = get_nan_transitions_mask(batch)
+        if nan_mask.any():
+            logging.warning(f"[LEARNER] NaN detected in {nan_mask.sum().item()} transitions, skipping")
+            batch = select_batch_transitions(batch, ~nan_mask)
+
+        replay_buffer.add_batch(**batch)
 
-        for transition in transition_list:
-            transition = move_transition_to_device(transition=transition, device=device)
-
-            # Skip transitions with NaN values
-            if check_nan_in_transition(
-                observations=transition["state"],
-                actions=transition[ACTION],
-                next_state=transition["next_state"],
-            ):
-                logging.warning("[LEARNER] NaN detected in transition, skipping")
-                continue
-
-            replay_buffer.add(**transition)
-
-            # Add to offline buffer if it's an intervention
-            if dataset_repo_id is not None and transition.get("complementary_info", {}).get(
-                TeleopEvents.IS_INTERVENTION
-            ):
-                offline_replay_buffer.add(**transition)
+        # Add to offline buffer the transitions which are interventions
+        complementary_info = batch.get("complementary_info") or {}
+        if dataset_repo_id is not None and TeleopEvents.IS_INTERVENTION in complementary_info:
+            is_intervention = complementary_info[TeleopEvents.IS_INTERVENTION].bool()
+            if is_intervention.any():
+                offline_replay_buffer.add_batch(**select_batch_transitions(batch, is_intervention))
 
 
 def process_interaction_messages(
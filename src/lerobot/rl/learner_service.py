@@ -19,7 +19,8 @@ import logging
 import time
 from multiprocessing import Event, Queue
 
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.parameter_sync import read_parameters_header
+from lerobot.rl.queue import get_all_items_from_queue
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
 
@@ -49,12 +50,16 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         self.transition_queue = transition_queue
         self.interaction_message_queue = interaction_message_queue
         self.queue_get_timeout = queue_get_timeout
+        # Last parameters keyframe drained from the queue, sent before a delta to streams which missed it
+        self.parameters_keyframe = None
 
     def StreamParameters(self, request, context):  # noqa: N802
         # TODO: authorize the request
         logging.info("[LEARNER] Received request to stream parameters from the Actor")
 
         last_push_time = 0
+        # Header of the last keyframe sent on this stream, which the actor received since streams are ordered
+        sent_keyframe = None
 
         while not self.shutdown_event.is_set():
             time_since_last_push = time.time() - last_push_time
@@ -65,19 +70,38 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
                 continue
 
             logging.info("[LEARNER] Push parameters to the Actor")
-            buffer = get_last_item_from_queue(
+            buffers = get_all_items_from_queue(
                 self.parameters_queue, block=True, timeout=self.queue_get_timeout
             )
 
-            if buffer is None:
+            if len(buffers) == 0:
                 continue
 
-            yield from send_bytes_in_chunks(
-                buffer,
-                services_pb2.Parameters,
-                log_prefix="[LEARNER] Sending parameters",
-                silent=True,
-            )
+            # Only the most recent parameters are sent, but deltas need the keyframe they are relative to
+            for item in buffers:
+                header = read_parameters_header(item)
+                if header is not None and header.is_keyframe:
+                    self.parameters_keyframe = (header, item)
+            buffer = buffers[-1]
+            header = read_parameters_header(buffer)
+
+            to_send = [buffer]
+            if header is not None and header.is_keyframe:
+                sent_keyframe = header
+            elif header is not None and self.parameters_keyframe is not None:
+                keyframe_header, keyframe = self.parameters_keyframe
+                is_base = keyframe_header[:2] == (header.publisher_id, header.base_version)
+                if is_base and sent_keyframe != keyframe_header:
+                    to_send.insert(0, keyframe)
+                    sent_keyframe = keyframe_header
+
+            for item in to_send:
+                yield from send_bytes_in_chunks(
+                    item,
+                    services_pb2.Parameters,
+                    log_prefix="[LEARNER] Sending parameters",
+                    silent=True,
+                )
 
             last_push_time = time.time()
             logging.info("[LEARNER] Parameters sent")
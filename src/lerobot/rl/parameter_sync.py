@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Versioned synchronization of the policy parameters from the learner to the actors.
+
+The learner publishes two kinds of messages, serialized with `tensors_to_bytes`:
+- keyframes, which hold every synchronized tensor,
+- deltas, which hold the difference to the last keyframe of the floating point tensors which changed since
+  that keyframe, in bfloat16 (and the new value of the other tensors which changed).
+
+Deltas are always relative to a keyframe, not to the previous delta, so that actors can skip any number of
+pushes, and so that the rounding errors of the low precision deltas don't accumulate across pushes. A tensor
+which changed since the keyframe is sent in every following delta, even if it went back to its keyframe value,
+as the actors may have loaded an intermediate delta. Every message carries a version, so that actors ignore
+stale pushes, and deltas carry the version of their keyframe, so that actors which missed it wait for the next
+one instead of loading wrong parameters.
+"""
+
+import logging
+import uuid
+from typing import NamedTuple
+
+import torch
+from torch import nn
+
+from lerobot.transport.utils import bytes_to_tensors, bytes_to_tensors_scalars, tensors_to_bytes
+
+PUBLISHER_ID_KEY = "__publisher_id__"
+VERSION_KEY = "__version__"
+BASE_VERSION_KEY = "__base_version__"
+PARAMETERS_DTYPES = ("float16", "bfloat16")
+DELTA_DTYPE = torch.bfloat16
+
+
+class ParametersHeader(NamedTuple):
+    publisher_id: str
+    version: int
+    # Version of the keyframe a delta is relative to, None for keyframes
+    base_version: int | None
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.base_version is None
+
+
+def read_parameters_header(buffer: bytes) -> ParametersHeader | None:
+    """Read the versions of a message created by `ParameterPublisher`, or None for any other buffer."""
+    try:
+        scalars = bytes_to_tensors_scalars(buffer)
+    except ValueError:
+        return None
+    if VERSION_KEY not in scalars:
+        return None
+    return ParametersHeader(scalars[PUBLISHER_ID_KEY], scalars[VERSION_KEY], scalars[BASE_VERSION_KEY])
+
+
+def get_synchronized_tensors(module: nn.Module, trainable_only: bool = False) -> dict[str, torch.Tensor]:
+    """Tensors of a module to synchronize, keyed like its state dict.
+
+    With `trainable_only`, parameters which don't require gradients (e.g. a frozen vision encoder) are left
+    out. Buffers (e.g. normalization statistics) are always kept.
+    """
+    if not trainable_only:
+        return module.state_dict()
+    tensors = {name: param for name, param in module.named_parameters() if param.requires_grad}
+    tensors.update(dict(module.named_buffers()))
+    return tensors
+
+
+class ParameterPublisher:
+    """Learner side of the parameter synchronization, building the messages pushed to the actors.
+
+    Args:
+        trainable_only (bool): Only send the parameters which require gradients, see
+            `get_synchronized_tensors`. The actors must build their policy with the same frozen weights.
+        dtype (str | None): If "float16" or "bfloat16", floating point tensors are sent with this dtype.
+        keyframe_frequency (int): Number of pushes between two keyframes. With 1, every push is a keyframe.
+            Deltas are sent in bfloat16, so they are about half the size of float32 keyframes.
+    """
+
+    def __init__(self, trainable_only: bool = False, dtype: str | None = None, keyframe_frequency: int = 1):
+        if dtype is not None and dtype not in PARAMETERS_DTYPES:
+            raise ValueError(f"dtype must be one of {PARAMETERS_DTYPES} or None, got {dtype}")
+        if keyframe_frequency < 1:
+            raise ValueError(f"keyframe_frequency must be at least 1, got {keyframe_frequency}")
+        self.trainable_only = trainable_only
+        self.dtype = getattr(torch, dtype) if dtype is not None else None
+        self.keyframe_frequency = keyframe_frequency
+
+        # Identifies the learner run, so that actors don't compare versions across learner restarts
+        self.publisher_id = uuid.uuid4().hex
+        self.version = 0
+        self._keyframe_version = None
+        # Last keyframe as the actors decode it, in float32 for floating point tensors
+        self._keyframe: dict[str, torch.Tensor] = {}
+        # Keys of the tensors which changed since the last keyframe
+        self._changed_keys: set[str] = set()
+
+    def make_message(self, modules: dict[str, nn.Module]) -> bytes:
+        """Serialize the tensors of `modules`, e.g. `{"policy": policy.actor}`, as a keyframe or a delta."""
+        tensors = {
+            f"{prefix}/{key}": tensor.detach().to("cpu")
+            for prefix, module in modules.items()
+            for key, tensor in get_synchronized_tensors(module, self.trainable_only).items()
+        }
+
+        self.version += 1
+        is_keyframe = (
+            self._keyframe_version is None
+            or self.version - self._keyframe_version >= self.keyframe_frequency
+            or tensors.keys() != self._keyframe.keys()
+        )
+
+        data = {}
+        for key, tensor in tensors.items():
+            is_float = tensor.is_floating_point()
+            if is_float:
+                tensor = tensor.float()
+            if is_keyframe:
+                data[key] = tensor.to(self.dtype) if is_float and self.dtype is not None else tensor
+                continue
+            # Once changed, a tensor is sent until the next keyframe, as actors may hold any delta since then
+            if key not in self._changed_keys and torch.equal(tensor, self._keyframe[key]):
+                continue
+            self._changed_keys.add(key)
+            data[key] = (tensor - self._keyframe[key]).to(DELTA_DTYPE) if is_float else tensor
+
+        if is_keyframe:
+            self._changed_keys = set()
+            # Copied, since tensors of modules on the cpu are not copied above
+            self._keyframe = {
+                key: value.to(torch.float32 if value.is_floating_point() else value.dtype, copy=True)
+                for key, value in data.items()
+            }
+            self._keyframe_version = self.version
+
+        data[PUBLISHER_ID_KEY] = self.publisher_id
+        data[VERSION_KEY] = self.version
+        data[BASE_VERSION_KEY] = None if is_keyframe else self._keyframe_version
+        return tensors_to_bytes(data)
+
+
+class ParameterSubscriber:
+    """Actor side of the parameter synchronization, loading the messages of a `ParameterPublisher`."""
+
+    def __init__(self):
+        self.publisher_id = None
+        self.version = 0
+        self._keyframe_version = None
+        self._keyframe: dict[str, torch.Tensor] = {}
+
+    def load_message(self, buffer: bytes, modules: dict[str, nn.Module], device: torch.device | str) -> bool:
+        """Load a message into `modules`, returning False if it is skipped (stale or missing its keyframe)."""
+        data = bytes_to_tensors(buffer)
+        header = ParametersHeader(
+            data.pop(PUBLISHER_ID_KEY), data.pop(VERSION_KEY), data.pop(BASE_VERSION_KEY)
+        )
+
+        if header.publisher_id != self.publisher_id:
+            # The learner was restarted, its versions start over
+            self.publisher_id = header.publisher_id
+            self.version = 0
+            self._keyframe_version = None
+            self._keyframe = {}
+
+        if header.version <= self.version:
+            logging.debug(f"[ACTOR] Skip stale parameters v{header.version} (loaded v{self.version})")
+            return False
+
+        if header.is_keyframe:
+            self._keyframe = {
+                key: value.float() if value.is_floating_point() else value for key, value in data.items()
+            }
+            self._keyframe_version = header.version
+            tensors = self._keyframe
+        elif header.base_version != self._keyframe_version:
+            logging.warning(
+                f"[ACTOR] Skip parameters v{header.version}, "
+                f"its keyframe v{header.base_version} was not received"
+            )
+            return False
+        else:
+            tensors = {
+                key: self._keyframe[key] + value.float() if value.is_floating_point() else value
+                for key, value in data.items()
+            }
+
+        for prefix, module in modules.items():
+            state_dict = {
+                key.removeprefix(f"{prefix}/"): value.to(device)
+                for key, value in tensors.items()
+                if key.startswith(f"{prefix}/")
+            }
+            incompatible_keys = module.load_state_dict(state_dict, strict=False)
+            if incompatible_keys.unexpected_keys:
+                raise KeyError(f"Unexpected parameters for '{prefix}': {incompatible_keys.unexpected_keys}")
+
+        self.version = header.version
+        return True
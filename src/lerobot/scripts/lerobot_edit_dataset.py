@@ -18,7 +18,7 @@
 Edit LeRobot datasets using various transformation tools.
 
 This script allows you to delete episodes, split datasets, merge datasets,
-and remove features. When new_repo_id is specified, creates a new dataset.
+remove features and recompute stats. When new_repo_id is specified, creates a new dataset.
 
 Usage Examples:
 
@@ -65,6 +65,12 @@ Remove camera feature:
         --operation.type remove_feature \
         --operation.feature_names "['observation.images.top']"
 
+Recompute stats of all episodes in place, with 8 processes (resumes if interrupted):
+    python -m lerobot.scripts.lerobot_edit_dataset \
+        --repo_id lerobot/pusht \
+        --operation.type recompute_stats \
+        --operation.num_workers 8
+
 Using JSON config file:
     python -m lerobot.scripts.lerobot_edit_dataset \
         --config_path path/to/edit_config.json
@@ -79,10 +85,11 @@ from lerobot.configs import parser
 from lerobot.datasets.dataset_tools import (
     delete_episodes,
     merge_datasets,
+    recompute_stats,
     remove_feature,
     split_dataset,
 )
-from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.lerobot_dataset import LeRobotDataset, LeRobotDatasetMetadata
 from lerobot.utils.constants import HF_LEROBOT_HOME
 from lerobot.utils.utils import init_logging
 
@@ -111,10 +118,19 @@ class RemoveFeatureConfig:
     feature_names: list[str] | None = None
 
 
+@dataclass
+class RecomputeStatsConfig:
+    type: str = "recompute_stats"
+    num_workers: int | None = None
+    histogram_bins: int | None = None
+    video_backend: str | None = None
+    resume: bool = True
+
+
 @dataclass
 class EditDatasetConfig:
     repo_id: str
-    operation: DeleteEpisodesConfig | SplitConfig | MergeConfig | RemoveFeatureConfig
+    operation: DeleteEpisodesConfig | SplitConfig | MergeConfig | RemoveFeatureConfig | RecomputeStatsConfig
     root: str | None = None
     new_repo_id: str | None = None
     push_to_hub: bool = False
@@ -258,6 +274,31 @@ def handle_remove_feature(cfg: EditDatasetConfig) -> None:
         LeRobotDataset(output_repo_id, root=output_dir).push_to_hub()
 
 
+def handle_recompute_stats(cfg: EditDatasetConfig) -> None:
+    if not isinstance(cfg.operation, RecomputeStatsConfig):
+        raise ValueError("Operation config must be RecomputeStatsConfig")
+
+    if cfg.new_repo_id is not None:
+        raise ValueError("recompute_stats edits the dataset in place, new_repo_id is not supported")
+
+    # Only metadata is needed, data files are read directly by the stats workers
+    meta = LeRobotDatasetMetadata(cfg.repo_id, root=cfg.root)
+
+    logging.info(f"Recomputing stats of {meta.total_episodes} episodes of {cfg.repo_id}")
+    recompute_stats(
+        meta,
+        num_workers=cfg.operation.num_workers,
+        histogram_bins=cfg.operation.histogram_bins,
+        video_backend=cfg.operation.video_backend,
+        resume=cfg.operation.resume,
+    )
+    logging.info(f"Stats saved to {meta.root}")
+
+    if cfg.push_to_hub:
+        logging.info(f"Pushing to hub as {cfg.repo_id}")
+        LeRobotDataset(cfg.repo_id, root=meta.root).push_to_hub()
+
+
 @parser.wrap()
 def edit_dataset(cfg: EditDatasetConfig) -> None:
     operation_type = cfg.operation.type
@@ -270,10 +311,12 @@ def edit_dataset(cfg: EditDatasetConfig) -> None:
         handle_merge(cfg)
     elif operation_type == "remove_feature":
         handle_remove_feature(cfg)
+    elif operation_type == "recompute_stats":
+        handle_recompute_stats(cfg)
     else:
         raise ValueError(
             f"Unknown operation type: {operation_type}\n"
-            f"Available operations: delete_episodes, split, merge, remove_feature"
+            f"Available operations: delete_episodes, split, merge, remove_feature, recompute_stats"
         )
 
 
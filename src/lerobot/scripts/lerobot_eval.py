@@ -49,9 +49,11 @@ You can learn about the CLI options for this script in the `EvalPipelineConfig`
 import concurrent.futures as cf
 import json
 import logging
+import queue
 import threading
 import time
-from collections import defaultdict
+import traceback
+from collections import defaultdict, deque
 from collections.abc import Callable
 from contextlib import nullcontext
 from copy import deepcopy
@@ -71,11 +73,13 @@ from tqdm import trange
 
 from lerobot.configs import parser
 from lerobot.configs.eval import EvalPipelineConfig
+from lerobot.envs.configs import EnvConfig
 from lerobot.envs.factory import make_env, make_env_pre_post_processors
 from lerobot.envs.utils import (
     add_envs_task,
     check_env_attributes_and_types,
     close_envs,
+    get_envs_task,
     preprocess_observation,
 )
 from lerobot.policies.factory import make_policy, make_pre_post_processors
@@ -158,6 +162,8 @@ def rollout(
         leave=False,
     )
     check_env_attributes_and_types(env)
+    # Tasks don't change when the environments autoreset, so they are only fetched once.
+    tasks = get_envs_task(env)
     while not np.all(done) and step < max_steps:
         # Numpy array to tensor and changing dictionary keys to LeRobot policy format.
         observation = preprocess_observation(observation)
@@ -165,8 +171,7 @@ def rollout(
             all_observations.append(deepcopy(observation))
 
         # Infer "task" from attributes of environments.
-        # TODO: works with SyncVectorEnv but not AsyncVectorEnv
-        observation = add_envs_task(env, observation)
+        observation = add_envs_task(env, observation, tasks)
 
         # Apply environment-specific preprocessing (e.g., LiberoProcessorStep for LIBERO)
         observation = env_preprocessor(observation)
@@ -449,6 +454,301 @@ def eval_policy(
     return info
 
 
+def _select_batch_rows(batch: dict[str, Any], rows: list[int]) -> dict[str, Any]:
+    """Keeps the given rows of a batched observation (tensors and per-env lists such as "task")."""
+    selected = {}
+    for key, value in batch.items():
+        if isinstance(value, Tensor):
+            selected[key] = value[rows]
+        elif isinstance(value, (list, tuple)):
+            selected[key] = [value[i] for i in rows]
+        else:
+            selected[key] = value
+    return selected
+
+
+def _render_slots(env: gym.vector.VectorEnv, slots: list[int]) -> dict[int, np.ndarray]:
+    """Renders the current frame of the given sub-environments."""
+    if not slots:
+        return {}
+    if isinstance(env, gym.vector.SyncVectorEnv):
+        return {slot: env.envs[slot].render() for slot in slots}
+    # AsyncVectorEnv can only render all the sub-environments at once.
+    frames = env.call("render")
+    return {slot: frames[slot] for slot in slots}
+
+
+def _check_continuous_batching_policy(policy: PreTrainedPolicy) -> None:
+    if not isinstance(policy, PreTrainedPolicy):
+        raise ValueError(
+            f"Policy of type 'PreTrainedPolicy' is expected, but type '{type(policy)}' was provided."
+        )
+    if not policy.supports_action_chunks:
+        raise ValueError(
+            f"Continuous batching plans actions with `predict_action_chunk`, which '{policy.name}' policies "
+            "do not implement. Evaluate them with `--eval.continuous_batching=false`."
+        )
+    if (
+        getattr(policy.config, "n_obs_steps", 1) != 1
+        or getattr(policy.config, "temporal_ensemble_coeff", None) is not None
+    ):
+        raise ValueError(
+            "Continuous batching requires a policy that plans from the current observation only "
+            "(`n_obs_steps=1` and no temporal ensembling)."
+        )
+
+
+def _postprocess_action_chunk(
+    chunk: Tensor, postprocessor: PolicyProcessorPipeline[PolicyAction, PolicyAction]
+) -> Tensor:
+    """Postprocesses a (batch, steps, dim) chunk of actions in a single call and moves it to the CPU."""
+    n_rows, n_steps = chunk.shape[:2]
+    chunk = postprocessor(chunk.reshape(n_rows * n_steps, -1)).reshape(n_rows, n_steps, -1)
+    return chunk.to("cpu")
+
+
+def eval_policy_continuous(
+    env: gym.vector.VectorEnv,
+    policy: PreTrainedPolicy,
+    env_preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    env_postprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    postprocessor: PolicyProcessorPipeline[PolicyAction, PolicyAction],
+    n_episodes: int,
+    max_episodes_rendered: int = 0,
+    videos_dir: Path | None = None,
+    start_seed: int | None = None,
+) -> dict:
+    """Evaluate a policy with continuous batching over the environments of `env`.
+
+    Unlike `eval_policy`, which runs `env.num_envs` episodes in lockstep until the slowest one is done, each
+    environment slot is refilled with the next episode (and the next seed) as soon as its own episode ends,
+    so the batch stays busy until the last `env.num_envs` episodes are running.
+
+    Action chunks are queued per slot: a slot asks the policy for a new chunk (through
+    `policy.predict_action_chunk`) when its queue is empty, and its queue is cleared when its episode ends,
+    which mirrors what `policy.reset()` does for a whole batch. Only the slots that need a new chunk are sent
+    through the policy. This requires a policy that plans from the current observation only, i.e. with
+    `n_obs_steps == 1` and no temporal ensembling.
+
+    Args:
+        env: The batch of environments. It must use `gym.vector.AutoresetMode.SAME_STEP`, as created by
+            `make_env`.
+        policy: The policy.
+        n_episodes: The number of episodes to evaluate.
+        max_episodes_rendered: Maximum number of episodes to render into videos.
+        videos_dir: Where to save rendered videos.
+        start_seed: The seed of the first episode. Episode `i` is seeded with `start_seed + i`. If not
+            provided, the environments are not manually seeded.
+    Returns:
+        Dictionary with metrics regarding the rollouts, in the same format as `eval_policy`.
+    """
+    if max_episodes_rendered > 0 and not videos_dir:
+        raise ValueError("If max_episodes_rendered > 0, videos_dir must be provided.")
+
+    _check_continuous_batching_policy(policy)
+
+    policy.eval()
+    policy.reset()
+    n_action_steps = getattr(policy.config, "n_action_steps", 1)
+
+    def plan_chunks(batch: dict[str, Any]) -> Tensor:
+        batch = preprocessor(batch)
+        with torch.inference_mode():
+            chunk = policy.predict_action_chunk(batch)[:, :n_action_steps]
+        return _postprocess_action_chunk(chunk, postprocessor)
+
+    return _rollout_continuous(
+        env,
+        plan_chunks,
+        env_preprocessor=env_preprocessor,
+        env_postprocessor=env_postprocessor,
+        n_episodes=n_episodes,
+        max_episodes_rendered=max_episodes_rendered,
+        videos_dir=videos_dir,
+        start_seed=start_seed,
+    )
+
+
+def _rollout_continuous(
+    env: gym.vector.VectorEnv,
+    plan_chunks: Callable[[dict[str, Any]], Tensor],
+    *,
+    env_preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    env_postprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    n_episodes: int,
+    max_episodes_rendered: int,
+    videos_dir: Path | None,
+    start_seed: int | None,
+) -> dict:
+    """Runs the continuous-batching loop of `eval_policy_continuous`.
+
+    `plan_chunks` maps a batch of environment observations (after `env_preprocessor`, restricted to the
+    slots that need new actions) to a CPU tensor of postprocessed action chunks of shape (batch, steps, dim).
+    """
+    if env.metadata.get("autoreset_mode") != gym.vector.AutoresetMode.SAME_STEP:
+        raise ValueError("Continuous batching requires a vector env with `AutoresetMode.SAME_STEP`.")
+
+    start = time.time()
+    check_env_attributes_and_types(env)
+
+    num_envs = env.num_envs
+    max_steps = env.call("_max_episode_steps")[0]
+
+    def episode_seed(episode_ix: int) -> int | None:
+        return None if start_seed is None or episode_ix < 0 else start_seed + episode_ix
+
+    # Episode index currently running in each slot, or -1 once there is no episode left for the slot.
+    slot_episode = np.full(num_envs, -1)
+    n_started = min(num_envs, n_episodes)
+    slot_episode[:n_started] = np.arange(n_started)
+    slot_steps = np.zeros(num_envs, dtype=int)
+    slot_sum_reward = np.zeros(num_envs)
+    slot_max_reward = np.full(num_envs, -np.inf)
+    slot_success = np.zeros(num_envs, dtype=bool)
+    action_queues: list[deque[Tensor]] = [deque() for _ in range(num_envs)]
+    slot_frames: list[list[np.ndarray]] = [[] for _ in range(num_envs)]
+
+    sum_rewards: list[float] = [0.0] * n_episodes
+    max_rewards: list[float] = [0.0] * n_episodes
+    all_successes: list[bool] = [False] * n_episodes
+    threads = []  # for video saving threads
+    video_paths: dict[int, str] = {}
+
+    def render_slots(slots) -> None:
+        slots = [slot for slot in slots if 0 <= slot_episode[slot] < max_episodes_rendered]
+        for slot, frame in _render_slots(env, slots).items():
+            slot_frames[slot].append(frame)
+
+    observation, info = env.reset(seed=[episode_seed(ep) for ep in slot_episode.tolist()])
+    render_slots(range(num_envs))
+    # Tasks don't change when the environments are reset, so they are only fetched once.
+    tasks = get_envs_task(env)
+
+    finished_successes: list[bool] = []
+    # we dont want progress bar when we use slurm, since it clutters the logs
+    progbar = trange(n_episodes, desc="Running continuous eval episodes", disable=inside_slurm())
+    while len(finished_successes) < n_episodes:
+        active = np.flatnonzero(slot_episode >= 0).tolist()
+
+        # Query the policy only for the slots that ran out of actions.
+        to_plan = [slot for slot in active if len(action_queues[slot]) == 0]
+        if to_plan:
+            batch = preprocess_observation(observation)
+            batch = add_envs_task(env, batch, tasks)
+            batch = env_preprocessor(batch)
+            if len(to_plan) < num_envs:
+                batch = _select_batch_rows(batch, to_plan)
+            chunk = plan_chunks(batch)
+            for row, slot in enumerate(to_plan):
+                action_queues[slot].extend(chunk[row])
+
+        # Slots without an episode left to run keep stepping with a zero action; their results are ignored.
+        slot_actions = {slot: action_queues[slot].popleft() for slot in active}
+        template = next(iter(slot_actions.values()))
+        action = torch.stack([slot_actions.get(slot, torch.zeros_like(template)) for slot in range(num_envs)])
+        action = env_postprocessor({ACTION: action})[ACTION]
+        action_numpy: np.ndarray = action.to("cpu").numpy()
+        assert action_numpy.ndim == 2, "Action dimensions should be (batch, action_dim)"
+
+        observation, reward, terminated, truncated, info = env.step(action_numpy)
+
+        env_done = terminated | truncated
+        slot_steps += 1
+        done = env_done | (slot_steps >= max_steps)
+        if "final_info" in info:
+            successes = np.asarray(info["final_info"].get("is_success", np.zeros(num_envs)), dtype=bool)
+        else:
+            successes = np.zeros(num_envs, dtype=bool)
+        slot_sum_reward += reward
+        slot_max_reward = np.maximum(slot_max_reward, reward)
+        slot_success |= successes & env_done
+
+        # With SAME_STEP autoreset, the frame rendered after a terminal step already shows the next episode.
+        render_slots([slot for slot in active if not done[slot]])
+
+        finished = [slot for slot in active if done[slot]]
+        reset_mask = np.zeros(num_envs, dtype=bool)
+        for slot in finished:
+            episode_ix = int(slot_episode[slot])
+            sum_rewards[episode_ix] = float(slot_sum_reward[slot])
+            max_rewards[episode_ix] = float(slot_max_reward[slot])
+            all_successes[episode_ix] = bool(slot_success[slot])
+            finished_successes.append(all_successes[episode_ix])
+
+            if slot_frames[slot]:
+                videos_dir.mkdir(parents=True, exist_ok=True)
+                video_path = videos_dir / f"eval_episode_{episode_ix}.mp4"
+                video_paths[episode_ix] = str(video_path)
+                thread = threading.Thread(
+                    target=write_video,
+                    args=(str(video_path), np.stack(slot_frames[slot]), env.unwrapped.metadata["render_fps"]),
+                )
+                thread.start()
+                threads.append(thread)
+                slot_frames[slot] = []
+
+            # Per-slot equivalent of `policy.reset()`: the next episode in this slot starts with a fresh plan.
+            action_queues[slot].clear()
+            slot_steps[slot] = 0
+            slot_sum_reward[slot] = 0.0
+            slot_max_reward[slot] = -np.inf
+            slot_success[slot] = False
+            if n_started < n_episodes:
+                slot_episode[slot] = n_started
+                n_started += 1
+                # The env already reset itself unless the episode was cut at `max_steps`, but it must be
+                # reset again to be seeded with the seed of the new episode.
+                reset_mask[slot] = start_seed is not None or not env_done[slot]
+            else:
+                slot_episode[slot] = -1
+
+            progbar.update()
+
+        if reset_mask.any():
+            observation, info = env.reset(
+                seed=[
+                    episode_seed(ep) if reset else None
+                    for ep, reset in zip(slot_episode.tolist(), reset_mask, strict=True)
+                ],
+                options={"reset_mask": reset_mask},
+            )
+        render_slots([slot for slot in finished if slot_episode[slot] >= 0])
+
+        if finished:
+            progbar.set_postfix({"running_success_rate": f"{np.mean(finished_successes).item() * 100:.1f}%"})
+
+    # Wait till all video rendering threads are done.
+    for thread in threads:
+        thread.join()
+
+    # Compile eval info.
+    info = {
+        "per_episode": [
+            {
+                "episode_ix": i,
+                "sum_reward": sum_rewards[i],
+                "max_reward": max_rewards[i],
+                "success": all_successes[i],
+                "seed": episode_seed(i),
+            }
+            for i in range(n_episodes)
+        ],
+        "aggregated": {
+            "avg_sum_reward": float(np.nanmean(sum_rewards)),
+            "avg_max_reward": float(np.nanmean(max_rewards)),
+            "pc_success": float(np.nanmean(all_successes) * 100),
+            "eval_s": time.time() - start,
+            "eval_ep_s": (time.time() - start) / n_episodes,
+        },
+    }
+
+    if max_episodes_rendered > 0:
+        info["video_paths"] = [video_paths[ep] for ep in sorted(video_paths)]
+
+    return info
+
+
 def _compile_episode_data(
     rollout_data: dict, done_indices: Tensor, start_episode_index: int, start_data_index: int, fps: float
 ) -> dict:
@@ -507,8 +807,10 @@ def eval_main(cfg: EvalPipelineConfig):
 
     logging.info(colored("Output dir:", "yellow", attrs=["bold"]) + f" {cfg.output_dir}")
 
-    logging.info("Making environment.")
-    envs = make_env(cfg.env, n_envs=cfg.eval.batch_size, use_async_envs=cfg.eval.use_async_envs)
+    envs = None
+    if cfg.eval.num_workers == 0:
+        logging.info("Making environment.")
+        envs = make_env(cfg.env, n_envs=cfg.eval.batch_size, use_async_envs=cfg.eval.use_async_envs)
 
     logging.info("Making policy.")
 
@@ -536,19 +838,37 @@ def eval_main(cfg: EvalPipelineConfig):
     env_preprocessor, env_postprocessor = make_env_pre_post_processors(env_cfg=cfg.env)
 
     with torch.no_grad(), torch.autocast(device_type=device.type) if cfg.policy.use_amp else nullcontext():
-        info = eval_policy_all(
-            envs=envs,
-            policy=policy,
-            env_preprocessor=env_preprocessor,
-            env_postprocessor=env_postprocessor,
-            preprocessor=preprocessor,
-            postprocessor=postprocessor,
-            n_episodes=cfg.eval.n_episodes,
-            max_episodes_rendered=10,
-            videos_dir=Path(cfg.output_dir) / "videos",
-            start_seed=cfg.seed,
-            max_parallel_tasks=cfg.env.max_parallel_tasks,
-        )
+        if cfg.eval.num_workers > 0:
+            info = eval_policy_all_multiprocess(
+                env_cfg=cfg.env,
+                policy=policy,
+                env_preprocessor=env_preprocessor,
+                env_postprocessor=env_postprocessor,
+                preprocessor=preprocessor,
+                postprocessor=postprocessor,
+                n_episodes=cfg.eval.n_episodes,
+                n_envs=cfg.eval.batch_size,
+                num_workers=cfg.eval.num_workers,
+                use_async_envs=cfg.eval.use_async_envs,
+                max_episodes_rendered=10,
+                videos_dir=Path(cfg.output_dir) / "videos",
+                start_seed=cfg.seed,
+            )
+        else:
+            info = eval_policy_all(
+                envs=envs,
+                policy=policy,
+                env_preprocessor=env_preprocessor,
+                env_postprocessor=env_postprocessor,
+                preprocessor=preprocessor,
+                postprocessor=postprocessor,
+                n_episodes=cfg.eval.n_episodes,
+                max_episodes_rendered=10,
+                videos_dir=Path(cfg.output_dir) / "videos",
+                start_seed=cfg.seed,
+                max_parallel_tasks=cfg.env.max_parallel_tasks,
+                continuous_batching=cfg.eval.continuous_batching,
+            )
         print("Overall Aggregated Metrics:")
         print(info["overall"])
 
@@ -557,7 +877,8 @@ def eval_main(cfg: EvalPipelineConfig):
             print(f"\nAggregated Metrics for {task_group}:")
             print(task_group_info)
     # Close all vec envs
-    close_envs(envs)
+    if envs is not None:
+        close_envs(envs)
 
     # Save info
     with open(Path(cfg.output_dir) / "eval_info.json", "w") as f:
@@ -590,25 +911,46 @@ def eval_one(
     videos_dir: Path | None,
     return_episode_data: bool,
     start_seed: int | None,
+    continuous_batching: bool = False,
 ) -> TaskMetrics:
     """Evaluates one task_id of one suite using the provided vec env."""
 
     task_videos_dir = videos_dir
 
-    task_result = eval_policy(
-        env=env,
-        policy=policy,
-        env_preprocessor=env_preprocessor,
-        env_postprocessor=env_postprocessor,
-        preprocessor=preprocessor,
-        postprocessor=postprocessor,
-        n_episodes=n_episodes,
-        max_episodes_rendered=max_episodes_rendered,
-        videos_dir=task_videos_dir,
-        return_episode_data=return_episode_data,
-        start_seed=start_seed,
-    )
+    if continuous_batching:
+        if return_episode_data:
+            raise ValueError("`return_episode_data` is not supported with continuous batching.")
+        task_result = eval_policy_continuous(
+            env=env,
+            policy=policy,
+            env_preprocessor=env_preprocessor,
+            env_postprocessor=env_postprocessor,
+            preprocessor=preprocessor,
+            postprocessor=postprocessor,
+            n_episodes=n_episodes,
+            max_episodes_rendered=max_episodes_rendered,
+            videos_dir=task_videos_dir,
+            start_seed=start_seed,
+        )
+    else:
+        task_result = eval_policy(
+            env=env,
+            policy=policy,
+            env_preprocessor=env_preprocessor,
+            env_postprocessor=env_postprocessor,
+            preprocessor=preprocessor,
+            postprocessor=postprocessor,
+            n_episodes=n_episodes,
+            max_episodes_rendered=max_episodes_rendered,
+            videos_dir=task_videos_dir,
+            return_episode_data=return_episode_data,
+            start_seed=start_seed,
+        )
+
+    return _to_task_metrics(task_result)
 
+
+def _to_task_metrics(task_result: dict) -> TaskMetrics:
     per_episode = task_result["per_episode"]
     return TaskMetrics(
         sum_rewards=[ep["sum_reward"] for ep in per_episode],
@@ -633,6 +975,7 @@ def run_one(
     videos_dir: Path | None,
     return_episode_data: bool,
     start_seed: int | None,
+    continuous_batching: bool = False,
 ):
     """
     Run eval_one for a single (task_group, task_id, env).
@@ -657,6 +1000,7 @@ def run_one(
         videos_dir=task_videos_dir,
         return_episode_data=return_episode_data,
         start_seed=start_seed,
+        continuous_batching=continuous_batching,
     )
     # ensure we always provide video_paths key to simplify accumulation
     if max_episodes_rendered > 0:
@@ -664,6 +1008,75 @@ def run_one(
     return task_group, task_id, metrics
 
 
+def _aggregate_task_metrics(per_task_infos: list[dict], start_t: float) -> dict:
+    """Accumulates per-task metrics into the per-group and overall metrics returned by `eval_policy_all`."""
+    # accumulators: track metrics at both per-group level and across all groups
+    group_acc: dict[str, dict[str, list]] = defaultdict(lambda: {k: [] for k in ACC_KEYS})
+    overall: dict[str, list] = {k: [] for k in ACC_KEYS}
+
+    # small inline helper to accumulate one task's metrics into accumulators
+    def _accumulate_to(group: str, metrics: dict):
+        # metrics expected to contain 'sum_rewards', 'max_rewards', 'successes', optionally 'video_paths'
+        # but eval_one may store per-episode lists; we assume metrics uses scalars averaged per task as before.
+        # To be robust, accept scalars or lists.
+        def _append(key, value):
+            if value is None:
+                return
+            if isinstance(value, list):
+                group_acc[group][key].extend(value)
+                overall[key].extend(value)
+            else:
+                group_acc[group][key].append(value)
+                overall[key].append(value)
+
+        _append("sum_rewards", metrics.get("sum_rewards"))
+        _append("max_rewards", metrics.get("max_rewards"))
+        _append("successes", metrics.get("successes"))
+        # video_paths is list-like
+        paths = metrics.get("video_paths", [])
+        if paths:
+            group_acc[group]["video_paths"].extend(paths)
+            overall["video_paths"].extend(paths)
+
+    for task_info in per_task_infos:
+        _accumulate_to(task_info["task_group"], task_info["metrics"])
+
+    # compute aggregated metrics helper (robust to lists/scalars)
+    def _agg_from_list(xs):
+        if not xs:
+            return float("nan")
+        arr = np.array(xs, dtype=float)
+        return float(np.nanmean(arr))
+
+    # compute per-group aggregates
+    groups_aggregated = {}
+    for group, acc in group_acc.items():
+        groups_aggregated[group] = {
+            "avg_sum_reward": _agg_from_list(acc["sum_rewards"]),
+            "avg_max_reward": _agg_from_list(acc["max_rewards"]),
+            "pc_success": _agg_from_list(acc["successes"]) * 100 if acc["successes"] else float("nan"),
+            "n_episodes": len(acc["sum_rewards"]),
+            "video_paths": list(acc["video_paths"]),
+        }
+
+    # overall aggregates
+    overall_agg = {
+        "avg_sum_reward": _agg_from_list(overall["sum_rewards"]),
+        "avg_max_reward": _agg_from_list(overall["max_rewards"]),
+        "pc_success": _agg_from_list(overall["successes"]) * 100 if overall["successes"] else float("nan"),
+        "n_episodes": len(overall["sum_rewards"]),
+        "eval_s": time.time() - start_t,
+        "eval_ep_s": (time.time() - start_t) / max(1, len(overall["sum_rewards"])),
+        "video_paths": list(overall["video_paths"]),
+    }
+
+    return {
+        "per_task": per_task_infos,
+        "per_group": groups_aggregated,
+        "overall": overall_agg,
+    }
+
+
 def eval_policy_all(
     envs: dict[str, dict[int, gym.vector.VectorEnv]],
     policy,
@@ -678,6 +1091,7 @@ def eval_policy_all(
     return_episode_data: bool = False,
     start_seed: int | None = None,
     max_parallel_tasks: int = 1,
+    continuous_batching: bool = False,
 ) -> dict:
     """
     Evaluate a nested `envs` dict: {task_group: {task_id: vec_env}}.
@@ -691,35 +1105,8 @@ def eval_policy_all(
     # Flatten envs into list of (task_group, task_id, env)
     tasks = [(tg, tid, vec) for tg, group in envs.items() for tid, vec in group.items()]
 
-    # accumulators: track metrics at both per-group level and across all groups
-    group_acc: dict[str, dict[str, list]] = defaultdict(lambda: {k: [] for k in ACC_KEYS})
-    overall: dict[str, list] = {k: [] for k in ACC_KEYS}
     per_task_infos: list[dict] = []
 
-    # small inline helper to accumulate one task's metrics into accumulators
-    def _accumulate_to(group: str, metrics: dict):
-        # metrics expected to contain 'sum_rewards', 'max_rewards', 'successes', optionally 'video_paths'
-        # but eval_one may store per-episode lists; we assume metrics uses scalars averaged per task as before.
-        # To be robust, accept scalars or lists.
-        def _append(key, value):
-            if value is None:
-                return
-            if isinstance(value, list):
-                group_acc[group][key].extend(value)
-                overall[key].extend(value)
-            else:
-                group_acc[group][key].append(value)
-                overall[key].append(value)
-
-        _append("sum_rewards", metrics.get("sum_rewards"))
-        _append("max_rewards", metrics.get("max_rewards"))
-        _append("successes", metrics.get("successes"))
-        # video_paths is list-like
-        paths = metrics.get("video_paths", [])
-        if paths:
-            group_acc[group]["video_paths"].extend(paths)
-            overall["video_paths"].extend(paths)
-
     # Choose runner (sequential vs threaded)
     task_runner = partial(
         run_one,
@@ -733,6 +1120,7 @@ def eval_policy_all(
         videos_dir=videos_dir,
         return_episode_data=return_episode_data,
         start_seed=start_seed,
+        continuous_batching=continuous_batching,
     )
 
     if max_parallel_tasks <= 1:
@@ -740,7 +1128,6 @@ def eval_policy_all(
         # NOTE: keeping a single-threaded accumulator avoids concurrent list appends or locks
         for task_group, task_id, env in tasks:
             tg, tid, metrics = task_runner(task_group, task_id, env)
-            _accumulate_to(tg, metrics)
             per_task_infos.append({"task_group": tg, "task_id": tid, "metrics": metrics})
     else:
         # threaded path: submit all tasks, consume completions on main thread and accumulate there
@@ -751,43 +1138,213 @@ def eval_policy_all(
                 fut2meta[fut] = (task_group, task_id)
             for fut in cf.as_completed(fut2meta):
                 tg, tid, metrics = fut.result()
-                _accumulate_to(tg, metrics)
                 per_task_infos.append({"task_group": tg, "task_id": tid, "metrics": metrics})
 
-    # compute aggregated metrics helper (robust to lists/scalars)
-    def _agg_from_list(xs):
-        if not xs:
-            return float("nan")
-        arr = np.array(xs, dtype=float)
-        return float(np.nanmean(arr))
+    return _aggregate_task_metrics(per_task_infos, start_t)
 
-    # compute per-group aggregates
-    groups_aggregated = {}
-    for group, acc in group_acc.items():
-        groups_aggregated[group] = {
-            "avg_sum_reward": _agg_from_list(acc["sum_rewards"]),
-            "avg_max_reward": _agg_from_list(acc["max_rewards"]),
-            "pc_success": _agg_from_list(acc["successes"]) * 100 if acc["successes"] else float("nan"),
-            "n_episodes": len(acc["sum_rewards"]),
-            "video_paths": list(acc["video_paths"]),
-        }
 
-    # overall aggregates
-    overall_agg = {
-        "avg_sum_reward": _agg_from_list(overall["sum_rewards"]),
-        "avg_max_reward": _agg_from_list(overall["max_rewards"]),
-        "pc_success": _agg_from_list(overall["successes"]) * 100 if overall["successes"] else float("nan"),
-        "n_episodes": len(overall["sum_rewards"]),
-        "eval_s": time.time() - start_t,
-        "eval_ep_s": (time.time() - start_t) / max(1, len(overall["sum_rewards"])),
-        "video_paths": list(overall["video_paths"]),
-    }
+# Messages sent by the evaluation workers to the inference process of `eval_policy_all_multiprocess`.
+_PLAN_REQUEST = "plan"
+_TASK_RESULT = "task"
+_WORKER_ERROR = "error"
+_WORKER_DONE = "done"
 
-    return {
-        "per_task": per_task_infos,
-        "per_group": groups_aggregated,
-        "overall": overall_agg,
-    }
+
+def _batch_size(batch: dict[str, Any]) -> int:
+    for value in batch.values():
+        if isinstance(value, (Tensor, list, tuple)):
+            return len(value)
+    raise ValueError("Cannot infer the batch size of a batch without tensors or lists.")
+
+
+def _batch_signature(batch: dict[str, Any]) -> tuple:
+    """Batches can only be concatenated when they have the same keys and per-row tensor shapes."""
+    return tuple(
+        (key, tuple(value.shape[1:]), value.dtype) if isinstance(value, Tensor) else (key,)
+        for key, value in sorted(batch.items())
+    )
+
+
+def _concatenate_batches(batches: list[dict[str, Any]]) -> dict[str, Any]:
+    concatenated = {}
+    for key, value in batches[0].items():
+        if isinstance(value, Tensor):
+            concatenated[key] = torch.cat([batch[key] for batch in batches])
+        elif isinstance(value, (list, tuple)):
+            concatenated[key] = [item for batch in batches for item in batch[key]]
+        else:
+            concatenated[key] = value
+    return concatenated
+
+
+def _eval_worker(
+    worker_id: int,
+    num_workers: int,
+    env_cfg: EnvConfig,
+    n_envs: int,
+    use_async_envs: bool,
+    env_preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    env_postprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    n_episodes: int,
+    max_episodes_rendered: int,
+    videos_dir: Path | None,
+    start_seed: int | None,
+    request_queue,
+    response_queue,
+) -> None:
+    """Evaluates every `num_workers`-th task of `env_cfg` in a worker process of `eval_policy_all_multiprocess`.
+
+    The worker builds its own envs and runs the continuous-batching loop of `eval_policy_continuous`, sending
+    the observations of the slots that need new actions to the inference process and waiting for the chunks.
+    """
+    envs = {}
+    try:
+        # Only the envs of this worker's shard of tasks are built.
+        envs = make_env(
+            env_cfg, n_envs=n_envs, use_async_envs=use_async_envs, task_shard=(worker_id, num_workers)
+        )
+        tasks = [(tg, tid) for tg, group in envs.items() for tid in group]
+
+        def plan_chunks(batch: dict[str, Any]) -> Tensor:
+            request_queue.put((_PLAN_REQUEST, worker_id, batch))
+            return response_queue.get()
+
+        for task_group, task_id in tasks:
+            task_videos_dir = None
+            if videos_dir is not None:
+                task_videos_dir = videos_dir / f"{task_group}_{task_id}"
+                task_videos_dir.mkdir(parents=True, exist_ok=True)
+
+            task_result = _rollout_continuous(
+                envs[task_group][task_id],
+                plan_chunks,
+                env_preprocessor=env_preprocessor,
+                env_postprocessor=env_postprocessor,
+                n_episodes=n_episodes,
+                max_episodes_rendered=max_episodes_rendered,
+                videos_dir=task_videos_dir,
+                start_seed=start_seed,
+            )
+            metrics = _to_task_metrics(task_result)
+            request_queue.put((_TASK_RESULT, worker_id, (task_group, task_id, metrics)))
+            envs[task_group][task_id].close()
+        request_queue.put((_WORKER_DONE, worker_id, None))
+    except Exception:
+        request_queue.put((_WORKER_ERROR, worker_id, traceback.format_exc()))
+        close_envs(envs)
+
+
+def eval_policy_all_multiprocess(
+    env_cfg: EnvConfig,
+    policy: PreTrainedPolicy,
+    env_preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    env_postprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+    postprocessor: PolicyProcessorPipeline[PolicyAction, PolicyAction],
+    n_episodes: int,
+    *,
+    n_envs: int,
+    num_workers: int,
+    use_async_envs: bool = False,
+    max_episodes_rendered: int = 0,
+    videos_dir: Path | None = None,
+    start_seed: int | None = None,
+) -> dict:
+    """
+    Evaluate all the tasks of `env_cfg` across `num_workers` worker processes.
+    Each worker only builds the envs of every `num_workers`-th task with `make_env(..., task_shard=...)`
+    and steps them with continuous batching (see `eval_policy_continuous`), so simulator
+    stepping scales with cores instead of being bound by the GIL. Policy inference stays in this process:
+    the planning requests that are pending from all workers are concatenated into a single batch, and the
+    observations and action chunks are exchanged through `torch.multiprocessing` queues, which move tensors
+    through shared memory.
+    Returns the same metrics schema as `eval_policy_all`.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` must be at least 1, got {num_workers}.")
+    if max_episodes_rendered > 0 and not videos_dir:
+        raise ValueError("If max_episodes_rendered > 0, videos_dir must be provided.")
+    _check_continuous_batching_policy(policy)
+
+    start_t = time.time()
+    policy.eval()
+    policy.reset()
+    n_action_steps = getattr(policy.config, "n_action_steps", 1)
+
+    ctx = torch.multiprocessing.get_context("spawn")
+    request_queue = ctx.Queue()
+    response_queues = [ctx.Queue() for _ in range(num_workers)]
+    workers = [
+        # Not daemonic, so that workers can start the processes of an AsyncVectorEnv.
+        ctx.Process(
+            target=_eval_worker,
+            args=(
+                worker_id,
+                num_workers,
+                env_cfg,
+                n_envs,
+                use_async_envs,
+                env_preprocessor,
+                env_postprocessor,
+                n_episodes,
+                max_episodes_rendered,
+                videos_dir,
+                start_seed,
+                request_queue,
+                response_queues[worker_id],
+            ),
+        )
+        for worker_id in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    per_task_infos: list[dict] = []
+    n_running = num_workers
+    try:
+        while n_running > 0:
+            try:
+                messages = [request_queue.get(timeout=1.0)]
+            except queue.Empty:
+                dead = [i for i, worker in enumerate(workers) if worker.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"Evaluation workers {dead} exited unexpectedly.") from None
+                continue
+            # Serve every planning request that is already waiting in a single policy call.
+            while True:
+                try:
+                    messages.append(request_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            plan_requests = defaultdict(list)
+            for kind, worker_id, payload in messages:
+                if kind == _PLAN_REQUEST:
+                    plan_requests[_batch_signature(payload)].append((worker_id, payload))
+                elif kind == _TASK_RESULT:
+                    task_group, task_id, metrics = payload
+                    per_task_infos.append({"task_group": task_group, "task_id": task_id, "metrics": metrics})
+                elif kind == _WORKER_ERROR:
+                    raise RuntimeError(f"Evaluation worker {worker_id} failed:\n{payload}")
+                elif kind == _WORKER_DONE:
+                    n_running -= 1
+
+            for requests in plan_requests.values():
+                batch = preprocessor(_concatenate_batches([payload for _, payload in requests]))
+                with torch.inference_mode():
+                    chunk = policy.predict_action_chunk(batch)[:, :n_action_steps]
+                chunks = _postprocess_action_chunk(chunk, postprocessor).split(
+                    [_batch_size(payload) for _, payload in requests]
+                )
+                for (worker_id, _), worker_chunk in zip(requests, chunks, strict=True):
+                    response_queues[worker_id].put(worker_chunk.clone())
+    finally:
+        for worker in workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+
+    return _aggregate_task_metrics(per_task_infos, start_t)
 
 
 def main():
@@ -164,6 +164,14 @@ class DatasetRecordConfig:
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Encode camera frames into videos while recording, without writing them as PNG images first.
+    # Not compatible with `video_encoding_batch_size` > 1.
+    streaming_encoding: bool = False
+    # Number of processes encoding videos in parallel across cameras and episodes. Defaults to one per camera.
+    num_video_encoding_workers: int | None = None
+    # Number of bins of the histogram sketches saved with episode stats, which give accurate quantiles when
+    # stats are aggregated or datasets merged (e.g. 512). Disabled by default.
+    stats_histogram_bins: int | None = None
     # Rename map for the observation to override the image and state keys
     rename_map: dict[str, str] = field(default_factory=dict)
 
@@ -401,6 +409,9 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             cfg.dataset.repo_id,
             root=cfg.dataset.root,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
+            stats_histogram_bins=cfg.dataset.stats_histogram_bins,
         )
 
         if hasattr(robot, "cameras") and len(robot.cameras) > 0:
@@ -422,6 +433,9 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             image_writer_processes=cfg.dataset.num_image_writer_processes,
             image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
+            stats_histogram_bins=cfg.dataset.stats_histogram_bins,
         )
 
     # Load pretrained policy
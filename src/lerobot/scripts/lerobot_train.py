@@ -34,6 +34,7 @@ from lerobot.envs.utils import close_envs
 from lerobot.optim.factory import make_optimizer_and_scheduler
 from lerobot.policies.factory import make_policy, make_pre_post_processors
 from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.processor import DeviceProcessorStep, ImageToFloatProcessorStep
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.scripts.lerobot_eval import eval_policy_all
 from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
@@ -243,6 +244,18 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         **postprocessor_kwargs,
     )
 
+    if cfg.dataset.return_uint8_images and not any(
+        isinstance(step, ImageToFloatProcessorStep) for step in preprocessor.steps
+    ):
+        # Convert the uint8 frames returned by the dataset right after they are moved to the device
+        device_step_idx = next(
+            (i for i, step in enumerate(preprocessor.steps) if isinstance(step, DeviceProcessorStep)), -1
+        )
+        float_dtype = preprocessor.steps[device_step_idx].float_dtype if device_step_idx >= 0 else None
+        preprocessor.steps.insert(
+            device_step_idx + 1, ImageToFloatProcessorStep(float_dtype=float_dtype or "float32")
+        )
+
     if is_main_process:
         logging.info("Creating optimizer and scheduler")
     optimizer, lr_scheduler = make_optimizer_and_scheduler(cfg, policy)
@@ -271,14 +284,15 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         logging.info(f"{num_total_params=} ({format_big_number(num_total_params)})")
 
     # create dataloader for offline training
-    if hasattr(cfg.policy, "drop_n_last_frames"):
+    if hasattr(cfg.policy, "drop_n_last_frames") or cfg.dataset.sampler_block_size is not None:
         shuffle = False
         sampler = EpisodeAwareSampler(
             dataset.meta.episodes["dataset_from_index"],
             dataset.meta.episodes["dataset_to_index"],
             episode_indices_to_use=dataset.episodes,
-            drop_n_last_frames=cfg.policy.drop_n_last_frames,
+            drop_n_last_frames=getattr(cfg.policy, "drop_n_last_frames", 0),
             shuffle=True,
+            block_size=cfg.dataset.sampler_block_size,
         )
     else:
         shuffle = True
@@ -396,6 +410,7 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
                         max_episodes_rendered=4,
                         start_seed=cfg.seed,
                         max_parallel_tasks=cfg.env.max_parallel_tasks,
+                        continuous_batching=cfg.eval.continuous_batching,
                     )
                 # overall metrics (suite-agnostic)
                 aggregated = eval_info["overall"]
@@ -19,11 +19,14 @@ import io
 import json
 import logging
 import pickle  # nosec B403: Safe usage for internal serialization only
+import struct
 from multiprocessing import Event
 from queue import Queue
 from typing import Any
 
+import numpy as np
 import torch
+from PIL import Image
 
 from lerobot.transport import services_pb2
 from lerobot.utils.transition import Transition
@@ -31,6 +34,10 @@ from lerobot.utils.transition import Transition
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
 
+# Tensor wire format: magic | header length (uint32, little endian) | JSON header | raw buffers
+TENSOR_FORMAT_MAGIC = b"LRT1"
+IMAGE_COMPRESSIONS = ("jpeg", "png")
+
 
 def bytes_buffer_size(buffer: io.BytesIO) -> int:
     buffer.seek(0, io.SEEK_END)
@@ -147,6 +154,161 @@ def transitions_to_bytes(transitions: list[Transition]) -> bytes:
     return buffer.getvalue()
 
 
+def _dtype_name(dtype: torch.dtype | np.dtype) -> str:
+    return str(dtype).removeprefix("torch.")
+
+
+def _is_image_array(array: torch.Tensor | np.ndarray) -> bool:
+    """Whether an array looks like a HWC uint8 camera frame that can go through an image codec."""
+    return _dtype_name(array.dtype) == "uint8" and array.ndim == 3 and array.shape[-1] in (1, 3)
+
+
+def _encode_image(array: np.ndarray, image_compression: str, jpeg_quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image = Image.fromarray(array[..., 0] if array.shape[-1] == 1 else array)
+    if image_compression == "jpeg":
+        image.save(buffer, format="JPEG", quality=jpeg_quality)
+    else:
+        image.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def _decode_image(buffer: memoryview, shape: list[int]) -> np.ndarray:
+    array = np.array(Image.open(io.BytesIO(buffer)))
+    return array.reshape(shape)
+
+
+def tensors_to_bytes(
+    data: dict[str, Any],
+    image_compression: str | None = None,
+    jpeg_quality: int = 90,
+    use_float16: bool = False,
+) -> bytes:
+    """Serialize a flat dict of tensors, arrays and scalars into a compact binary message.
+
+    The message is a JSON header describing every entry (key, dtype, shape, encoding and byte range)
+    followed by the raw contiguous buffers, so that decoding never goes through pickle and large arrays
+    are copied exactly once.
+
+    Args:
+        data: Flat dictionary. Values can be `torch.Tensor`, `np.ndarray`, or JSON serializable scalars
+            (str, int, float, bool, None), which are stored in the header.
+        image_compression: If "jpeg" or "png", HWC uint8 arrays/tensors with 1 or 3 channels are
+            compressed with the given codec. "jpeg" is lossy.
+        jpeg_quality: JPEG quality used when `image_compression="jpeg"`.
+        use_float16: If True, floating point arrays are sent as float16 and cast back to their original
+            dtype on decoding.
+
+    Returns:
+        The serialized message, to be decoded with `bytes_to_tensors`.
+    """
+    if image_compression is not None and image_compression not in IMAGE_COMPRESSIONS:
+        raise ValueError(
+            f"image_compression must be one of {IMAGE_COMPRESSIONS} or None, got {image_compression}"
+        )
+
+    entries = []
+    buffers = []
+    offset = 0
+    for key, value in data.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or isinstance(value, (str, int, float, bool)):
+            entries.append({"key": key, "encoding": "json", "value": value})
+            continue
+        if not isinstance(value, (torch.Tensor, np.ndarray)):
+            raise TypeError(f"Unsupported value of type {type(value)} for key '{key}'")
+
+        is_tensor = isinstance(value, torch.Tensor)
+        if is_tensor:
+            value = value.detach().cpu()
+        entry = {
+            "key": key,
+            "tensor": is_tensor,
+            "dtype": _dtype_name(value.dtype),
+            "shape": list(value.shape),
+        }
+
+        if image_compression is not None and _is_image_array(value):
+            array = value.numpy() if is_tensor else value
+            entry["encoding"] = image_compression
+            payload = _encode_image(np.ascontiguousarray(array), image_compression, jpeg_quality)
+        else:
+            is_float = value.is_floating_point() if is_tensor else np.issubdtype(value.dtype, np.floating)
+            if use_float16 and is_float:
+                value = value.to(torch.float16) if is_tensor else value.astype(np.float16)
+            entry["encoding"] = "raw"
+            entry["wire_dtype"] = _dtype_name(value.dtype)
+            if is_tensor:
+                # Going through uint8 supports dtypes numpy does not know about (e.g. bfloat16)
+                payload = value.contiguous().reshape(-1).view(torch.uint8).numpy().tobytes()
+            else:
+                payload = np.ascontiguousarray(value).tobytes()
+
+        entry["offset"] = offset
+        entry["nbytes"] = len(payload)
+        offset += len(payload)
+        entries.append(entry)
+        buffers.append(payload)
+
+    header = json.dumps({"entries": entries}).encode("utf-8")
+    return b"".join([TENSOR_FORMAT_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+def _read_tensors_header(buffer: memoryview) -> tuple[dict, int]:
+    """Parse the JSON header of a message created by `tensors_to_bytes`, along with the offset of its data."""
+    magic_size = len(TENSOR_FORMAT_MAGIC)
+    if bytes(buffer[:magic_size]) != TENSOR_FORMAT_MAGIC:
+        raise ValueError("Buffer is not a serialized tensor message")
+    (header_size,) = struct.unpack_from("<I", buffer, magic_size)
+    data_start = magic_size + 4 + header_size
+    header = json.loads(bytes(buffer[magic_size + 4 : data_start]).decode("utf-8"))
+    return header, data_start
+
+
+def bytes_to_tensors_scalars(buffer: bytes) -> dict[str, Any]:
+    """Read only the scalars of a message created by `tensors_to_bytes`, without decoding its arrays."""
+    header, _ = _read_tensors_header(memoryview(buffer))
+    return {entry["key"]: entry["value"] for entry in header["entries"] if entry["encoding"] == "json"}
+
+
+def bytes_to_tensors(buffer: bytes) -> dict[str, Any]:
+    """Deserialize a message created by `tensors_to_bytes`.
+
+    Arrays and tensors come back with their original type, dtype and shape (images compressed with
+    "jpeg" are only approximately equal to the original ones).
+    """
+    buffer = memoryview(buffer)
+    header, data_start = _read_tensors_header(buffer)
+
+    data = {}
+    for entry in header["entries"]:
+        if entry["encoding"] == "json":
+            data[entry["key"]] = entry["value"]
+            continue
+
+        start = data_start + entry["offset"]
+        payload = buffer[start : start + entry["nbytes"]]
+        shape = entry["shape"]
+
+        if entry["encoding"] in IMAGE_COMPRESSIONS:
+            array = _decode_image(payload, shape)
+            data[entry["key"]] = torch.from_numpy(array) if entry["tensor"] else array
+        elif entry["tensor"]:
+            dtype = getattr(torch, entry["dtype"])
+            wire_dtype = getattr(torch, entry["wire_dtype"])
+            if len(payload) == 0:
+                tensor = torch.empty(shape, dtype=wire_dtype)
+            else:
+                tensor = torch.frombuffer(bytearray(payload), dtype=wire_dtype).reshape(shape)
+            data[entry["key"]] = tensor.to(dtype)
+        else:
+            array = np.frombuffer(payload, dtype=entry["wire_dtype"]).reshape(shape)
+            data[entry["key"]] = array.astype(entry["dtype"], copy=True)
+
+    return data
+
+
 def grpc_channel_options(
     max_receive_message_length: int = MAX_MESSAGE_SIZE,
     max_send_message_length: int = MAX_MESSAGE_SIZE,
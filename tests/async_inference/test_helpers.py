@@ -23,11 +23,15 @@ from lerobot.async_inference.helpers import (
     FPSTracker,
     TimedAction,
     TimedObservation,
+    bytes_to_timed_actions,
+    bytes_to_timed_observation,
     observations_similar,
     prepare_image,
     prepare_raw_observation,
     raw_observation_to_observation,
     resize_robot_observation_image,
+    timed_actions_to_bytes,
+    timed_observation_to_bytes,
 )
 from lerobot.configs.types import FeatureType, PolicyFeature
 from lerobot.utils.constants import OBS_IMAGES, OBS_STATE
@@ -165,6 +169,40 @@ def test_timed_data_deserialization_data_getters():
     torch.testing.assert_close(to_out.get_observation()[OBS_STATE], obs_dict[OBS_STATE])
 
 
+def test_timed_data_wire_format_roundtrip():
+    """TimedObservation / action chunks survive the tensor wire format used by the client and server."""
+    ts = time.time()
+    raw_obs = {
+        "shoulder.pos": 1.5,
+        "laptop": np.random.randint(0, 256, size=(24, 32, 3), dtype=np.uint8),
+        "task": "fold the towel",
+    }
+    to_in = TimedObservation(timestamp=ts, observation=raw_obs, timestep=7, must_go=True)
+
+    to_out = bytes_to_timed_observation(timed_observation_to_bytes(to_in, image_compression="png"))
+
+    assert to_out.get_timestamp() == ts
+    assert to_out.get_timestep() == 7
+    assert to_out.must_go is True
+    assert to_out.get_observation().keys() == raw_obs.keys()
+    assert to_out.get_observation()["shoulder.pos"] == 1.5
+    assert to_out.get_observation()["task"] == "fold the towel"
+    np.testing.assert_array_equal(to_out.get_observation()["laptop"], raw_obs["laptop"])
+
+    actions_in = [
+        TimedAction(timestamp=ts + i * 0.1, timestep=13 + i, action=torch.randn(6)) for i in range(4)
+    ]
+    actions_out = bytes_to_timed_actions(timed_actions_to_bytes(actions_in))
+
+    assert len(actions_out) == len(actions_in)
+    for a_in, a_out in zip(actions_in, actions_out, strict=True):
+        assert a_out.get_timestamp() == a_in.get_timestamp()
+        assert a_out.get_timestep() == a_in.get_timestep()
+        torch.testing.assert_close(a_out.get_action(), a_in.get_action())
+
+    assert bytes_to_timed_actions(timed_actions_to_bytes([])) == []
+
+
 # ---------------------------------------------------------------------
 # observations_similar()
 # ---------------------------------------------------------------------
@@ -217,3 +217,21 @@ def test_predict_action_chunk(monkeypatch, policy_server):
     for i, ta in enumerate(timed_actions):
         expected_ts = obs.get_timestamp() + i * policy_server.config.environment_dt
         assert abs(ta.get_timestamp() - expected_ts) < 1e-6
+
+
+def test_postprocess_action_chunk_single_call(policy_server):
+    """The postprocessor runs once per chunk, with the chunk folded into the batch dimension."""
+    calls = []
+
+    def _postprocessor(action):
+        calls.append(action.shape)
+        return action[:, :4] * 2
+
+    policy_server.postprocessor = _postprocessor
+    action_tensor = torch.arange(2 * 5 * 6, dtype=torch.float32).reshape(2, 5, 6)
+
+    processed = policy_server._postprocess_action_chunk(action_tensor)
+
+    assert calls == [torch.Size([10, 6])]
+    assert processed.shape == (2, 5, 4)
+    torch.testing.assert_close(processed, action_tensor[..., :4] * 2)
@@ -441,6 +441,46 @@ def test_running_quantile_stats_histogram_adjustment():
     assert running_stats._bin_edges[1][-1] >= 1.2
 
 
+def test_running_quantile_stats_histograms_match_numpy():
+    """Test that the vectorized histograms match per-dimension `np.histogram`, including constant dimensions."""
+    np.random.seed(42)
+    batches = [np.random.normal(0, 1 + i, (200, 4)).astype(np.float32) for i in range(3)]
+    for batch in batches:
+        batch[:, 2] = 7.0
+
+    running_stats = RunningQuantileStats(num_quantile_bins=100)
+    running_stats.update(batches[0])
+    for i in range(4):
+        expected, _ = np.histogram(batches[0][:, i], bins=running_stats._bin_edges[i])
+        np.testing.assert_array_equal(running_stats._histograms[i], expected)
+
+    for batch in batches[1:]:
+        running_stats.update(batch)
+    assert running_stats._histograms.shape == (4, 100)
+    np.testing.assert_array_equal(running_stats._histograms.sum(axis=1), np.full(4, 600))
+
+    stats = running_stats.get_statistics()
+    np.testing.assert_allclose(stats["q50"][2], 7.0)
+    assert np.all(stats["q01"] <= stats["q50"]) and np.all(stats["q50"] <= stats["q99"])
+
+
+def test_get_feature_stats_histogram():
+    """Test the histogram sketch returned alongside the stats."""
+    data = np.random.normal(0, 1, (100, 3))
+    data[:, 2] = 4.0
+
+    stats = get_feature_stats(data, axis=0, keepdims=False, histogram_bins=32)
+
+    assert stats["histogram"].shape == (3, 32)
+    np.testing.assert_allclose(stats["histogram"].sum(axis=1), [100, 100, 100])
+
+    single_stats = get_feature_stats(data[:1], axis=0, keepdims=False, histogram_bins=32)
+    np.testing.assert_allclose(single_stats["histogram"].sum(axis=1), [1, 1, 1])
+
+    with pytest.raises(ValueError, match="histogram_bins must be at least 2"):
+        get_feature_stats(data, axis=0, keepdims=False, histogram_bins=1)
+
+
 def test_running_quantile_stats_insufficient_data_error():
     """Test error when trying to get stats with insufficient data."""
     running_stats = RunningQuantileStats()
@@ -832,3 +872,34 @@ def test_fixed_quantiles_always_computed():
         for q_key in expected_quantiles:
             assert q_key in episode_stats[key]
             assert episode_stats[key][q_key].shape == (features[key]["shape"][0],)
+
+
+def test_aggregate_stats_merges_histograms():
+    """Test that quantiles are merged through histograms when all stats carry one."""
+    rng = np.random.default_rng(0)
+    episodes = [rng.normal(i, 1 + i, (200, 2)) for i in range(5)]
+    episodes[0][:, 1] = 3.0  # constant dimension in one episode
+    all_data = np.concatenate(episodes)
+
+    stats_list = [
+        {"action": get_feature_stats(ep, axis=0, keepdims=False, histogram_bins=256)} for ep in episodes
+    ]
+    aggregated = aggregate_stats(stats_list)["action"]
+
+    assert aggregated["histogram"].shape == (2, 256)
+    np.testing.assert_allclose(aggregated["histogram"].sum(axis=1), [1000, 1000])
+    value_range = all_data.max(axis=0) - all_data.min(axis=0)
+    for q_key, q in [("q01", 0.01), ("q10", 0.10), ("q50", 0.50), ("q90", 0.90), ("q99", 0.99)]:
+        error = np.abs(aggregated[q_key] - np.quantile(all_data, q, axis=0))
+        assert np.all(error < 0.01 * value_range)
+
+    # Aggregating the aggregated stats again keeps the sketch consistent
+    reaggregated = aggregate_stats([{"action": aggregated}, stats_list[0]])["action"]
+    np.testing.assert_allclose(reaggregated["histogram"].sum(axis=1), [1200, 1200])
+
+    # Without histograms in all stats, quantiles fall back to a count-weighted average
+    stats_list[0]["action"].pop("histogram")
+    fallback = aggregate_stats(stats_list)["action"]
+    assert "histogram" not in fallback
+    expected_q50 = np.mean([s["action"]["q50"] for s in stats_list], axis=0)
+    np.testing.assert_allclose(fallback["q50"], expected_q50)
@@ -664,6 +664,52 @@ def test_delete_episodes_preserves_stats(sample_dataset, tmp_path):
         assert "std" in new_dataset.meta.stats[feature]
 
 
+def test_delete_episodes_merges_histogram_stats(tmp_path, empty_lerobot_dataset_factory):
+    """Test that histogram sketches saved with episode stats give accurate quantiles after deletion."""
+    features = {
+        "action": {"dtype": "float32", "shape": (2,), "names": None},
+        "observation.images.top": {"dtype": "image", "shape": (16, 16, 3), "names": None},
+    }
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test_dataset", features=features, stats_histogram_bins=64
+    )
+
+    actions = []
+    for ep_idx in range(4):
+        ep_actions = (np.random.randn(50, 2) * (ep_idx + 1) + ep_idx).astype(np.float32)
+        actions.append(ep_actions)
+        for action in ep_actions:
+            frame = {
+                "action": action,
+                "observation.images.top": np.random.randint(0, 255, size=(16, 16, 3), dtype=np.uint8),
+                "task": "task",
+            }
+            dataset.add_frame(frame)
+        dataset.save_episode()
+    dataset.finalize()
+
+    assert dataset.meta.stats["action"]["histogram"].shape == (2, 64)
+    assert dataset.meta.stats["observation.images.top"]["histogram"].shape == (3, 1, 1, 64)
+
+    output_dir = tmp_path / "filtered"
+    with (
+        patch("lerobot.datasets.lerobot_dataset.get_safe_version") as mock_get_safe_version,
+        patch("lerobot.datasets.lerobot_dataset.snapshot_download") as mock_snapshot_download,
+    ):
+        mock_get_safe_version.return_value = "v3.0"
+        mock_snapshot_download.return_value = str(output_dir)
+
+        new_dataset = delete_episodes(dataset, episode_indices=[1], output_dir=output_dir)
+
+    action_stats = new_dataset.meta.stats["action"]
+    remaining_actions = np.concatenate([actions[0], actions[2], actions[3]])
+    np.testing.assert_array_equal(action_stats["histogram"].sum(axis=1), [150, 150])
+    value_range = remaining_actions.max(axis=0) - remaining_actions.min(axis=0)
+    for q_key, q in [("q10", 0.10), ("q50", 0.50), ("q90", 0.90)]:
+        expected = np.quantile(remaining_actions, q, axis=0)
+        assert np.all(np.abs(action_stats[q_key] - expected) < 0.05 * value_range)
+
+
 def test_delete_episodes_preserves_tasks(sample_dataset, tmp_path):
     """Test that tasks are preserved correctly after deletion."""
     output_dir = tmp_path / "filtered"
@@ -1047,3 +1093,82 @@ def test_modify_features_preserves_file_structure(sample_dataset, tmp_path):
         assert new_chunk_indices == original_chunk_indices, "Chunk indices should be preserved"
         assert new_file_indices == original_file_indices, "File indices should be preserved"
         assert "reward" in modified_dataset.meta.features
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_recompute_stats(tmp_path, empty_lerobot_dataset_factory, num_workers):
+    """Test that recomputed stats match the stats computed while recording."""
+    from lerobot.datasets.dataset_tools import recompute_stats
+
+    features = {
+        "action": {"dtype": "float32", "shape": (3,), "names": None},
+        "observation.images.top": {"dtype": "image", "shape": (16, 16, 3), "names": None},
+        "observation.images.wrist": {"dtype": "video", "shape": (16, 16, 3), "names": None},
+    }
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test_dataset", features=features)
+    for ep_idx in range(3):
+        for _ in range(8 + ep_idx):
+            frame = {
+                "action": np.random.randn(3).astype(np.float32),
+                "observation.images.top": np.random.randint(0, 255, size=(16, 16, 3), dtype=np.uint8),
+                "observation.images.wrist": np.full((16, 16, 3), 40 * ep_idx, dtype=np.uint8),
+                "task": "task",
+            }
+            dataset.add_frame(frame)
+        dataset.save_episode()
+    dataset.finalize()
+
+    recorded_stats = dataset.meta.stats
+    stats = recompute_stats(dataset.meta, num_workers=num_workers, video_backend="pyav")
+
+    assert set(stats) == set(recorded_stats)
+    for key in ["action", "index", "timestamp", "observation.images.top"]:
+        for stat_name, value in recorded_stats[key].items():
+            np.testing.assert_allclose(stats[key][stat_name], value, rtol=1e-6, err_msg=f"{key}/{stat_name}")
+    np.testing.assert_allclose(
+        stats["observation.images.wrist"]["mean"],
+        recorded_stats["observation.images.wrist"]["mean"],
+        atol=0.02,
+    )
+    assert not (dataset.root / "meta" / "stats_checkpoint").exists()
+
+
+def test_recompute_stats_resumes(sample_dataset):
+    """Test that checkpointed episode stats are reused after an interruption."""
+    from lerobot.datasets import dataset_tools
+
+    recorded_mean = sample_dataset.meta.stats["action"]["mean"]
+
+    # Interrupt the recomputation after all the data files were processed
+    with (
+        patch.object(dataset_tools, "aggregate_stats", side_effect=KeyboardInterrupt),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        dataset_tools.recompute_stats(sample_dataset.meta, num_workers=0)
+
+    checkpoint_dir = sample_dataset.root / dataset_tools.STATS_CHECKPOINT_DIR
+    assert len(list(checkpoint_dir.glob("*.json"))) == 1
+
+    with patch.object(dataset_tools, "_compute_data_file_stats", side_effect=AssertionError):
+        stats = dataset_tools.recompute_stats(sample_dataset.meta, num_workers=0)
+
+    assert not checkpoint_dir.exists()
+    assert stats["action"]["count"] == 50
+    np.testing.assert_allclose(stats["action"]["mean"], recorded_mean, rtol=1e-6)
+
+
+def test_load_parquet_image_grayscale():
+    """Test that grayscale images stored in parquet files get a channel dimension."""
+    import io
+
+    from PIL import Image
+
+    from lerobot.datasets.dataset_tools import _load_parquet_image
+
+    buffer = io.BytesIO()
+    Image.fromarray(np.full((4, 5), 7, dtype=np.uint8)).save(buffer, format="PNG")
+
+    image = _load_parquet_image({"bytes": buffer.getvalue(), "path": None})
+
+    assert image.shape == (1, 4, 5)
+    assert image.dtype == np.uint8
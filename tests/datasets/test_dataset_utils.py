@@ -14,13 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from pathlib import Path
+
+import datasets
 import pytest
 import torch
 from datasets import Dataset
 from huggingface_hub import DatasetCard
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
-from lerobot.datasets.utils import combine_feature_dicts, create_lerobot_dataset_card, hf_transform_to_torch
+from lerobot.datasets.utils import (
+    DEFAULT_VIDEO_PATH,
+    EpisodeLookup,
+    arrow_column_to_torch,
+    combine_feature_dicts,
+    create_lerobot_dataset_card,
+    hf_transform_to_torch,
+)
 from lerobot.utils.constants import ACTION, OBS_IMAGES
 
 
@@ -57,6 +67,56 @@ def test_calculate_episode_data_index():
     assert torch.equal(episode_data_index["to"], torch.tensor([2, 3, 6]))
 
 
+def test_arrow_column_to_torch_matches_hf_transform():
+    dataset = Dataset.from_dict(
+        {
+            "timestamp": [0.1, 0.2, 0.3],
+            "index": [0, 1, 2],
+            "state": [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]],
+            "task": ["a", "b", "c"],
+        },
+        features=datasets.Features(
+            {
+                "timestamp": datasets.Value("float32"),
+                "index": datasets.Value("int32"),
+                "state": datasets.Sequence(length=2, feature=datasets.Value("float64")),
+                "task": datasets.Value("string"),
+            }
+        ),
+    )
+    dataset.set_transform(hf_transform_to_torch)
+
+    for key in ["timestamp", "index", "state"]:
+        values = arrow_column_to_torch(dataset.data.column(key))
+        expected = torch.stack(dataset[key][:])
+        assert values.dtype == expected.dtype
+        assert torch.equal(values, expected)
+
+    assert arrow_column_to_torch(dataset.data.column("task")) is None
+
+
+def test_episode_lookup_matches_episodes_metadata(features_factory, episodes_factory):
+    features = features_factory()
+    video_keys = [key for key, ft in features.items() if ft["dtype"] == "video"]
+    episodes = episodes_factory(features, total_episodes=4, total_frames=100, video_keys=video_keys)
+
+    lookup = EpisodeLookup.build(episodes, video_keys, DEFAULT_VIDEO_PATH)
+
+    for ep_idx, ep in enumerate(episodes):
+        assert lookup.from_index[ep_idx] == ep["dataset_from_index"]
+        assert lookup.to_index[ep_idx] == ep["dataset_to_index"]
+        for key in video_keys:
+            expected_path = DEFAULT_VIDEO_PATH.format(
+                video_key=key,
+                chunk_index=ep[f"videos/{key}/chunk_index"],
+                file_index=ep[f"videos/{key}/file_index"],
+            )
+            assert lookup.video_files[lookup.video_file_ids[key][ep_idx]] == Path(expected_path)
+            assert lookup.video_from_timestamps[key][ep_idx] == pytest.approx(
+                ep[f"videos/{key}/from_timestamp"]
+            )
+
+
 def test_merge_simple_vectors():
     g1 = {
         ACTION: {
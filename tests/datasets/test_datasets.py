@@ -37,12 +37,14 @@ from lerobot.datasets.lerobot_dataset import (
 from lerobot.datasets.utils import (
     DEFAULT_CHUNK_SIZE,
     DEFAULT_DATA_FILE_SIZE_IN_MB,
+    DEFAULT_FEATURES,
     DEFAULT_VIDEO_FILE_SIZE_IN_MB,
     create_branch,
     get_hf_features_from_features,
     hf_transform_to_torch,
     hw_to_dataset_features,
 )
+from lerobot.datasets.video_utils import VideoEncodingManager
 from lerobot.envs.factory import make_env_config
 from lerobot.policies.factory import make_policy_config
 from lerobot.robots import make_robot_from_config
@@ -109,6 +111,116 @@ def test_dataset_initialization(tmp_path, lerobot_dataset_factory):
     assert dataset.num_frames == len(dataset)
 
 
+@pytest.mark.parametrize("episodes", [None, [0, 2]])
+def test_getitems_matches_getitem(tmp_path, lerobot_dataset_factory, episodes):
+    delta_timestamps = {ACTION: [-2 / 30, -1 / 30, 0.0, 1 / 30], "state": [-1 / 30, 0.0]}
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test",
+        total_episodes=3,
+        total_frames=90,
+        use_videos=False,
+        episodes=episodes,
+        delta_timestamps=delta_timestamps,
+    )
+
+    indices = [0, 1, len(dataset) // 2, len(dataset) - 1, 1]
+    batch = dataset.__getitems__(indices)
+
+    assert len(batch) == len(indices)
+    for idx, batch_item in zip(indices, batch, strict=True):
+        item = dataset[idx]
+        assert batch_item.keys() == item.keys()
+        for key, val in item.items():
+            if isinstance(val, torch.Tensor):
+                torch.testing.assert_close(batch_item[key], val)
+            else:
+                assert batch_item[key] == val
+
+
+def test_return_uint8_images(tmp_path, lerobot_dataset_factory):
+    float_dataset = lerobot_dataset_factory(root=tmp_path / "float", use_videos=False)
+    uint8_dataset = lerobot_dataset_factory(
+        root=tmp_path / "uint8", use_videos=False, return_uint8_images=True
+    )
+
+    float_item, uint8_item = float_dataset[0], uint8_dataset[0]
+    for cam in uint8_dataset.meta.camera_keys:
+        assert uint8_item[cam].dtype == torch.uint8
+        torch.testing.assert_close(uint8_item[cam].float() / 255, float_item[cam])
+
+
+@pytest.mark.parametrize("episodes", [None, [0, 2]])
+def test_columns_only_loads_selected_features(tmp_path, lerobot_dataset_factory, episodes):
+    delta_timestamps = {ACTION: [0.0, 1 / 30]}
+    full_dataset = lerobot_dataset_factory(
+        root=tmp_path / "test", total_episodes=3, total_frames=90, use_videos=False, episodes=episodes
+    )
+    camera_key = full_dataset.meta.camera_keys[0]
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test",
+        total_episodes=3,
+        total_frames=90,
+        use_videos=False,
+        episodes=episodes,
+        delta_timestamps=delta_timestamps,
+        columns=["state", camera_key],
+    )
+
+    expected = {"state", camera_key, ACTION, *DEFAULT_FEATURES}
+    assert set(dataset.hf_dataset.column_names) == expected
+    assert dataset._camera_keys == [camera_key]
+
+    item = dataset[len(dataset) - 1]
+    assert set(item) == expected | {f"{ACTION}_is_pad", "task"}
+    full_item = full_dataset[len(dataset) - 1]
+    for key in ["state", camera_key, "index"]:
+        torch.testing.assert_close(item[key], full_item[key])
+    assert item[f"{ACTION}_is_pad"].tolist() == [False, True]
+
+    batch_item = dataset.__getitems__([len(dataset) - 1])[0]
+    assert batch_item.keys() == item.keys()
+
+
+def test_columns_unknown_feature_raises(tmp_path, lerobot_dataset_factory):
+    with pytest.raises(ValueError, match="not features"):
+        lerobot_dataset_factory(root=tmp_path / "test", use_videos=False, columns=["unknown"])
+
+
+@pytest.mark.parametrize("episodes", [None, [0, 2]])
+@pytest.mark.parametrize("share_memory", [False, True])
+def test_in_memory_matches_default(tmp_path, lerobot_dataset_factory, episodes, share_memory):
+    kwargs = {
+        "total_episodes": 3,
+        "total_frames": 90,
+        "use_videos": False,
+        "episodes": episodes,
+        "delta_timestamps": {ACTION: [-1 / 30, 0.0, 1 / 30]},
+    }
+    dataset = lerobot_dataset_factory(root=tmp_path / "test", **kwargs)
+    in_memory_dataset = lerobot_dataset_factory(
+        root=tmp_path / "test", in_memory=True, share_memory=share_memory, **kwargs
+    )
+
+    column_cache = in_memory_dataset._column_cache
+    assert {ACTION, "index", "timestamp"} <= set(column_cache)
+    assert not set(in_memory_dataset.meta.camera_keys) & set(column_cache)
+    assert all(values.is_shared() == share_memory for values in column_cache.values())
+
+    for idx in [0, len(dataset) // 2, len(dataset) - 1]:
+        item, in_memory_item = dataset[idx], in_memory_dataset[idx]
+        assert in_memory_item.keys() == item.keys()
+        for key, val in item.items():
+            if isinstance(val, torch.Tensor):
+                torch.testing.assert_close(in_memory_item[key], val)
+            else:
+                assert in_memory_item[key] == val
+
+
+def test_share_memory_requires_in_memory(tmp_path, lerobot_dataset_factory):
+    with pytest.raises(ValueError, match="in_memory"):
+        lerobot_dataset_factory(root=tmp_path / "test", use_videos=False, share_memory=True)
+
+
 # TODO(rcadene, aliberts): do not run LeRobotDataset.create, instead refactor LeRobotDatasetMetadata.create
 # and test the small resulting function that validates the features
 def test_dataset_feature_with_forward_slash_raises_error():
@@ -1070,6 +1182,153 @@ def test_task_indexing_and_validation(tmp_path, empty_lerobot_dataset_factory):
     assert loaded_dataset.meta.total_tasks == len(unique_tasks)
 
 
+def test_streaming_encoding_matches_png_encoding(tmp_path, empty_lerobot_dataset_factory):
+    """Test that encoding frames on the fly gives the same dataset as encoding them from PNG images."""
+    features = {
+        "observation.images.cam": {
+            "dtype": "video",
+            "shape": (64, 96, 3),
+            "names": ["height", "width", "channels"],
+        },
+        "state": {"dtype": "float32", "shape": (1,), "names": None},
+    }
+    frames = [np.random.randint(0, 256, (64, 96, 3), dtype=np.uint8) for _ in range(10)]
+
+    datasets_ = []
+    for streaming_encoding in [False, True]:
+        dataset = empty_lerobot_dataset_factory(
+            root=tmp_path / f"streaming_{streaming_encoding}",
+            features=features,
+            streaming_encoding=streaming_encoding,
+        )
+        for episode_frames in [frames[:4], frames[4:]]:
+            for frame in episode_frames:
+                dataset.add_frame({"observation.images.cam": frame, "state": torch.randn(1), "task": "x"})
+            dataset.save_episode()
+        dataset.finalize()
+        if streaming_encoding:
+            assert not (dataset.root / "images").exists()
+        datasets_.append(LeRobotDataset(dataset.repo_id, root=dataset.root, video_backend="pyav"))
+
+    png_dataset, streamed_dataset = datasets_
+    for key, stat in png_dataset.meta.stats["observation.images.cam"].items():
+        np.testing.assert_allclose(streamed_dataset.meta.stats["observation.images.cam"][key], stat)
+    for idx in [0, 3, 4, 9]:
+        torch.testing.assert_close(
+            streamed_dataset[idx]["observation.images.cam"], png_dataset[idx]["observation.images.cam"]
+        )
+
+
+def test_streaming_encoding_with_batch_encoding_raises(tmp_path, empty_lerobot_dataset_factory):
+    features = {"state": {"dtype": "float32", "shape": (1,), "names": None}}
+    with pytest.raises(ValueError):
+        empty_lerobot_dataset_factory(
+            root=tmp_path / "test", features=features, streaming_encoding=True, batch_encoding_size=2
+        )
+
+
+def test_parallel_video_encoding_matches_serial(tmp_path, empty_lerobot_dataset_factory):
+    """Test that encoding cameras in the persistent encoding pool gives the same videos as serial encoding."""
+    features = {
+        f"observation.images.{cam}": {
+            "dtype": "video",
+            "shape": (32, 48, 3),
+            "names": ["height", "width", "channels"],
+        }
+        for cam in ["front", "wrist"]
+    }
+    features["state"] = {"dtype": "float32", "shape": (1,), "names": None}
+    frames = np.random.randint(0, 256, (3, 5, 32, 48, 3), dtype=np.uint8)
+
+    datasets_ = []
+    for parallel_encoding in [False, True]:
+        dataset = empty_lerobot_dataset_factory(
+            root=tmp_path / f"parallel_{parallel_encoding}", features=features, video_encoding_workers=2
+        )
+        encoding_pools = []
+        for episode_frames in frames:
+            for frame in episode_frames:
+                dataset.add_frame(
+                    {
+                        "observation.images.front": frame,
+                        "observation.images.wrist": 255 - frame,
+                        "state": torch.randn(1),
+                        "task": "x",
+                    }
+                )
+            dataset.save_episode(parallel_encoding=parallel_encoding)
+            encoding_pools.append(dataset._encoding_pool)
+        # The same pool is reused across episodes, and only started when encoding in parallel
+        assert len(set(encoding_pools)) == 1
+        assert (encoding_pools[0] is not None) == parallel_encoding
+        dataset.finalize()
+        assert dataset._encoding_pool is None
+        datasets_.append(LeRobotDataset(dataset.repo_id, root=dataset.root, video_backend="pyav"))
+
+    serial_dataset, parallel_dataset = datasets_
+    video_columns = [col for col in serial_dataset.meta.episodes.column_names if col.startswith("videos/")]
+    for col in video_columns:
+        assert parallel_dataset.meta.episodes[col] == serial_dataset.meta.episodes[col]
+    for idx in range(0, len(serial_dataset), 3):
+        for key in serial_dataset.meta.video_keys:
+            torch.testing.assert_close(parallel_dataset[idx][key], serial_dataset[idx][key])
+
+
+def test_batch_video_encoding_matches_per_episode(tmp_path, empty_lerobot_dataset_factory):
+    """Test that encoding the videos of several episodes at once in the pool gives the same dataset."""
+    features = {
+        f"observation.images.{cam}": {
+            "dtype": "video",
+            "shape": (32, 48, 3),
+            "names": ["height", "width", "channels"],
+        }
+        for cam in ["front", "wrist"]
+    }
+    features["state"] = {"dtype": "float32", "shape": (1,), "names": None}
+    frames = np.random.randint(0, 256, (3, 5, 32, 48, 3), dtype=np.uint8)
+
+    datasets_ = []
+    for batch_encoding_size in [1, 2]:
+        dataset = empty_lerobot_dataset_factory(
+            root=tmp_path / f"batch_{batch_encoding_size}",
+            features=features,
+            batch_encoding_size=batch_encoding_size,
+            video_encoding_workers=2,
+        )
+        with VideoEncodingManager(dataset):
+            for ep_idx, episode_frames in enumerate(frames):
+                for frame in episode_frames:
+                    dataset.add_frame(
+                        {
+                            "observation.images.front": frame,
+                            "observation.images.wrist": 255 - frame,
+                            "state": torch.randn(1),
+                            "task": "x",
+                        }
+                    )
+                dataset.save_episode()
+                # Episodes waiting for their videos still count, so that the next one gets the right index
+                assert dataset.num_episodes == ep_idx + 1
+            if batch_encoding_size == 2:
+                # The third episode is encoded when the manager exits
+                assert dataset.meta.total_episodes == 2
+                assert dataset.episodes_since_last_encoding == 1
+        assert dataset.meta.total_episodes == 3
+        assert dataset._encoding_pool is None
+        datasets_.append(LeRobotDataset(dataset.repo_id, root=dataset.root, video_backend="pyav"))
+
+    per_episode_dataset, batch_dataset = datasets_
+    video_columns = [
+        col for col in per_episode_dataset.meta.episodes.column_names if col.startswith("videos/")
+    ]
+    for col in ["dataset_from_index", "dataset_to_index", *video_columns]:
+        assert batch_dataset.meta.episodes[col] == per_episode_dataset.meta.episodes[col]
+    for idx in range(0, len(per_episode_dataset), 2):
+        assert batch_dataset[idx]["index"] == per_episode_dataset[idx]["index"]
+        for key in per_episode_dataset.meta.video_keys:
+            torch.testing.assert_close(batch_dataset[idx][key], per_episode_dataset[idx][key])
+
+
 def test_dataset_resume_recording(tmp_path, empty_lerobot_dataset_factory):
     """Test that resuming dataset recording preserves previously recorded episodes.
 
@@ -177,6 +177,37 @@ def test_save_image_numpy_multiprocessing(tmp_path, img_array_factory):
         writer.stop()
 
 
+def test_save_image_multiprocessing_shared_memory(tmp_path, img_array_factory):
+    writer = AsyncImageWriter(num_processes=1, num_threads=1, shared_memory_slots=2)
+    try:
+        # More images than slots, so that slots have to be released by the worker and reused
+        image_arrays = [img_array_factory() for _ in range(5)] + [img_array_factory(height=50, width=60)]
+        for i, image_array in enumerate(image_arrays):
+            writer.save_image(image_array, tmp_path / f"frame_{i}.png")
+        writer.wait_until_done()
+
+        for i, image_array in enumerate(image_arrays):
+            assert np.array_equal(image_array, np.array(Image.open(tmp_path / f"frame_{i}.png")))
+        # One ring buffer per image shape
+        assert len(writer.rings) == 2
+    finally:
+        writer.stop()
+    assert len(writer.rings) == 0
+
+
+def test_save_image_multiprocessing_without_shared_memory(tmp_path, img_array_factory):
+    writer = AsyncImageWriter(num_processes=1, num_threads=1, shared_memory_slots=0)
+    try:
+        image_array = img_array_factory()
+        fpath = tmp_path / DUMMY_IMAGE
+        writer.save_image(image_array, fpath)
+        writer.wait_until_done()
+        assert np.array_equal(image_array, np.array(Image.open(fpath)))
+        assert len(writer.rings) == 0
+    finally:
+        writer.stop()
+
+
 def test_save_image_torch(tmp_path, img_tensor_factory):
     writer = AsyncImageWriter()
     try:
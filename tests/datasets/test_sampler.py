@@ -90,3 +90,26 @@ def test_shuffle():
     assert sampler.indices == [0, 1, 2, 3, 4, 5]
     assert len(sampler) == 6
     assert set(sampler) == {0, 1, 2, 3, 4, 5}
+
+
+def test_shuffle_by_blocks():
+    dataset = Dataset.from_dict(
+        {
+            "timestamp": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+            "index": [0, 1, 2, 3, 4, 5, 6],
+            "episode_index": [0, 0, 0, 1, 2, 2, 2],
+        },
+    )
+    dataset.set_transform(hf_transform_to_torch)
+    episode_data_index = calculate_episode_data_index(dataset)
+    sampler = EpisodeAwareSampler(
+        episode_data_index["from"], episode_data_index["to"], shuffle=True, block_size=2
+    )
+    assert len(sampler) == 7
+    sampled = list(sampler)
+    assert sorted(sampled) == [0, 1, 2, 3, 4, 5, 6]
+    # Blocks never span two episodes and keep their frames in temporal order
+    blocks = [[0, 1], [2], [3], [4, 5], [6]]
+    for block in blocks:
+        start = sampled.index(block[0])
+        assert sampled[start : start + len(block)] == block
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import numpy as np
+import pyarrow.parquet as pq
 import pytest
 import torch
 
@@ -390,3 +391,135 @@ def test_frames_with_delta_consistency_with_shards(
         assert all(t[1] for t in key_checks), (
             f"Checking {list(filter(lambda t: not t[1], key_checks))[0][0]} left and right were found different (i: {i}, frame_idx: {frame_idx})"
         )
+
+
+def _split_row_groups(root, row_group_size: int):
+    """Rewrites the data files of a dataset with small row groups, so that frames span several of them."""
+    for path in (root / "data").glob("*/*.parquet"):
+        pq.write_table(pq.read_table(path), path, row_group_size=row_group_size)
+
+
+@pytest.mark.parametrize(
+    "delta_timestamps",
+    [
+        None,
+        {"state": [-1, -0.5, -0.20, 0], ACTION: [0, 1, 2, 3]},
+        {"state": [-2, -1, -0.5, 0], ACTION: [-1.5, -1, -0.5, -0.20, -0.10, 0]},
+        # One-sided windows, which do not contain the current frame
+        {"state": [0.5, 1], ACTION: [0.1, 0.2, 0.3]},
+        {"state": [-1, -0.5], ACTION: [-0.3, -0.2, -0.1]},
+    ],
+)
+def test_row_groups_consistency(tmp_path, lerobot_dataset_factory, delta_timestamps):
+    ds_num_frames = 400
+    local_path = tmp_path / "test"
+
+    ds = lerobot_dataset_factory(
+        root=local_path,
+        repo_id=DUMMY_REPO_ID,
+        total_episodes=10,
+        total_frames=ds_num_frames,
+        use_videos=False,
+        delta_timestamps=delta_timestamps,
+    )
+    _split_row_groups(local_path, row_group_size=64)
+
+    streaming_ds = StreamingLeRobotDataset(
+        repo_id=DUMMY_REPO_ID,
+        root=local_path,
+        buffer_size=50,
+        max_num_shards=4,
+        delta_timestamps=delta_timestamps,
+        read_row_groups=True,
+    )
+    assert len(streaming_ds._get_row_groups()) > 1
+
+    indices = []
+    for streaming_frame in streaming_ds:
+        frame_idx = streaming_frame["index"].item()
+        indices.append(frame_idx)
+        target_frame = ds[frame_idx]
+        assert set(streaming_frame.keys()) == set(target_frame.keys())
+
+        for key, left in streaming_frame.items():
+            right = target_frame[key]
+            if isinstance(left, str):
+                assert left == right, key
+            else:
+                assert left.shape == right.shape and left.dtype == right.dtype, key
+                assert torch.allclose(left, right), (key, frame_idx)
+
+    assert sorted(indices) == list(range(ds_num_frames))
+
+
+def test_streaming_requires_a_shard(tmp_path):
+    with pytest.raises(ValueError, match="max_num_shards"):
+        StreamingLeRobotDataset(repo_id=DUMMY_REPO_ID, root=tmp_path, max_num_shards=0, read_row_groups=True)
+
+
+def test_row_groups_worker_sharding(tmp_path, lerobot_dataset_factory):
+    ds_num_frames = 400
+    num_workers = 3
+    local_path = tmp_path / "test"
+
+    lerobot_dataset_factory(
+        root=local_path,
+        repo_id=DUMMY_REPO_ID,
+        total_episodes=10,
+        total_frames=ds_num_frames,
+        use_videos=False,
+    )
+    _split_row_groups(local_path, row_group_size=32)
+
+    worker_indices = []
+    for worker_id in range(num_workers):
+        streaming_ds = StreamingLeRobotDataset(
+            repo_id=DUMMY_REPO_ID, root=local_path, seed=42, read_row_groups=True
+        )
+        streaming_ds._get_worker_shard = lambda worker_id=worker_id: (worker_id, num_workers)
+        worker_indices.append({frame["index"].item() for frame in streaming_ds})
+
+    assert all(len(indices) > 0 for indices in worker_indices)
+    assert sum(len(indices) for indices in worker_indices) == ds_num_frames
+    assert set().union(*worker_indices) == set(range(ds_num_frames))
+
+
+@pytest.mark.parametrize("read_row_groups", [False, True])
+def test_prefetched_video_frames_consistency(tmp_path, lerobot_dataset_factory, read_row_groups):
+    local_path = tmp_path / "test"
+    delta_timestamps = {"phone": [-0.2, 0, 0.2]}
+    ds = lerobot_dataset_factory(
+        root=local_path,
+        repo_id=DUMMY_REPO_ID,
+        total_episodes=4,
+        total_frames=100,
+        delta_timestamps=delta_timestamps,
+    )
+    row_group_size = 16
+    if read_row_groups:
+        _split_row_groups(local_path, row_group_size=row_group_size)
+
+    streaming_ds = StreamingLeRobotDataset(
+        repo_id=DUMMY_REPO_ID,
+        root=local_path,
+        shuffle=False,
+        delta_timestamps=delta_timestamps,
+        read_row_groups=read_row_groups,
+        max_num_shards=2,
+        prefetch_episodes=2,
+    )
+    for streaming_frame in streaming_ds:
+        target_frame = ds[streaming_frame["index"]]
+        for key in ds.meta.video_keys:
+            assert torch.allclose(streaming_frame[key], target_frame[key])
+            assert torch.equal(streaming_frame[f"{key}_is_pad"], target_frame[f"{key}_is_pad"])
+
+    assert streaming_ds.video_prefetcher.frame_cache.size() > 0
+    streaming_ds.video_prefetcher.close()
+
+    if read_row_groups:
+        # Only the frames read from a row group are prefetched for it, rather than whole episodes
+        window = max(streaming_ds.delta_indices["phone"]) - min(streaming_ds.delta_indices["phone"])
+        for data_path, row_group, _ in streaming_ds._get_row_groups():
+            for _, from_ts, to_ts in streaming_ds._get_row_group_video_segments(data_path, row_group):
+                assert (to_ts - from_ts) * ds.fps <= row_group_size + window + 1e-6
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import pickle
+from types import SimpleNamespace
+
+import av
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from lerobot.datasets.video_utils import (
+    DECODER_BUFFERED_FRAMES,
+    DecodedFrameCache,
+    StreamingVideoEncoder,
+    VideoDecoderCache,
+    VideoSegmentPrefetcher,
+    _get_frames_at_with_cache,
+)
+
+
+class _InMemoryDecoderCache(VideoDecoderCache):
+    """Decoder cache whose entries are plain objects, to test the caching policy without decoding videos."""
+
+    def _open_decoder(self, video_path):
+        decoder = SimpleNamespace(path=video_path, metadata=SimpleNamespace(width=4, height=2))
+        return decoder, io.BytesIO()
+
+
+FRAME_BYTES = 4 * 2 * 3 * DECODER_BUFFERED_FRAMES
+
+
+def test_decoder_cache_hits_and_misses():
+    cache = _InMemoryDecoderCache(max_decoders=None)
+    first = cache.get_decoder("a.mp4")
+    assert cache.get_decoder("a.mp4") is first
+    cache.get_decoder("b.mp4")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 0
+    assert stats["size"] == 2
+    assert stats["bytes"] == 2 * FRAME_BYTES
+
+
+def test_decoder_cache_evicts_least_recently_used():
+    cache = _InMemoryDecoderCache(max_decoders=2)
+    cache.get_decoder("a.mp4")
+    cache.get_decoder("b.mp4")
+    cache.get_decoder("a.mp4")  # "b.mp4" becomes the least recently used
+    cache.get_decoder("c.mp4")
+
+    assert cache.size() == 2
+    assert cache.stats()["evictions"] == 1
+    assert set(cache._cache) == {"a.mp4", "c.mp4"}
+
+
+def test_decoder_cache_bounded_by_bytes():
+    cache = _InMemoryDecoderCache(max_decoders=None, max_bytes=2 * FRAME_BYTES)
+    for i in range(5):
+        cache.get_decoder(f"{i}.mp4")
+
+    assert cache.size() == 2
+    assert cache.stats()["bytes"] == 2 * FRAME_BYTES
+    assert cache.stats()["evictions"] == 3
+
+
+def test_decoder_cache_keeps_last_decoder_above_byte_budget():
+    cache = _InMemoryDecoderCache(max_bytes=1)
+    decoder = cache.get_decoder("a.mp4")
+    assert cache.size() == 1
+    assert cache.get_decoder("a.mp4") is decoder
+
+
+def test_decoder_cache_reinitialized_in_new_process():
+    cache = _InMemoryDecoderCache()
+    cache.get_decoder("a.mp4")
+    cache._pid = -1  # Simulate access from a forked worker
+
+    assert cache.size() == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_decoder_cache_pickle_drops_decoders():
+    cache = _InMemoryDecoderCache(max_decoders=3, max_bytes=1000)
+    cache.get_decoder("a.mp4")
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.max_decoders == 3
+    assert restored.max_bytes == 1000
+    assert restored.size() == 0
+
+
+def test_decoder_cache_clear_closes_file_handles():
+    cache = _InMemoryDecoderCache()
+    cache.get_decoder("a.mp4")
+    file_handle = cache._cache["a.mp4"][1]
+    cache.clear()
+
+    assert file_handle.closed
+    assert cache.size() == 0
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"max_decoders": 0}, {"max_bytes": 0}])
+def test_decoder_cache_invalid_bounds(kwargs):
+    with pytest.raises(ValueError):
+        VideoDecoderCache(**kwargs)
+
+
+def test_decoded_frame_cache_bounded_by_bytes():
+    cache = DecodedFrameCache(max_bytes=2 * 12)
+    for i in range(3):
+        cache.put("a.mp4", i, torch.full((3, 2, 2), i, dtype=torch.uint8), pts=i / 10)
+
+    assert cache.size() == 2
+    assert cache.get("a.mp4", 0) is None
+    frame, pts = cache.get("a.mp4", 2)
+    assert torch.equal(frame, torch.full((3, 2, 2), 2, dtype=torch.uint8))
+    assert pts == 0.2
+    assert cache.stats() == {"size": 2, "bytes": 24, "hits": 1, "misses": 1, "evictions": 1}
+
+
+def test_decoded_frame_cache_rejects_float_frames():
+    cache = DecodedFrameCache(max_bytes=1000)
+    with pytest.raises(TypeError):
+        cache.put("a.mp4", 0, torch.zeros(3, 2, 2), pts=0.0)
+
+
+def test_get_frames_at_with_cache_only_decodes_missing_frames():
+    requested = []
+
+    def get_frames_at(indices):
+        requested.append(indices)
+        data = torch.stack([torch.full((3, 2, 2), i, dtype=torch.uint8) for i in indices])
+        return SimpleNamespace(data=data, pts_seconds=torch.tensor(indices, dtype=torch.float64) / 10)
+
+    decoder = SimpleNamespace(get_frames_at=get_frames_at)
+    cache = DecodedFrameCache(max_bytes=1000)
+
+    _get_frames_at_with_cache(decoder, "a.mp4", [0, 1, 2], cache)
+    frames = _get_frames_at_with_cache(decoder, "a.mp4", [3, 1, 2], cache)
+
+    assert requested == [[0, 1, 2], [3]]
+    assert [pts for _, pts in frames] == [0.3, 0.1, 0.2]
+    assert [frame[0, 0, 0].item() for frame, _ in frames] == [3, 1, 2]
+
+
+class _RangeDecoder:
+    """Decoder of a 10 fps video of 20 frames, whose pixels hold the frame index."""
+
+    metadata = SimpleNamespace(average_fps=10)
+
+    def __init__(self):
+        self.ranges = []
+
+    def __len__(self):
+        return 20
+
+    def get_frames_in_range(self, start, stop):
+        self.ranges.append((start, stop))
+        data = torch.stack([torch.full((3, 2, 2), i, dtype=torch.uint8) for i in range(start, stop)])
+        return SimpleNamespace(data=data, pts_seconds=torch.arange(start, stop, dtype=torch.float64) / 10)
+
+
+class _RangeDecoderCache(VideoDecoderCache):
+    def _open_decoder(self, video_path):
+        return _RangeDecoder(), io.BytesIO()
+
+
+def test_video_segment_prefetcher_decodes_segments_sequentially():
+    prefetcher = VideoSegmentPrefetcher(DecodedFrameCache(max_bytes=1000), chunk_size=4)
+    prefetcher._decoder_cache = _RangeDecoderCache()
+
+    prefetcher.prefetch("a.mp4", 0.5, 1.5)
+    prefetcher.prefetch("a.mp4", 0.5, 1.5)  # already scheduled
+    prefetcher.wait("a.mp4", [0.7])
+    decoder = prefetcher._decoder_cache.get_decoder("a.mp4")
+
+    assert decoder.ranges == [(5, 9), (9, 13), (13, 15)]
+    frame, pts = prefetcher.frame_cache.get("a.mp4", 7)
+    assert frame[0, 0, 0].item() == 7
+    assert pts == 0.7
+    assert prefetcher.frame_cache.get("a.mp4", 4) is None
+
+    # The segment end is clipped to the length of the video, and cached chunks are not decoded again
+    prefetcher.prefetch("a.mp4", 1.0, 3.0)
+    prefetcher.wait("a.mp4", [1.9])
+    assert decoder.ranges[3:] == [(14, 18), (18, 20)]
+    prefetcher.close()
+
+
+def test_video_segment_prefetcher_raises_decoding_errors():
+    class _FailingDecoderCache(VideoDecoderCache):
+        def _open_decoder(self, video_path):
+            raise FileNotFoundError(video_path)
+
+    prefetcher = VideoSegmentPrefetcher(DecodedFrameCache(max_bytes=1000))
+    prefetcher._decoder_cache = _FailingDecoderCache()
+    prefetcher.prefetch("missing.mp4", 0.0, 1.0)
+
+    prefetcher.wait("other.mp4", [0.5])  # unrelated videos do not wait on the segment
+    with pytest.raises(FileNotFoundError):
+        prefetcher.wait("missing.mp4", [0.5])
+    prefetcher.close()
+
+
+def test_video_segment_prefetcher_pickle_drops_segments():
+    prefetcher = VideoSegmentPrefetcher(DecodedFrameCache(max_bytes=1000), num_threads=3, max_segments=5)
+    prefetcher._decoder_cache = _RangeDecoderCache()
+    prefetcher.prefetch("a.mp4", 0.0, 1.0)
+    prefetcher.wait("a.mp4", [0.0])
+
+    restored = pickle.loads(pickle.dumps(prefetcher))
+    assert restored.num_threads == 3
+    assert restored.max_segments == 5
+    assert len(restored._segments) == 0
+    assert restored.frame_cache.size() == 0
+    prefetcher.close()
+
+
+def test_streaming_video_encoder(tmp_path):
+    video_path = tmp_path / "video.mp4"
+    encoder = StreamingVideoEncoder(video_path, fps=10)
+    for _ in range(5):
+        encoder.add_frame(np.random.randint(0, 256, (32, 48, 3), dtype=np.uint8))
+    # Channel-first float frames are supported as well
+    encoder.add_frame(np.random.rand(3, 32, 48).astype(np.float32))
+    # As well as PIL images of any mode
+    encoder.add_frame(Image.fromarray(np.zeros((32, 48), dtype=np.uint8), mode="L"))
+
+    assert encoder.finish() == video_path
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        assert (stream.width, stream.height) == (48, 32)
+        assert sum(1 for _ in container.decode(stream)) == 7
+
+
+def test_streaming_video_encoder_cancel(tmp_path):
+    video_path = tmp_path / "video.mp4"
+    encoder = StreamingVideoEncoder(video_path, fps=10)
+    encoder.add_frame(np.zeros((32, 48, 3), dtype=np.uint8))
+    encoder.cancel()
+
+    assert not video_path.exists()
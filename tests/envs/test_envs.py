@@ -75,6 +75,26 @@ def test_factory(env_name):
     env.close()
 
 
+def test_preprocess_observation_does_not_share_memory():
+    observation = {
+        "pixels": np.random.randint(0, 256, size=(2, 8, 8, 3), dtype=np.uint8),
+        "agent_pos": np.random.rand(2, 3).astype(np.float32),
+        "environment_state": np.random.rand(2, 4).astype(np.float32),
+    }
+    expected_pixels = torch.from_numpy(observation["pixels"]).permute(0, 3, 1, 2).float() / 255
+    expected_state = torch.from_numpy(observation["agent_pos"]).clone()
+
+    obs = preprocess_observation(observation)
+    # Vector envs created with `copy=False` overwrite their observation buffers at the next step.
+    for array in observation.values():
+        array[...] = 0
+
+    assert obs["observation.image"].is_contiguous()
+    torch.testing.assert_close(obs["observation.image"], expected_pixels)
+    torch.testing.assert_close(obs["observation.state"], expected_state)
+    assert obs["observation.environment_state"].abs().sum() > 0
+
+
 def test_factory_custom_gym_id():
     gym_id = "dummy_gym_pkg/DummyTask-v0"
     if gym_id in gym_registry:
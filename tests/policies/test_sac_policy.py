@@ -495,6 +495,60 @@ def test_sac_policy_with_critics_number_of_heads(num_critics: int):
     optimizers["critic"].step()
 
 
+def compute_critic_loss_and_td_errors(
+    policy: SACPolicy, batch: dict[str, Tensor], weights: Tensor | None = None
+) -> tuple[Tensor, Tensor]:
+    # The actions of the next states are sampled, so they are made the same across calls
+    with seeded_context(0):
+        return policy.compute_loss_critic(
+            observations=batch["state"],
+            actions=batch[ACTION],
+            rewards=batch["reward"],
+            next_observations=batch["next_state"],
+            done=batch["done"],
+            weights=weights,
+            return_td_errors=True,
+        )
+
+
+def test_sac_policy_critic_loss_with_weights_and_td_errors():
+    batch_size = 4
+    config = create_default_config(state_dim=10, continuous_action_dim=10)
+    # With a single critic, the TD errors are those of the loss
+    config.num_critics = 1
+    policy = SACPolicy(config=config)
+    batch = create_default_train_batch(batch_size=batch_size)
+
+    loss, td_errors = compute_critic_loss_and_td_errors(policy, batch)
+    weights = torch.rand(batch_size)
+    weighted_loss, weighted_td_errors = compute_critic_loss_and_td_errors(policy, batch, weights=weights)
+
+    assert td_errors.shape == (batch_size,)
+    assert not td_errors.requires_grad
+    assert torch.all(td_errors >= 0)
+    torch.testing.assert_close(loss, (td_errors**2).mean())
+    # The weights scale the loss of each transition, not its TD error
+    torch.testing.assert_close(weighted_td_errors, td_errors)
+    torch.testing.assert_close(weighted_loss, (weights * td_errors**2).mean())
+
+
+@pytest.mark.parametrize("num_critics", [1, 3])
+def test_sac_policy_critic_loss_with_unit_weights(num_critics: int):
+    config = create_default_config(state_dim=10, continuous_action_dim=10)
+    config.num_critics = num_critics
+    policy = SACPolicy(config=config)
+    batch = create_default_train_batch()
+
+    loss, td_errors = compute_critic_loss_and_td_errors(policy, batch)
+    weighted_loss, weighted_td_errors = compute_critic_loss_and_td_errors(
+        policy, batch, weights=torch.ones(len(batch[ACTION]))
+    )
+
+    torch.testing.assert_close(weighted_loss, loss)
+    torch.testing.assert_close(weighted_td_errors, td_errors)
+    assert policy.forward(batch, model="critic")["td_errors"].shape == td_errors.shape
+
+
 def test_sac_policy_save_and_load(tmp_path):
     root = tmp_path / "test_sac_save_and_load"
 
@@ -19,9 +19,14 @@ import pytest
 import torch
 
 from lerobot.configs.types import FeatureType, PipelineFeatureType, PolicyFeature
-from lerobot.processor import DataProcessorPipeline, DeviceProcessorStep, TransitionKey
+from lerobot.processor import (
+    DataProcessorPipeline,
+    DeviceProcessorStep,
+    ImageToFloatProcessorStep,
+    TransitionKey,
+)
 from lerobot.processor.converters import create_transition, identity_transition
-from lerobot.utils.constants import ACTION, OBS_IMAGE, OBS_STATE
+from lerobot.utils.constants import ACTION, OBS_IMAGE, OBS_IMAGES, OBS_STATE
 
 
 def test_basic_functionality():
@@ -1156,3 +1161,34 @@ def test_mps_serialization():
     # Test load_state_dict (should be no-op)
     processor.load_state_dict({})
     assert processor.device == "mps"
+
+
+def test_image_to_float_processor():
+    """Test that uint8 images are scaled to [0, 1] while other tensors are left untouched."""
+    processor = ImageToFloatProcessorStep()
+
+    image = torch.randint(0, 256, (3, 8, 8), dtype=torch.uint8)
+    float_image = torch.rand(3, 8, 8)
+    state = torch.randint(0, 256, (10,), dtype=torch.uint8)
+    observation = {OBS_IMAGE: image, f"{OBS_IMAGES}.wrist": float_image, OBS_STATE: state}
+
+    result = processor(create_transition(observation=observation))
+    processed_obs = result[TransitionKey.OBSERVATION]
+
+    assert processed_obs[OBS_IMAGE].dtype == torch.float32
+    torch.testing.assert_close(processed_obs[OBS_IMAGE], image.float() / 255)
+    assert processed_obs[f"{OBS_IMAGES}.wrist"] is float_image
+    assert processed_obs[OBS_STATE] is state
+
+
+def test_image_to_float_processor_dtype():
+    """Test the float dtype option and its validation."""
+    processor = ImageToFloatProcessorStep(float_dtype="bfloat16")
+    observation = {OBS_IMAGE: torch.full((3, 2, 2), 255, dtype=torch.uint8)}
+
+    result = processor(create_transition(observation=observation))
+    assert result[TransitionKey.OBSERVATION][OBS_IMAGE].dtype == torch.bfloat16
+    assert processor.get_config() == {"float_dtype": "bfloat16"}
+
+    with pytest.raises(ValueError, match="Invalid float_dtype"):
+        ImageToFloatProcessorStep(float_dtype="int8")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from queue import Queue
+from threading import Event
+from unittest.mock import patch
+
+import torch
+
+from lerobot.rl.buffer import ReplayBuffer, concatenate_batch_transitions, stack_transitions
+from lerobot.teleoperators.utils import TeleopEvents
+from lerobot.utils.constants import ACTION, OBS_STATE
+from lerobot.utils.transition import Transition
+from tests.utils import require_package
+
+
+def create_transitions(count: int) -> list[Transition]:
+    return [
+        Transition(
+            state={OBS_STATE: torch.randn(4)},
+            action=torch.randn(2),
+            reward=torch.tensor(float(i)),
+            done=torch.tensor(False),
+            truncated=torch.tensor(False),
+            next_state={OBS_STATE: torch.randn(4)},
+            complementary_info={},
+        )
+        for i in range(count)
+    ]
+
+
+def create_replay_buffer(num_transitions: int = 0, prioritized: bool = False) -> ReplayBuffer:
+    buffer = ReplayBuffer(
+        8, "cpu", [OBS_STATE], use_drq=False, prioritized=prioritized, priority_alpha=1.0, priority_eps=0.0
+    )
+    for transition in create_transitions(num_transitions):
+        buffer.add(**transition)
+    return buffer
+
+
+@require_package("grpc")
+def test_update_replay_buffer_priorities_of_concatenated_batch():
+    from lerobot.rl.learner import update_replay_buffer_priorities
+
+    online_buffer = create_replay_buffer(4, prioritized=True)
+    offline_buffer = create_replay_buffer(2, prioritized=True)
+    # Transitions of equal priority are each sampled once when the whole buffer is sampled
+    online_batch, offline_batch = online_buffer.sample(4), offline_buffer.sample(2)
+    assert online_batch["indices"].tolist() == [0, 1, 2, 3]
+    assert offline_batch["indices"].tolist() == [0, 1]
+    online_indices, online_write_counts = online_batch["indices"], online_batch["write_counts"]
+    offline_indices, offline_write_counts = offline_batch["indices"], offline_batch["write_counts"]
+    batch = concatenate_batch_transitions(online_batch, offline_batch)
+    assert len(batch[ACTION]) == 6
+
+    # The online transitions come first in the concatenated batch, followed by the offline ones
+    td_errors = torch.tensor([1.0, -2.0, 3.0, 4.0, -5.0, 6.0])
+    update_replay_buffer_priorities(
+        td_errors=td_errors,
+        replay_buffer=online_buffer,
+        online_indices=online_indices,
+        online_write_counts=online_write_counts,
+        offline_replay_buffer=offline_buffer,
+        offline_indices=offline_indices,
+        offline_write_counts=offline_write_counts,
+    )
+
+    online_priorities = online_buffer.priorities.get(torch.arange(4))
+    offline_priorities = offline_buffer.priorities.get(torch.arange(2))
+    torch.testing.assert_close(online_priorities, torch.tensor([1.0, 2.0, 3.0, 4.0], dtype=torch.float64))
+    torch.testing.assert_close(offline_priorities, torch.tensor([5.0, 6.0], dtype=torch.float64))
+
+
+@require_package("grpc")
+def test_update_replay_buffer_priorities_with_uniform_offline_buffer():
+    from lerobot.rl.learner import update_replay_buffer_priorities
+
+    online_buffer = create_replay_buffer(2, prioritized=True)
+    offline_buffer = create_replay_buffer(2)
+    online_batch = online_buffer.sample(2)
+    online_indices, online_write_counts = online_batch["indices"], online_batch["write_counts"]
+    offline_batch = offline_buffer.sample(2)
+    assert "indices" not in offline_batch
+    concatenate_batch_transitions(online_batch, offline_batch)
+
+    update_replay_buffer_priorities(
+        td_errors=torch.tensor([2.0, 3.0, 7.0, 7.0]),
+        replay_buffer=online_buffer,
+        online_indices=online_indices,
+        online_write_counts=online_write_counts,
+        offline_replay_buffer=offline_buffer,
+    )
+
+    online_priorities = online_buffer.priorities.get(torch.arange(2))
+    torch.testing.assert_close(online_priorities, torch.tensor([2.0, 3.0], dtype=torch.float64))
+    assert online_buffer.max_priority == 3.0
+
+
+@require_package("grpc")
+def test_update_replay_buffer_priorities_skips_overwritten_transitions():
+    from lerobot.rl.learner import update_replay_buffer_priorities
+
+    online_buffer = ReplayBuffer(2, "cpu", [OBS_STATE], use_drq=False, prioritized=True, priority_alpha=1.0)
+    for transition in create_transitions(2):
+        online_buffer.add(**transition)
+    batch = online_buffer.sample(2)
+    # The transition at index 0 is overwritten while the batch is being trained on
+    online_buffer.add(**create_transitions(1)[0])
+
+    update_replay_buffer_priorities(
+        td_errors=torch.tensor([4.0, 4.0]),
+        replay_buffer=online_buffer,
+        online_indices=batch["indices"],
+        online_write_counts=batch["write_counts"],
+    )
+
+    online_priorities = online_buffer.priorities.get(torch.arange(2))
+    expected_priorities = torch.tensor([1.0, 4.0 + online_buffer.priority_eps], dtype=torch.float64)
+    torch.testing.assert_close(online_priorities, expected_priorities)
+
+
+def create_actor_transitions(is_intervention: list[bool | None]) -> list[Transition]:
+    """Transitions rewarded by their position, whose intervention flag is only set when not None."""
+    transitions = create_transitions(len(is_intervention))
+    for transition, intervention in zip(transitions, is_intervention, strict=True):
+        transition["complementary_info"] = {"discrete_penalty": torch.tensor([0.0])}
+        if intervention is not None:
+            transition["complementary_info"][TeleopEvents.IS_INTERVENTION] = intervention
+    return transitions
+
+
+def test_stack_transitions_fills_missing_complementary_info():
+    batch = stack_transitions(create_actor_transitions([None, True, False, None]))
+
+    assert batch["complementary_info"][TeleopEvents.IS_INTERVENTION].tolist() == [False, True, False, False]
+    assert batch["complementary_info"]["discrete_penalty"].shape == (4,)
+
+
+@require_package("grpc")
+def test_get_nan_transitions_mask():
+    from lerobot.rl.learner import get_nan_transitions_mask
+
+    batch = stack_transitions(create_transitions(4))
+    batch["state"][OBS_STATE][1, 0] = torch.nan
+    batch["next_state"][OBS_STATE][2, 3] = torch.nan
+    batch[ACTION][3, 1] = torch.nan
+
+    assert get_nan_transitions_mask(batch).tolist() == [False, True, True, True]
+
+
+@require_package("grpc")
+def test_process_transitions_with_nan_transitions_and_interventions():
+    from lerobot.rl.learner import process_transitions
+
+    # Only some transitions of a chunk carry the intervention flag, including one with NaN values
+    mixed_chunk = create_actor_transitions([None, True, True, False, None, True])
+    mixed_chunk[2]["state"][OBS_STATE][0] = torch.nan
+    mixed_chunk[4][ACTION][0] = torch.nan
+    transition_queue = Queue()
+    for chunk in (mixed_chunk, [], create_actor_transitions([None, None])):
+        transition_queue.put(chunk)
+    replay_buffer, offline_replay_buffer = create_replay_buffer(), create_replay_buffer()
+
+    # Chunks are put in the queue as they are, instead of being serialized
+    with patch("lerobot.rl.learner.bytes_to_transitions", side_effect=lambda buffer: buffer):
+        process_transitions(
+            transition_queue=transition_queue,
+            replay_buffer=replay_buffer,
+            offline_replay_buffer=offline_replay_buffer,
+            device="cpu",
+            dataset_repo_id="dummy/offline",
+            shutdown_event=Event(),
+        )
+
+    assert transition_queue.empty()
+    # The transitions with NaN values are skipped, and only the interventions go to the offline buffer
+    assert replay_buffer.rewards[: len(replay_buffer)].tolist() == [0.0, 1.0, 3.0, 5.0, 0.0, 1.0]
+    assert offline_replay_buffer.rewards[: len(offline_replay_buffer)].tolist() == [1.0, 5.0]
@@ -372,3 +372,41 @@ def test_stream_parameters_waits_and_retries_on_empty_queue():
     close_learner_service_stub(channel, server)
 
     assert received_params == [b"param_after_wait", b"param_after_wait_2"]
+
+
+@require_package("grpc")
+@pytest.mark.timeout(3)  # force cross-platform watchdog
+def test_stream_parameters_sends_missed_keyframe_before_delta():
+    from torch import nn
+
+    from lerobot.rl.parameter_sync import ParameterPublisher
+    from lerobot.transport import services_pb2
+
+    """Test that a delta is preceded by its keyframe when the keyframe was dropped from the queue."""
+    shutdown_event = Event()
+    parameters_queue = Queue()
+    transitions_queue = Queue()
+    interactions_queue = Queue()
+
+    client, channel, server = create_learner_service_stub(
+        shutdown_event, parameters_queue, transitions_queue, interactions_queue, seconds_between_pushes=0.1
+    )
+
+    module = nn.Linear(2, 2)
+    publisher = ParameterPublisher(keyframe_frequency=10)
+    keyframe = publisher.make_message({"policy": module})
+    module.bias.data.add_(1.0)
+    delta = publisher.make_message({"policy": module})
+    parameters_queue.put(keyframe)
+    parameters_queue.put(delta)
+
+    received_params = []
+    for response in client.StreamParameters(services_pb2.Empty()):
+        received_params.append(response.data)
+        if len(received_params) == 2:
+            break
+
+    shutdown_event.set()
+    close_learner_service_stub(channel, server)
+
+    assert received_params == [keyframe, delta]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+import pytest
+import torch
+from torch import nn
+
+from tests.utils import require_package
+
+
+def make_module() -> nn.Module:
+    module = nn.Sequential(nn.Linear(4, 8), nn.BatchNorm1d(8), nn.Linear(8, 2))
+    # Stands for a frozen vision encoder
+    module[0].requires_grad_(False)
+    return module
+
+
+def perturb(module: nn.Module, index: int):
+    with torch.no_grad():
+        module[index].weight.add_(torch.randn_like(module[index].weight))
+
+
+def assert_same_parameters(module: nn.Module, expected: nn.Module, atol: float = 0.0):
+    for (key, value), expected_value in zip(
+        module.state_dict().items(), expected.state_dict().values(), strict=True
+    ):
+        torch.testing.assert_close(value, expected_value, atol=atol, rtol=0, msg=key)
+
+
+@require_package("grpc")
+def test_deltas_only_send_changed_parameters():
+    from lerobot.rl.parameter_sync import ParameterPublisher, ParameterSubscriber, read_parameters_header
+    from lerobot.transport.utils import bytes_to_tensors
+
+    learner, actor = make_module(), make_module()
+    publisher = ParameterPublisher(keyframe_frequency=3)
+    subscriber = ParameterSubscriber()
+
+    keyframe = publisher.make_message({"policy": learner})
+    assert read_parameters_header(keyframe).is_keyframe
+    assert subscriber.load_message(keyframe, {"policy": actor}, device="cpu")
+    assert_same_parameters(actor, learner)
+
+    perturb(learner, 2)
+    delta = publisher.make_message({"policy": learner})
+    header = read_parameters_header(delta)
+    assert (header.version, header.base_version) == (2, 1)
+    delta_tensors = bytes_to_tensors(delta)
+    assert set(delta_tensors) - {"__publisher_id__", "__version__", "__base_version__"} == {"policy/2.weight"}
+    assert delta_tensors["policy/2.weight"].dtype == torch.bfloat16
+    assert len(delta) < len(keyframe)
+    assert subscriber.load_message(delta, {"policy": actor}, device="cpu")
+    assert_same_parameters(actor, learner, atol=1e-2)
+
+    # The third push is relative to the first keyframe too, and the fourth one is a new keyframe
+    perturb(learner, 2)
+    assert read_parameters_header(publisher.make_message({"policy": learner})).base_version == 1
+    assert read_parameters_header(publisher.make_message({"policy": learner})).is_keyframe
+
+
+@require_package("grpc")
+def test_deltas_keep_sending_parameters_changed_since_keyframe():
+    from lerobot.rl.parameter_sync import ParameterPublisher, ParameterSubscriber
+    from lerobot.transport.utils import bytes_to_tensors
+
+    learner, actor = make_module(), make_module()
+    publisher = ParameterPublisher(keyframe_frequency=10)
+    subscriber = ParameterSubscriber()
+    assert subscriber.load_message(publisher.make_message({"policy": learner}), {"policy": actor}, "cpu")
+
+    original = copy.deepcopy(learner[2].state_dict())
+    perturb(learner, 2)
+    assert subscriber.load_message(publisher.make_message({"policy": learner}), {"policy": actor}, "cpu")
+
+    # The parameter went back to its keyframe value, but the actor holds the one of the previous delta
+    learner[2].load_state_dict(original)
+    delta = publisher.make_message({"policy": learner})
+    assert "policy/2.weight" in bytes_to_tensors(delta)
+    assert subscriber.load_message(delta, {"policy": actor}, device="cpu")
+    assert_same_parameters(actor, learner)
+
+
+@require_package("grpc")
+def test_subscriber_skips_stale_and_orphan_deltas():
+    from lerobot.rl.parameter_sync import ParameterPublisher, ParameterSubscriber
+
+    learner, actor = make_module(), make_module()
+    publisher = ParameterPublisher(keyframe_frequency=10)
+    keyframe = publisher.make_message({"policy": learner})
+    perturb(learner, 2)
+    delta = publisher.make_message({"policy": learner})
+
+    # A delta whose keyframe was never received is not loaded
+    subscriber = ParameterSubscriber()
+    initial = copy.deepcopy(actor)
+    assert not subscriber.load_message(delta, {"policy": actor}, device="cpu")
+    assert_same_parameters(actor, initial)
+
+    assert subscriber.load_message(keyframe, {"policy": actor}, device="cpu")
+    assert subscriber.load_message(delta, {"policy": actor}, device="cpu")
+    assert not subscriber.load_message(keyframe, {"policy": actor}, device="cpu")
+    assert subscriber.version == 2
+
+    # A restarted learner starts over from version 1
+    restarted = ParameterPublisher()
+    assert subscriber.load_message(restarted.make_message({"policy": learner}), {"policy": actor}, "cpu")
+
+
+@require_package("grpc")
+@pytest.mark.parametrize("dtype", ["float16", "bfloat16"])
+def test_trainable_only_and_low_precision(dtype):
+    from lerobot.rl.parameter_sync import ParameterPublisher, ParameterSubscriber
+    from lerobot.transport.utils import bytes_to_tensors
+
+    learner, actor = make_module(), make_module()
+    actor[0].load_state_dict(learner[0].state_dict())
+    publisher = ParameterPublisher(trainable_only=True, dtype=dtype)
+
+    message = publisher.make_message({"policy": learner})
+    tensors = bytes_to_tensors(message)
+    assert "policy/0.weight" not in tensors
+    assert "policy/1.running_mean" in tensors
+    assert tensors["policy/2.weight"].dtype == getattr(torch, dtype)
+
+    assert ParameterSubscriber().load_message(message, {"policy": actor}, device="cpu")
+    assert_same_parameters(actor, learner, atol=1e-2)
+
+
+@require_package("grpc")
+def test_publisher_invalid_arguments():
+    from lerobot.rl.parameter_sync import ParameterPublisher
+
+    with pytest.raises(ValueError, match="dtype"):
+        ParameterPublisher(dtype="int8")
+    with pytest.raises(ValueError, match="keyframe_frequency"):
+        ParameterPublisher(keyframe_frequency=0)
@@ -20,7 +20,7 @@ from queue import Queue
 
 from torch.multiprocessing import Queue as TorchMPQueue
 
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.queue import get_all_items_from_queue, get_last_item_from_queue
 
 
 def test_get_last_item_single_item():
@@ -164,3 +164,17 @@ def test_get_last_item_blocking_waits_for_item():
 
     assert result == ["item2"]
     assert queue.empty()
+
+
+def test_get_all_items_from_queue():
+    """Test draining every item, in order, and returning an empty list on an empty queue."""
+    queue = Queue()
+    items = ["first", None, "last"]
+
+    for item in items:
+        queue.put(item)
+
+    assert get_all_items_from_queue(queue) == items
+    assert queue.empty()
+    assert get_all_items_from_queue(queue, block=True, timeout=0.01) == []
+    assert get_all_items_from_queue(queue, block=False) == []
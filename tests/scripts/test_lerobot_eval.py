@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import sys
+import types
+from dataclasses import dataclass, field
+
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.envs.registration import register, registry as gym_registry
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.envs.configs import EnvConfig
+from lerobot.envs.factory import make_env, make_env_pre_post_processors
+from lerobot.envs.utils import close_envs, get_envs_task
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.act.modeling_act import ACTPolicy
+from lerobot.policies.factory import make_pre_post_processors
+from lerobot.scripts.lerobot_eval import eval_policy, eval_policy_all_multiprocess, eval_policy_continuous
+from lerobot.utils.constants import ACTION, OBS_ENV_STATE, OBS_STATE
+
+MAX_EPISODE_STEPS = 12
+SEED_LENGTH_GYM_ID = "lerobot_test/SeedLength-v0"
+
+
+class SeedLengthEnv(gym.Env):
+    """Episodes last `2 + seed % 5` steps, get a reward of 1 per step and succeed when their length is even."""
+
+    metadata = {"render_modes": ["rgb_array"], "render_fps": 10}
+    _max_episode_steps = MAX_EPISODE_STEPS
+
+    def __init__(self):
+        self.observation_space = gym.spaces.Dict(
+            {
+                "agent_pos": gym.spaces.Box(-1, 1, shape=(2,), dtype=np.float32),
+                "environment_state": gym.spaces.Box(-1, 1, shape=(2,), dtype=np.float32),
+            }
+        )
+        self.action_space = gym.spaces.Box(-1, 1, shape=(2,), dtype=np.float32)
+        self.render_mode = "rgb_array"
+        self.task = "seed_length"
+        self.task_description = "wait for the episode to end"
+        self.length = 2
+        self.step_ix = 0
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.length = 2 + (seed % 5 if seed is not None else 0)
+        self.step_ix = 0
+        return self._obs(), {}
+
+    def step(self, action):
+        self.step_ix += 1
+        terminated = self.step_ix >= self.length
+        info = {"is_success": terminated and self.length % 2 == 0}
+        return self._obs(), 1.0, terminated, False, info
+
+    def render(self):
+        return np.full((8, 8, 3), self.step_ix, dtype=np.uint8)
+
+    def _obs(self):
+        state = np.array([self.step_ix, self.length], dtype=np.float32) / 10
+        return {"agent_pos": state, "environment_state": state}
+
+
+if SEED_LENGTH_GYM_ID not in gym_registry:
+    register(id=SEED_LENGTH_GYM_ID, entry_point=SeedLengthEnv, max_episode_steps=MAX_EPISODE_STEPS)
+
+
+@EnvConfig.register_subclass("seed_length")
+@dataclass
+class SeedLengthEnvConfig(EnvConfig):
+    task: str = "SeedLength-v0"
+    features: dict[str, PolicyFeature] = field(default_factory=dict)
+
+    @property
+    def package_name(self) -> str:
+        # Importing this module registers the env in the worker processes.
+        return __name__
+
+    @property
+    def gym_id(self) -> str:
+        return SEED_LENGTH_GYM_ID
+
+    @property
+    def gym_kwargs(self) -> dict:
+        return {}
+
+
+NUM_SUITE_TASKS = 3
+
+
+def create_seed_length_suite_envs(task, n_envs, env_cls, **kwargs):
+    """Like `create_libero_envs`, builds one vec env per task with `env_cls(fns)` and no autoreset mode."""
+    return {
+        task: {
+            task_id: env_cls([lambda: gym.make(SEED_LENGTH_GYM_ID) for _ in range(n_envs)])
+            for task_id in range(NUM_SUITE_TASKS)
+        }
+    }
+
+
+def make_seed_length_suite_module() -> types.ModuleType:
+    """Stands for `lerobot.envs.libero`, so that `make_env` builds LIBERO configs with the suite above."""
+    module = types.ModuleType("lerobot.envs.libero")
+    module.create_libero_envs = create_seed_length_suite_envs
+    return module
+
+
+@EnvConfig.register_subclass("libero_seed_length")
+@dataclass
+class SeedLengthSuiteEnvConfig(EnvConfig):
+    """Multi-task suite of `SeedLengthEnv`, built by `make_env` like a LIBERO suite."""
+
+    task: str = "seed_length_suite"
+    camera_name: str = "none"
+    init_states: bool = False
+    features: dict[str, PolicyFeature] = field(default_factory=dict)
+
+    @property
+    def gym_kwargs(self) -> dict:
+        return {}
+
+    def __setstate__(self, state):
+        # Eval workers are spawned processes, which unpickle the config before building their envs
+        sys.modules["lerobot.envs.libero"] = make_seed_length_suite_module()
+        self.__dict__.update(state)
+
+
+@pytest.fixture
+def seed_length_suite(monkeypatch):
+    monkeypatch.setitem(sys.modules, "lerobot.envs.libero", make_seed_length_suite_module())
+
+
+def make_vec_env(num_envs):
+    return gym.vector.SyncVectorEnv(
+        [
+            lambda: gym.wrappers.TimeLimit(SeedLengthEnv(), max_episode_steps=MAX_EPISODE_STEPS)
+            for _ in range(num_envs)
+        ],
+        autoreset_mode=gym.vector.AutoresetMode.SAME_STEP,
+    )
+
+
+def make_act_policy(**kwargs):
+    config = ACTConfig(
+        device="cpu",
+        input_features={
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(2,)),
+            OBS_ENV_STATE: PolicyFeature(type=FeatureType.ENV, shape=(2,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(2,))},
+        dim_model=16,
+        n_heads=2,
+        dim_feedforward=32,
+        n_encoder_layers=1,
+        n_decoder_layers=1,
+        use_vae=False,
+        **kwargs,
+    )
+    policy = ACTPolicy(config)
+    preprocessor, postprocessor = make_pre_post_processors(config)
+    env_preprocessor, env_postprocessor = make_env_pre_post_processors(SeedLengthEnvConfig())
+    return policy, {
+        "env_preprocessor": env_preprocessor,
+        "env_postprocessor": env_postprocessor,
+        "preprocessor": preprocessor,
+        "postprocessor": postprocessor,
+    }
+
+
+def test_eval_policy_continuous_matches_eval_policy(tmp_path):
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+    n_episodes = 7
+
+    env = make_vec_env(3)
+    expected = eval_policy(env, policy, **processors, n_episodes=n_episodes, start_seed=0)
+    env.close()
+
+    env = make_vec_env(3)
+    n_steps = 0
+    step = env.step
+
+    def counting_step(action):
+        nonlocal n_steps
+        n_steps += 1
+        return step(action)
+
+    env.step = counting_step
+    info = eval_policy_continuous(
+        env,
+        policy,
+        **processors,
+        n_episodes=n_episodes,
+        max_episodes_rendered=2,
+        videos_dir=tmp_path / "videos",
+        start_seed=0,
+    )
+    env.close()
+
+    lengths = [2 + seed % 5 for seed in range(n_episodes)]
+    assert [ep["seed"] for ep in info["per_episode"]] == list(range(n_episodes))
+    assert [ep["sum_reward"] for ep in info["per_episode"]] == lengths
+    assert [ep["success"] for ep in info["per_episode"]] == [length % 2 == 0 for length in lengths]
+    assert [ep["success"] for ep in info["per_episode"]] == [ep["success"] for ep in expected["per_episode"]]
+
+    # Slots are refilled as soon as their episode ends, so the total number of steps stays close to the
+    # ideal sum(lengths) / num_envs rather than the sum of the longest episode of each lockstep batch.
+    assert n_steps < sum(max(lengths[i : i + 3]) for i in range(0, n_episodes, 3))
+
+    assert len(info["video_paths"]) == 2
+    assert all((tmp_path / "videos" / f"eval_episode_{i}.mp4").exists() for i in range(2))
+
+
+def test_eval_policy_continuous_with_multi_task_suite(seed_length_suite):
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+    n_episodes = 5
+
+    envs = make_env(SeedLengthSuiteEnvConfig(), n_envs=2)
+    assert list(envs["seed_length_suite"]) == list(range(NUM_SUITE_TASKS))
+    info = eval_policy_continuous(
+        envs["seed_length_suite"][1], policy, **processors, n_episodes=n_episodes, start_seed=0
+    )
+    close_envs(envs)
+
+    assert [ep["sum_reward"] for ep in info["per_episode"]] == [2 + seed % 5 for seed in range(n_episodes)]
+
+
+def test_eval_policy_continuous_requires_single_step_policy():
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=1, temporal_ensemble_coeff=0.01)
+    env = make_vec_env(2)
+    with pytest.raises(ValueError, match="Continuous batching"):
+        eval_policy_continuous(env, policy, **processors, n_episodes=2)
+    env.close()
+
+
+def test_eval_policy_continuous_requires_action_chunks():
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+    policy.supports_action_chunks = False
+    env = make_vec_env(2)
+    with pytest.raises(ValueError, match="predict_action_chunk"):
+        eval_policy_continuous(env, policy, **processors, n_episodes=2)
+    env.close()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_eval_policy_all_multiprocess(tmp_path, num_workers):
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+    n_episodes = 5
+
+    env = make_vec_env(2)
+    expected = eval_policy_continuous(env, policy, **processors, n_episodes=n_episodes, start_seed=0)
+    env.close()
+
+    info = eval_policy_all_multiprocess(
+        SeedLengthEnvConfig(),
+        policy,
+        **processors,
+        n_episodes=n_episodes,
+        n_envs=2,
+        num_workers=num_workers,
+        max_episodes_rendered=1,
+        videos_dir=tmp_path / "videos",
+        start_seed=0,
+    )
+
+    assert len(info["per_task"]) == 1
+    metrics = info["per_task"][0]["metrics"]
+    assert metrics["sum_rewards"] == [ep["sum_reward"] for ep in expected["per_episode"]]
+    assert metrics["successes"] == [ep["success"] for ep in expected["per_episode"]]
+    assert info["overall"]["n_episodes"] == n_episodes
+    assert info["overall"]["pc_success"] == expected["aggregated"]["pc_success"]
+    assert len(info["overall"]["video_paths"]) == 1
+
+
+def test_eval_policy_all_multiprocess_with_multi_task_suite(seed_length_suite):
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+    n_episodes = 3
+
+    # Each worker builds its shard of the suite with `make_env(..., task_shard=...)`
+    info = eval_policy_all_multiprocess(
+        SeedLengthSuiteEnvConfig(),
+        policy,
+        **processors,
+        n_episodes=n_episodes,
+        n_envs=2,
+        num_workers=2,
+        start_seed=0,
+    )
+
+    assert sorted(task["task_id"] for task in info["per_task"]) == list(range(NUM_SUITE_TASKS))
+    for task in info["per_task"]:
+        assert task["task_group"] == "seed_length_suite"
+        assert task["metrics"]["sum_rewards"] == [2 + seed % 5 for seed in range(n_episodes)]
+    assert info["overall"]["n_episodes"] == n_episodes * NUM_SUITE_TASKS
+
+
+def test_make_env_task_shard():
+    envs = make_env(SeedLengthEnvConfig(), n_envs=2, task_shard=(0, 2))
+    assert list(envs) == ["seed_length"] and list(envs["seed_length"]) == [0]
+    envs["seed_length"][0].close()
+
+    # The only task belongs to the first shard, so nothing is built for the second one
+    assert make_env(SeedLengthEnvConfig(), n_envs=2, task_shard=(1, 2)) == {}
+
+
+def test_make_env_task_shard_with_multi_task_suite(seed_length_suite):
+    envs = make_env(SeedLengthSuiteEnvConfig(), n_envs=1, task_shard=(1, 2))
+    assert list(envs["seed_length_suite"]) == [1]
+    assert all(
+        env.metadata["autoreset_mode"] == gym.vector.AutoresetMode.SAME_STEP
+        for env in envs["seed_length_suite"].values()
+    )
+    close_envs(envs)
+
+
+def test_eval_policy_async_vector_env():
+    policy, processors = make_act_policy(chunk_size=4, n_action_steps=3)
+
+    # Unwrapped envs, so that their task attributes are visible on the sub-environments.
+    env = gym.vector.AsyncVectorEnv(
+        [SeedLengthEnv, SeedLengthEnv],
+        copy=False,
+        autoreset_mode=gym.vector.AutoresetMode.SAME_STEP,
+    )
+    assert get_envs_task(env) == ["wait for the episode to end"] * 2
+    info = eval_policy(env, policy, **processors, n_episodes=4, start_seed=0)
+    env.close()
+
+    env = gym.vector.SyncVectorEnv(
+        [SeedLengthEnv, SeedLengthEnv], autoreset_mode=gym.vector.AutoresetMode.SAME_STEP
+    )
+    assert get_envs_task(env) == ["wait for the episode to end"] * 2
+    expected = eval_policy(env, policy, **processors, n_episodes=4, start_seed=0)
+    env.close()
+
+    assert info["per_episode"] == expected["per_episode"]
@@ -570,3 +570,61 @@ def test_receive_bytes_in_chunks_unknown_state():
 
     with pytest.raises(ValueError, match="Received unknown transfer state"):
         receive_bytes_in_chunks(bad_iterator, output_queue, shutdown_event)
+
+
+@require_package("grpc")
+def test_tensors_to_bytes_roundtrip():
+    import numpy as np
+
+    from lerobot.transport.utils import bytes_to_tensors, tensors_to_bytes
+
+    data = {
+        "state": torch.randn(6),
+        "bf16": torch.randn(2, 3).to(torch.bfloat16),
+        "empty": torch.empty(0, 4),
+        "camera": np.random.randint(0, 256, size=(8, 10, 3), dtype=np.uint8),
+        "joint.pos": np.float32(0.5),
+        "task": "pick the cube",
+    }
+
+    reconstructed = bytes_to_tensors(tensors_to_bytes(data))
+
+    assert list(reconstructed) == list(data)
+    for key in ("state", "bf16", "empty"):
+        assert reconstructed[key].dtype == data[key].dtype
+        assert torch.equal(reconstructed[key], data[key])
+    assert isinstance(reconstructed["camera"], np.ndarray)
+    np.testing.assert_array_equal(reconstructed["camera"], data["camera"])
+    assert reconstructed["joint.pos"] == 0.5
+    assert reconstructed["task"] == "pick the cube"
+
+
+@require_package("grpc")
+def test_tensors_to_bytes_compression_and_float16():
+    import numpy as np
+
+    from lerobot.transport.utils import bytes_to_tensors, tensors_to_bytes
+
+    camera = np.random.randint(0, 256, size=(32, 32, 3), dtype=np.uint8)
+    state = np.linspace(-1, 1, 16)
+
+    reconstructed = bytes_to_tensors(tensors_to_bytes({"camera": camera}, image_compression="png"))
+    np.testing.assert_array_equal(reconstructed["camera"], camera)
+
+    reconstructed = bytes_to_tensors(tensors_to_bytes({"camera": torch.from_numpy(camera)}, "jpeg"))
+    assert isinstance(reconstructed["camera"], torch.Tensor)
+    assert reconstructed["camera"].shape == camera.shape
+
+    data = tensors_to_bytes({"state": state}, use_float16=True)
+    assert len(data) < len(tensors_to_bytes({"state": state}))
+    reconstructed = bytes_to_tensors(data)
+    assert reconstructed["state"].dtype == np.float64
+    np.testing.assert_allclose(reconstructed["state"], state, atol=1e-3)
+
+
+@require_package("grpc")
+def test_bytes_to_tensors_invalid_buffer():
+    from lerobot.transport.utils import bytes_to_tensors
+
+    with pytest.raises(ValueError, match="not a serialized tensor message"):
+        bytes_to_tensors(b"not a tensor message")
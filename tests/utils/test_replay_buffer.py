@@ -21,9 +21,19 @@ import pytest
 import torch
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
-from lerobot.rl.buffer import BatchTransition, ReplayBuffer, random_crop_vectorized
+from lerobot.rl.buffer import (
+    BatchPrefetcher,
+    BatchTransition,
+    ReplayBuffer,
+    SumTree,
+    concatenate_batch_transitions,
+    random_crop_vectorized,
+    select_batch_transitions,
+    stack_transitions,
+)
 from lerobot.utils.constants import ACTION, DONE, OBS_IMAGE, OBS_STATE, OBS_STR, REWARD
 from tests.fixtures.constants import DUMMY_REPO_ID
+from tests.utils import require_cuda
 
 
 def state_dims() -> list[str]:
@@ -553,6 +563,249 @@ def test_memory_optimization():
     )
 
 
+def create_dummy_transitions(num_transitions: int) -> list[dict]:
+    return [
+        {
+            "state": create_dummy_state(),
+            ACTION: create_dummy_action(),
+            "reward": float(i),
+            "next_state": create_dummy_state(),
+            "done": i % 3 == 2,
+            "truncated": False,
+            "complementary_info": {"discrete_penalty": torch.tensor([float(-i)])},
+        }
+        for i in range(num_transitions)
+    ]
+
+
+@pytest.mark.parametrize("num_transitions", [4, 13, 25])
+def test_add_batch_matches_add(num_transitions):
+    transitions = create_dummy_transitions(num_transitions)
+
+    replay_buffer = create_empty_replay_buffer()
+    batched_replay_buffer = create_empty_replay_buffer()
+    # Start from a non-zero position to check the wraparound
+    for buffer in (replay_buffer, batched_replay_buffer):
+        buffer.add(**transitions[0])
+    for transition in transitions:
+        replay_buffer.add(**transition)
+    batched_replay_buffer.add_batch(**stack_transitions(transitions))
+
+    assert len(batched_replay_buffer) == len(replay_buffer)
+    assert batched_replay_buffer.position == replay_buffer.position
+    # Slots which were never written are left uninitialized
+    size = len(replay_buffer)
+    for key in state_dims():
+        assert torch.equal(batched_replay_buffer.states[key][:size], replay_buffer.states[key][:size])
+        assert torch.equal(
+            batched_replay_buffer.next_states[key][:size], replay_buffer.next_states[key][:size]
+        )
+    for attribute in ("actions", "rewards", "dones", "truncateds"):
+        assert torch.equal(
+            getattr(batched_replay_buffer, attribute)[:size], getattr(replay_buffer, attribute)[:size]
+        )
+    assert torch.equal(
+        batched_replay_buffer.complementary_info["discrete_penalty"][:size],
+        replay_buffer.complementary_info["discrete_penalty"][:size],
+    )
+
+
+def test_select_batch_transitions():
+    batch = stack_transitions(create_dummy_transitions(5))
+    mask = torch.tensor([True, False, True, False, False])
+
+    selected = select_batch_transitions(batch, mask)
+
+    assert selected["reward"].tolist() == [0.0, 2.0]
+    assert torch.equal(selected["state"][OBS_STATE], batch["state"][OBS_STATE][mask])
+    assert selected["complementary_info"]["discrete_penalty"].tolist() == [0.0, -2.0]
+
+    replay_buffer = create_empty_replay_buffer()
+    replay_buffer.add_batch(**selected)
+    assert len(replay_buffer) == 2
+
+
+def create_dummy_episodes(episode_lengths: list[int]) -> list[dict]:
+    """Transitions whose next_state is the state of the following transition within an episode."""
+    transitions = []
+    for length in episode_lengths:
+        states = [create_dummy_state() for _ in range(length + 1)]
+        for i in range(length):
+            transitions.append(
+                {
+                    "state": states[i],
+                    ACTION: create_dummy_action(),
+                    "reward": 1.0,
+                    "next_state": states[i + 1],
+                    "done": i == length - 1,
+                    "truncated": False,
+                }
+            )
+    return transitions
+
+
+def assert_stored_transitions(replay_buffer: ReplayBuffer, transitions: list[dict], atol: float = 0.0):
+    """Checks that the buffer holds its last transitions, in their original float values."""
+    stored = transitions[len(transitions) - len(replay_buffer) :]
+    for i, transition in enumerate(stored):
+        idx = torch.tensor([(replay_buffer.position - len(replay_buffer) + i) % replay_buffer.capacity])
+        state, next_state = replay_buffer._gather_states(idx)
+        for key in state_dims():
+            for gathered, expected in ((state, transition["state"]), (next_state, transition["next_state"])):
+                value = replay_buffer._from_storage(key, gathered[key][0])
+                torch.testing.assert_close(value, expected[key], atol=atol, rtol=0)
+
+
+def test_uint8_images():
+    replay_buffer = ReplayBuffer(10, "cpu", state_dims(), use_drq=False, uint8_images=True)
+    transitions = create_dummy_episodes([4])
+    for transition in transitions:
+        replay_buffer.add(**transition)
+
+    assert replay_buffer.states[OBS_IMAGE].dtype == torch.uint8
+    assert replay_buffer.states[OBS_STATE].dtype == torch.float32
+    assert_stored_transitions(replay_buffer, transitions, atol=0.5 / 255)
+
+    batch = replay_buffer.sample(4)
+    assert batch["state"][OBS_IMAGE].dtype == torch.float32
+    assert batch["next_state"][OBS_IMAGE].max() <= 1.0
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_deduplicate_frames(batched):
+    replay_buffer = ReplayBuffer(20, "cpu", state_dims(), use_drq=False, deduplicate_frames=True)
+    transitions = create_dummy_episodes([3, 5, 1])
+    if batched:
+        replay_buffer.add_batch(**stack_transitions(transitions[:4]))
+        replay_buffer.add_batch(**stack_transitions(transitions[4:]))
+    else:
+        for transition in transitions:
+            replay_buffer.add(**transition)
+
+    assert OBS_IMAGE not in replay_buffer.states
+    assert len(replay_buffer) == 9
+    # One frame per transition, plus the first state of each episode
+    assert replay_buffer.num_written_frames == 9 + 3
+    assert_stored_transitions(replay_buffer, transitions)
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_deduplicate_frames_drops_transitions_with_overwritten_frames(batched):
+    replay_buffer = ReplayBuffer(
+        10, "cpu", state_dims(), use_drq=False, deduplicate_frames=True, uint8_images=True, frame_capacity=8
+    )
+    transitions = create_dummy_episodes([4, 4, 4])
+    if batched:
+        replay_buffer.add_batch(**stack_transitions(transitions))
+    else:
+        for transition in transitions:
+            replay_buffer.add(**transition)
+
+    # The 8 most recent frames hold the last episode (5 frames) and the end of the previous one
+    assert len(replay_buffer) == 6
+    assert_stored_transitions(replay_buffer, transitions, atol=0.5 / 255)
+    assert replay_buffer.sample(16)["state"][OBS_IMAGE].shape == (16, 3, 84, 84)
+
+
+def test_deduplicate_frames_with_optimize_memory_raises_error():
+    with pytest.raises(ValueError, match="deduplicate_frames"):
+        ReplayBuffer(10, "cpu", state_dims(), deduplicate_frames=True, optimize_memory=True)
+
+
+def test_sum_tree():
+    tree = SumTree(5)
+    tree.update(torch.tensor([0, 2, 4]), torch.tensor([1.0, 2.0, 3.0]))
+    tree.update(torch.tensor([2]), torch.tensor([4.0]))
+
+    assert tree.total == 8.0
+    assert tree.get(torch.tensor([0, 1, 2])).tolist() == [1.0, 0.0, 4.0]
+    # Cumulative sums: [0, 1) -> 0, [1, 5) -> 2, [5, 8) -> 4, empty items are never found
+    values = torch.tensor([0.0, 0.5, 1.0, 4.9, 5.0, 7.9])
+    assert tree.find(values).tolist() == [0, 0, 2, 2, 4, 4]
+
+
+def test_prioritized_sample():
+    replay_buffer = ReplayBuffer(
+        10, "cpu", state_dims(), use_drq=False, prioritized=True, priority_alpha=1.0, priority_beta=0.4
+    )
+    for transition in create_dummy_transitions(6):
+        replay_buffer.add(**transition)
+
+    # New transitions get the same priority, so they are sampled uniformly with equal weights
+    batch = replay_buffer.sample(6)
+    assert torch.equal(batch["weights"], torch.ones(6))
+    assert batch["indices"].shape == (6,)
+    assert torch.equal(batch["reward"], replay_buffer.rewards[batch["indices"]])
+
+    replay_buffer.update_priorities(torch.arange(6), torch.tensor([1.0, -1.0, 1.0, 3.0, 1.0, 1.0]))
+    # With stratified sampling, the 4th of the 6 segments of the total priority falls on the 4th transition
+    batch = replay_buffer.sample(6)
+    is_prioritized = batch["indices"] == 3
+    assert is_prioritized.any() and not is_prioritized.all()
+    # Its importance-sampling weight compensates its 3 times higher probability
+    prioritized_weights = batch["weights"][is_prioritized]
+    expected_weights = torch.full_like(prioritized_weights, 3**-0.4)
+    torch.testing.assert_close(prioritized_weights, expected_weights, atol=1e-4, rtol=0)
+    assert torch.all(batch["weights"][~is_prioritized] == 1.0)
+
+
+def test_prioritized_with_optimize_memory_skips_newest_transition():
+    replay_buffer = ReplayBuffer(
+        10, "cpu", state_dims(), use_drq=False, prioritized=True, optimize_memory=True
+    )
+    for transition in create_dummy_transitions(3):
+        replay_buffer.add(**transition)
+
+    # The next_state of the newest transition is the state of the transition which is not added yet
+    assert replay_buffer.priorities.get(torch.tensor([0, 1, 2])).tolist() == [1.0, 1.0, 0.0]
+    assert 2 not in replay_buffer.sample(10)["indices"]
+
+    replay_buffer.update_priorities(torch.tensor([2]), torch.tensor([5.0]))
+    assert replay_buffer.priorities.get(torch.tensor([2])).item() == 0.0
+
+
+def test_update_priorities_skips_transitions_overwritten_since_sampling():
+    replay_buffer = ReplayBuffer(4, "cpu", state_dims(), use_drq=False, prioritized=True, priority_alpha=1.0)
+    transitions = create_dummy_transitions(6)
+    for transition in transitions[:4]:
+        replay_buffer.add(**transition)
+    batch = replay_buffer.sample(4)
+    assert torch.equal(batch["write_counts"], torch.ones(4, dtype=torch.int64))
+
+    # The buffer is full, so the 2 new transitions are written at indices 0 and 1, with the highest priority
+    replay_buffer.add_batch(**stack_transitions(transitions[4:]))
+    replay_buffer.update_priorities(
+        batch["indices"], torch.full((4,), 5.0), write_counts=batch["write_counts"]
+    )
+
+    priorities = replay_buffer.priorities.get(torch.arange(4))
+    torch.testing.assert_close(priorities, torch.tensor([1.0, 1.0, 5.0, 5.0], dtype=torch.float64))
+
+
+def test_prioritized_sample_without_sampleable_transition_raises_error():
+    replay_buffer = ReplayBuffer(
+        10, "cpu", state_dims(), use_drq=False, prioritized=True, optimize_memory=True
+    )
+    replay_buffer.add(**create_dummy_transitions(1)[0])
+
+    with pytest.raises(RuntimeError, match="sampleable"):
+        replay_buffer.sample(1)
+
+
+def test_concatenate_batch_transitions_with_weights():
+    prioritized_buffer = ReplayBuffer(10, "cpu", state_dims(), use_drq=False, prioritized=True)
+    uniform_buffer = create_empty_replay_buffer()
+    for buffer in (prioritized_buffer, uniform_buffer):
+        for transition in create_dummy_transitions(4):
+            buffer.add(**transition)
+
+    batch = concatenate_batch_transitions(uniform_buffer.sample(2), prioritized_buffer.sample(3))
+
+    assert torch.equal(batch["weights"], torch.ones(5))
+    assert "indices" not in batch
+    assert "write_counts" not in batch
+
+
 def test_check_image_augmentations_with_drq_and_dummy_image_augmentation_function(dummy_state, dummy_action):
     def dummy_image_augmentation_function(x):
         return torch.ones_like(x) * 10
@@ -679,3 +932,81 @@ def test_async_iterator_multiple_iterations():
 
     # Ensure iterator can be disposed without blocking
     del iterator
+
+
+def create_indexed_replay_buffer(device: str = "cpu", **kwargs) -> ReplayBuffer:
+    """Buffer whose transitions have their index as reward and in their state, to check their alignment."""
+    buffer = ReplayBuffer(10, device, state_dims(), use_drq=False, uint8_images=True, **kwargs)
+    for i in range(10):
+        state = {OBS_IMAGE: torch.full((3, 8, 8), i / 10), OBS_STATE: torch.full((11,), float(i))}
+        buffer.add(
+            state=state,
+            action=torch.tensor([float(i)]),
+            reward=float(i),
+            next_state=state,
+            done=False,
+            truncated=False,
+        )
+    return buffer
+
+
+def assert_indexed_batch(batch: BatchTransition, batch_size: int, device: str):
+    assert batch["state"][OBS_IMAGE].dtype == torch.float32
+    assert batch["state"][OBS_IMAGE].device.type == device
+    assert batch["reward"].shape == (batch_size,)
+    torch.testing.assert_close(batch["state"][OBS_STATE][:, 0], batch["reward"])
+    next_images = batch["next_state"][OBS_IMAGE]
+    torch.testing.assert_close(next_images[:, 0, 0, 0], batch["reward"] / 10, atol=0.01, rtol=0)
+
+
+def test_batch_prefetcher_on_cpu_samples_batches():
+    prefetcher = BatchPrefetcher(create_indexed_replay_buffer(), batch_size=4)
+
+    batch, event = prefetcher.prefetch()
+
+    assert event is None
+    assert prefetcher.wait((batch, event)) is batch
+    assert_indexed_batch(batch, 4, "cpu")
+
+
+@pytest.mark.parametrize("async_prefetch", [False, True])
+def test_iterators_with_prioritized_uint8_buffer(async_prefetch):
+    buffer = create_indexed_replay_buffer(prioritized=True)
+    iterator = buffer.get_iterator(batch_size=4, async_prefetch=async_prefetch, queue_size=2)
+
+    for _ in range(3):
+        batch = next(iterator)
+        assert_indexed_batch(batch, 4, "cpu")
+        assert batch["weights"].shape == (4,)
+        buffer.update_priorities(batch["indices"], batch["reward"], write_counts=batch["write_counts"])
+
+    del iterator
+
+
+@require_cuda
+def test_batch_prefetcher_on_cuda_copies_from_pinned_staging_buffers():
+    prefetcher = BatchPrefetcher(create_indexed_replay_buffer(device="cuda"), batch_size=4)
+
+    batches = [prefetcher.wait(prefetcher.prefetch()) for _ in range(3)]
+
+    for batch in batches:
+        assert_indexed_batch(batch, 4, "cuda")
+    staging = prefetcher.staging_buffers[0]
+    assert staging[f"state/{OBS_IMAGE}"].dtype == torch.uint8
+    assert all(buffer.is_pinned() for buffer in staging.values())
+
+
+@require_cuda
+def test_batch_prefetcher_staged_copies_do_not_wait_for_current_stream():
+    prefetcher = BatchPrefetcher(create_indexed_replay_buffer(device="cuda"), batch_size=4)
+    current_stream = torch.cuda.current_stream()
+
+    # Keeps the current stream busy, like the training step the batch is prefetched during
+    torch.cuda._sleep(1_000_000_000)
+    batch, event = prefetcher.prefetch()
+    event.synchronize()
+
+    assert not current_stream.query()
+    assert_indexed_batch(prefetcher.wait((batch, event)), 4, "cuda")
+    torch.cuda.synchronize()
+